@@ -0,0 +1,63 @@
+"""
+벤치마크 결과 비교 (run_benchmarks.py JSON 2개: 기준 -> 신규)
+규모 / 단계별 wall 시간과 peak 메모리 비율을 출력하고, 임계값보다 느려지면(또는 커지면) exit 1
+
+예: python benchmarks/compare.py benchmarks/results/base.json benchmarks/results/new.json --threshold 1.2
+"""
+import argparse
+import json
+import sys
+
+METRICS = ("wall_s", "cpu_s", "peak_mb")
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def compare(base: dict, new: dict, threshold: float, min_seconds: float) -> list:
+    """[(규모, 단계, 지표, 기준값, 신규값, 비율, 회귀 여부)] - 양쪽에 모두 있는 항목만"""
+    rows = []
+    for scale, new_scale in new["scales"].items():
+        base_stages = base["scales"].get(scale, {}).get("stages", {})
+        for stage, stats in new_scale["stages"].items():
+            if stage not in base_stages:
+                continue
+            for metric in METRICS:
+                before, after = base_stages[stage].get(metric), stats.get(metric)
+                if before is None or after is None:
+                    continue
+                ratio = after / before if before > 0 else float("inf") if after > 0 else 1.0
+                # 너무 짧은 단계(타이머 잡음)는 회귀 판정 제외
+                noisy = metric != "peak_mb" and max(before, after) < min_seconds
+                rows.append((scale, stage, metric, before, after, ratio, ratio > threshold and not noisy))
+    return rows
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교")
+    parser.add_argument("base", help="기준 결과 JSON")
+    parser.add_argument("new", help="비교할 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=1.2, help="회귀 판정 비율 (신규 / 기준)")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="이보다 짧은 단계는 시간 회귀 판정 제외")
+    parser.add_argument("--metric", nargs="*", default=["wall_s", "peak_mb"], choices=METRICS, help="출력할 지표")
+    args = parser.parse_args()
+
+    base, new = load(args.base), load(args.new)
+    print(f"[Compare] {base['git'].get('commit')} -> {new['git'].get('commit')} (threshold x{args.threshold})")
+    if base.get("env", {}).get("cpu_count") != new.get("env", {}).get("cpu_count"):
+        print("경고: 두 결과의 CPU 수가 다릅니다 (시간 비교 신뢰도 낮음)")
+
+    regressions = 0
+    for scale, stage, metric, before, after, ratio, regressed in compare(base, new, args.threshold, args.min_seconds):
+        if metric not in args.metric:
+            continue
+        flag = "  REGRESSION" if regressed else ""
+        print(f"  {scale:7s} {stage:22s} {metric:8s} {before:10.3f} -> {after:10.3f}  x{ratio:5.2f}{flag}")
+        regressions += regressed
+
+    if regressions:
+        print(f"[Error] {regressions} regression(s) over x{args.threshold}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
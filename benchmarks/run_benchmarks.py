@@ -0,0 +1,263 @@
+"""
+KPI 파이프라인 규모별 벤치마크 (합성 데이터 + 로컬 파일 백엔드)
+
+규모(scale)마다 synthetic_data로 데이터셋을 만들고, 새 프로세스(LOCAL_DATA_DIR 지정)에서
+로드 / KPI별 / 예측 / 전체 run()을 측정 -> 기계 판독용 JSON 저장 (커밋 간 비교는 compare.py)
+- wall_s / cpu_s: 반복 측정 중 최솟값 (cpu_s는 예측 프로세스 풀 등 자식 프로세스 포함)
+- peak_mb: tracemalloc 별도 1회 측정 (파이썬 할당 기준 최대 사용량)
+- rows_out: 단계 결과 행 수, maxrss_mb: 규모별 프로세스 최대 RSS
+
+예: python benchmarks/run_benchmarks.py --scales tiny small --repeat 3
+    python benchmarks/compare.py benchmarks/results/<이전>.json benchmarks/results/<현재>.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+ANALYTICS_DIR = REPO_DIR / "src" / "analytics"
+SCHEMA_VERSION = 1
+
+# 규모별 합성 데이터 설정 (나머지는 synthetic_data.DEFAULT_CONFIG)
+SCALES = {
+    "tiny": {"companies": 5, "projects": 100, "logistics": 500, "inventory": 500, "items": 500},
+    "small": {"companies": 20, "projects": 500, "logistics": 5000, "inventory": 5000, "items": 5000},
+    "medium": {"companies": 50, "projects": 2500, "logistics": 50000, "inventory": 50000, "items": 20000},
+    "large": {"companies": 200, "projects": 10000, "logistics": 250000, "inventory": 250000, "items": 100000},
+}
+
+def _git(*args) -> str:
+    try:
+        return subprocess.run(["git", *args], cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def _cpu_time() -> float:
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+def _measure(fn, repeat: int, memory: bool = True, before=None) -> dict:
+    """fn을 repeat회 실행 (출력 숨김) -> 최소 wall/cpu 시간, tracemalloc 최대 사용량, 결과 행 수"""
+    walls, cpus, result = [], [], None
+    for _ in range(max(1, repeat)):
+        if before:
+            before()
+        with contextlib.redirect_stdout(io.StringIO()):
+            wall, cpu = time.perf_counter(), _cpu_time()
+            result = fn()
+            walls.append(time.perf_counter() - wall)
+            cpus.append(_cpu_time() - cpu)
+
+    stats = {"wall_s": round(min(walls), 4), "cpu_s": round(min(cpus), 4)}
+    if memory:
+        if before:
+            before()
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                fn()
+            stats["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+        finally:
+            tracemalloc.stop()
+    stats["rows_out"] = len(result) if hasattr(result, "__len__") else None
+    return stats
+
+def worker(data_dir: str, target_date: date, repeat: int, memory: bool, full_run: bool) -> dict:
+    """측정 프로세스 본체 (LOCAL_DATA_DIR 등 환경 변수는 부모가 지정)"""
+    sys.path.insert(0, str(ANALYTICS_DIR))
+    with contextlib.redirect_stdout(io.StringIO()):
+        import run as pipeline
+        from chunked_item_kpis import calculate_item_kpis_chunked
+        from config import KPI_PREFIX
+        from forecast_sources import load_forecast_sources, read_kpi_history
+        from inventory_turnover import calculate_inventory_turnover
+        from item_company_index import ItemCompanyIndex
+        from leadtime_artifacts import load_sla_history
+        from long_term_task_rate_kpi import calculate_long_term_task_rate, calculate_sla_from_history
+        from month_to_date_kpi import calculate_month_to_date_kpis
+        from predict_inventory_turnover import forecast_inventory_turnover_hybrid
+        from predict_shipment_lead_time import forecast_lead_time_xgb
+        from project_completion_kpi import calculate_project_completion_rate
+        from safety_stock_kpi import calculate_safety_stock_rate
+        from shipment_lead_time import calculate_shipment_lead_time
+        from shipping_completion_rate import calculate_shipping_completion_rate
+        from snapshot_loader import SnapshotStore, enable_copy_on_write
+    # 운영(람다 진입점)과 같은 pandas copy-on-write 모드로 측정
+    enable_copy_on_write()
+
+    target_str = target_date.strftime("%Y-%m-%d")
+    month = target_date.strftime("%Y-%m")
+    first_day = target_date.replace(day=1)
+    prev_end = first_day - timedelta(days=1)
+    plan = pipeline.build_load_plan(target_str, first_day.strftime("%Y-%m-%d"), prev_end.strftime("%Y-%m-%d"))
+    hist_strs = [pipeline.get_last_day_of_month(target_date, i).strftime("%Y-%m-%d")
+                 for i in range(1, pipeline.SLA_WINDOW_MONTHS + 1)]
+    kpi_dir = Path(data_dir) / KPI_PREFIX
+
+    def clear_outputs():
+        # 마감월 아티팩트 / 예측 캐시가 다음 반복을 단축하지 않도록 매번 삭제
+        shutil.rmtree(kpi_dir, ignore_errors=True)
+
+    def load():
+        store = SnapshotStore()
+        try:
+            return store.load(plan)
+        finally:
+            store.close()
+
+    def load_history():
+        store = SnapshotStore()
+        try:
+            return load_sla_history(hist_strs, store)
+        finally:
+            store.close()
+
+    def load_sources():
+        # 예측 학습 입력 (KPI 이력, 없거나 짧으면 mock 고정 파일) - 출력 삭제 전에 읽음
+        store = SnapshotStore()
+        try:
+            return load_forecast_sources(read_kpi_history(), store, month)
+        finally:
+            store.close()
+
+    stages = {"load": _measure(load, repeat, memory)}
+    frames = load()
+    with contextlib.redirect_stdout(io.StringIO()):
+        sources = load_sources()
+    first = {t: frames[f"{t}_first"] for t in pipeline.TABLES}
+    last = {t: frames[t] for t in pipeline.TABLES}
+    stages["rows_in"] = {name: len(df) for name, df in frames.items()}
+
+    stages["sla_history"] = _measure(load_history, repeat, memory, before=clear_outputs)
+    hist_logs, hist_invs = load_history()
+    df_sla = calculate_sla_from_history(hist_logs, hist_invs)
+    first_index = ItemCompanyIndex.from_tables(first)
+    last_index = ItemCompanyIndex.from_tables(last)
+
+    p, lg, inv = frames["project"], frames["logistics"], frames["inventory"]
+    cases = {
+        "item_index": lambda: ItemCompanyIndex.from_tables(last).item_index,
+        "safety_stock": lambda: calculate_safety_stock_rate(p, inv, frames["inventory_item"], lg,
+                                                            frames["logistics_item"], frames["item"],
+                                                            item_index=last_index),
+        "inventory_turnover": lambda: calculate_inventory_turnover(first, last, first_index=first_index,
+                                                                   last_index=last_index),
+        "item_kpis_chunked": lambda: calculate_item_kpis_chunked(target_str, first_day.strftime("%Y-%m-%d"),
+                                                                 last, first)[0],
+        "sla": lambda: calculate_sla_from_history(hist_logs, hist_invs),
+        "long_term_task_rate": lambda: calculate_long_term_task_rate(p, lg, inv, None, None, month, df_sla=df_sla),
+        "shipment_lead_time": lambda: calculate_shipment_lead_time(p, lg, month),
+        "shipping_completion": lambda: calculate_shipping_completion_rate(p, lg, frames["prev_logistics"], month),
+        "project_completion": lambda: calculate_project_completion_rate(p, frames["prev_project"], month),
+        # 위 4개 월 누적 KPI를 정규화 업무 테이블(TaskFrames) 하나로 같이 계산
+        "month_to_date": lambda: calculate_month_to_date_kpis(month, p, frames["prev_project"], lg,
+                                                              frames["prev_logistics"], inv, df_sla),
+        "forecast_lead_time": lambda: forecast_lead_time_xgb(sources["leadtime"], use_cache=False),
+        "forecast_turnover": lambda: forecast_inventory_turnover_hybrid(sources["turnover"], use_cache=False),
+    }
+    for name, fn in cases.items():
+        stages[name] = _measure(fn, repeat, memory)
+
+    if full_run:
+        stages["run"] = _measure(lambda: pipeline.run(target_date), repeat, memory, before=clear_outputs)
+        clear_outputs()
+
+    stages["maxrss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return stages
+
+def run_scale(scale: str, data_root: Path, target_date: date, args) -> dict:
+    """데이터셋 생성 후 측정 프로세스 실행 -> 규모별 결과"""
+    sys.path.insert(0, str(BENCH_DIR))
+    from synthetic_data import write_dataset
+
+    data_dir = data_root / scale
+    started = time.perf_counter()
+    manifest = write_dataset(data_dir, target_date, SCALES[scale])
+    generate_s = time.perf_counter() - started
+
+    env = dict(os.environ,
+               LOCAL_DATA_DIR=str(data_dir), S3_BUCKET="local", PARQUET_WRITE_BACK="false",
+               FORECAST_CACHE="false", AWS_LAMBDA_FUNCTION_NAME="benchmark")
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--worker", "--data-dir", str(data_dir),
+           "--date", target_date.isoformat(), "--repeat", str(args.repeat)]
+    if args.no_memory:
+        cmd.append("--no-memory")
+    if args.skip_run:
+        cmd.append("--skip-run")
+    proc = subprocess.run(cmd, cwd=ANALYTICS_DIR, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"benchmark worker failed ({scale}):\n{proc.stderr[-3000:]}")
+
+    stages = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {
+        "config": manifest["config"],
+        "input_rows": manifest["rows"],
+        "input_bytes": manifest["bytes"],
+        "generate_s": round(generate_s, 3),
+        "rows_in": stages.pop("rows_in"),
+        "maxrss_mb": stages.pop("maxrss_mb"),
+        "stages": stages,
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="KPI 파이프라인 규모별 벤치마크")
+    parser.add_argument("--scales", nargs="*", default=["tiny", "small"], choices=list(SCALES))
+    parser.add_argument("--date", default="2026-01-15", help="분석 기준일 (YYYY-MM-DD)")
+    parser.add_argument("--repeat", type=int, default=3, help="단계별 반복 횟수 (최솟값 기록)")
+    parser.add_argument("--data-root", default=str(BENCH_DIR / "data"), help="합성 데이터셋 저장 위치")
+    parser.add_argument("--out", default=None, help="결과 JSON 경로 (기본: benchmarks/results/{시각}-{커밋}.json)")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 측정 생략")
+    parser.add_argument("--skip-run", action="store_true", help="전체 run() 측정 생략")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--data-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    target_date = date.fromisoformat(args.date)
+
+    if args.worker:
+        stages = worker(args.data_dir, target_date, args.repeat, not args.no_memory, not args.skip_run)
+        print(json.dumps(stages))
+        return 0
+
+    import numpy as np
+    import pandas as pd
+    import pyarrow
+
+    commit = _git("rev-parse", "--short", "HEAD")
+    result = {
+        "schema": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git": {"commit": commit, "dirty": bool(_git("status", "--porcelain", "--untracked-files=no"))},
+        "env": {"python": platform.python_version(), "platform": platform.platform(), "cpu_count": os.cpu_count(),
+                "pandas": pd.__version__, "numpy": np.__version__, "pyarrow": pyarrow.__version__},
+        "target_date": target_date.isoformat(),
+        "repeat": args.repeat,
+        "scales": {},
+    }
+    for scale in args.scales:
+        print(f"[Benchmark] {scale}: {SCALES[scale]}")
+        result["scales"][scale] = run_scale(scale, Path(args.data_root), target_date, args)
+        for name, stats in result["scales"][scale]["stages"].items():
+            peak = f", peak {stats['peak_mb']:.1f} MB" if "peak_mb" in stats else ""
+            print(f"  {name:22s} {stats['wall_s']:8.3f} s (cpu {stats['cpu_s']:.3f} s{peak})")
+
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    out = Path(args.out) if args.out else BENCH_DIR / "results" / f"{stamp}-{commit or 'nogit'}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"[Benchmark] saved: {out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""
+KPI 파이프라인용 합성 원천 데이터 생성기 (같은 설정 + seed면 항상 같은 파일)
+
+기준일(--days N이면 기준일까지 연속 N일)마다 run()이 읽는 스냅샷을 모두 만든다.
+- 당일 / 월초 / 전월 말 / SLA용 과거 월말 스냅샷
+- 예측용 Mock (predict_leadtime_mock.csv, predict_turnover_mock.csv)
+작업/프로젝트는 하나의 "세계"(생성일, 완료일)에서 스냅샷 날짜 기준으로 잘라내므로
+날짜가 달라도 같은 ID는 같은 이력을 가진다 (생성 전 행 없음, 완료일 이후에만 COMPLETED).
+
+출력 구조: {out}/{RAW_PREFIX}{table}--{date}.csv -> LOCAL_DATA_DIR={out}으로 그대로 실행 가능
+
+예: python benchmarks/synthetic_data.py --out /tmp/kpi-data --date 2026-01-15 --companies 50 --logistics 20000
+"""
+import argparse
+import json
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+TABLES = ["project", "inventory", "inventory_item", "logistics", "logistics_item", "item"]
+OPEN_STATUSES = np.array(["IN_PROGRESS", "ASSIGNED", "NOT_STARTED"])
+
+DEFAULT_CONFIG = {
+    "companies": 20,
+    "projects": 500,
+    "logistics": 5000,
+    "inventory": 5000,
+    "items": 5000,
+    "items_per_task": 2,        # inventory_item / logistics_item 행 수 = 작업 수 x 이 값
+    "completed_ratio": 0.7,     # 결국 완료되는 작업/프로젝트 비율 (나머지는 진행 중 상태)
+    "history_days": 400,        # 생성일 분포 기간 (기준일 이전 일수)
+    "mean_lead_days": 5.0,      # 작업 완료까지 평균 소요 일수 (감마 분포)
+    "sla_months": 3,            # 과거 월말 스냅샷 수 (SLA_WINDOW_MONTHS)
+    "forecast_months": 36,      # 예측 Mock 이력 개월 수
+    "seed": 42,
+}
+
+def snapshot_dates(target_date: date, sla_months: int = 3) -> list:
+    """run()이 읽는 스냅샷 날짜 (당일, 월초, 과거 월말) - 중복 제거, 오름차순"""
+    dates = {target_date, target_date.replace(day=1)}
+    month_end = target_date.replace(day=1) - timedelta(days=1)
+    for _ in range(max(1, sla_months)):
+        dates.add(month_end)
+        month_end = month_end.replace(day=1) - timedelta(days=1)
+    return sorted(dates)
+
+def _lifecycle(rng, n: int, start: pd.Timestamp, span_days: int, completed_ratio: float, mean_lead_days: float):
+    """생성 시각 / 완료 시각(미완료 NaT) / 미완료 상태"""
+    created = start + pd.to_timedelta(rng.integers(0, span_days * 24, n), unit="h")
+    lead_hours = np.ceil(rng.gamma(2.0, mean_lead_days * 12, n))
+    completed = created + pd.to_timedelta(lead_hours, unit="h")
+    completed = completed.where(rng.random(n) < completed_ratio)
+    return created, completed, rng.choice(OPEN_STATUSES, n)
+
+def build_universe(target_date: date, config: dict) -> dict:
+    """스냅샷 공통 세계 (ID별 생성/완료 시각, 연결 관계)"""
+    cfg = {**DEFAULT_CONFIG, **config}
+    rng = np.random.default_rng(cfg["seed"])
+    start = pd.Timestamp(target_date) - pd.Timedelta(days=cfg["history_days"])
+    span = cfg["history_days"]
+
+    n_proj = cfg["projects"]
+    created, completed, open_status = _lifecycle(rng, n_proj, start, span, cfg["completed_ratio"], cfg["mean_lead_days"] * 10)
+    project = pd.DataFrame({
+        "project_id": np.arange(1, n_proj + 1),
+        "company_id": rng.integers(1, cfg["companies"] + 1, n_proj),
+        "created": created.normalize(),
+        "completed": completed.normalize(),
+        "expected": (created + pd.to_timedelta(rng.integers(30, 180, n_proj), unit="D")).normalize(),
+        "open_status": open_status,
+    })
+
+    universe = {"project": project, "config": cfg}
+    for table, prefix in [("logistics", "logistics"), ("inventory", "inventory")]:
+        n = cfg[table]
+        created, completed, open_status = _lifecycle(rng, n, start, span, cfg["completed_ratio"], cfg["mean_lead_days"])
+        universe[table] = pd.DataFrame({
+            f"{prefix}_id": np.arange(1, n + 1),
+            "project_id": rng.integers(1, n_proj + 1, n),
+            "created": created,
+            "completed": completed,
+            "open_status": open_status,
+        })
+
+        n_links = n * cfg["items_per_task"]
+        links = pd.DataFrame({
+            f"{prefix}_item_id": np.arange(1, n_links + 1),
+            "item_id": rng.integers(1, cfg["items"] + 1, n_links),
+            f"{prefix}_id": rng.integers(1, n + 1, n_links),
+        })
+        if table == "logistics":
+            links["logistics_processed_quantity"] = rng.integers(1, 100, n_links).astype(float)
+        universe[f"{table}_item"] = links
+
+    universe["item"] = pd.DataFrame({
+        "item_id": np.arange(1, cfg["items"] + 1),
+        "base_quantity": rng.integers(0, 200, cfg["items"]),
+        "safety_stock": rng.integers(0, 150, cfg["items"]).astype(float),
+    })
+    return universe
+
+def _fmt(ts: pd.Series, fmt: str) -> pd.Series:
+    return ts.dt.strftime(fmt).where(ts.notna(), None)
+
+def snapshot_tables(universe: dict, snapshot_date: date) -> dict:
+    """세계를 스냅샷 날짜(당일 자정까지) 기준으로 잘라 원천 추출본 형식 테이블 생성"""
+    day_end = pd.Timestamp(snapshot_date) + pd.Timedelta(days=1)
+    date_str = snapshot_date.strftime("%Y-%m-%d")
+    tables = {}
+
+    p = universe["project"]
+    p = p[p["created"] < day_end]
+    done = p["completed"] < day_end
+    tables["project"] = pd.DataFrame({
+        "date": date_str,
+        "project_id": p["project_id"],
+        "company_id": p["company_id"],
+        "project_status": np.where(done, "COMPLETED", p["open_status"]),
+        "project_create_date": _fmt(p["created"], "%Y-%m-%d"),
+        "project_end_date": _fmt(p["completed"].where(done), "%Y-%m-%d"),
+        "project_expected_end_date": _fmt(p["expected"], "%Y-%m-%d"),
+    })
+
+    for table, created_col in [("logistics", "logistic_created_at"), ("inventory", "inventory_created_at")]:
+        t = universe[table]
+        t = t[t["created"] < day_end]
+        done = t["completed"] < day_end
+        tables[table] = pd.DataFrame({
+            "date": date_str,
+            f"{table}_id": t[f"{table}_id"],
+            "project_id": t["project_id"],
+            created_col: _fmt(t["created"], "%Y-%m-%d %H:%M:%S"),
+            f"{table}_status": np.where(done, "COMPLETED", t["open_status"]),
+            f"{table}_completed_at": _fmt(t["completed"].where(done), "%Y-%m-%d %H:%M:%S"),
+        })
+
+        links = universe[f"{table}_item"]
+        links = links[links[f"{table}_id"].isin(t[f"{table}_id"])]
+        tables[f"{table}_item"] = links.assign(date=date_str)[["date", *links.columns]]
+
+    # 재고 수량은 날짜마다 조금씩 변동 (날짜 기준 seed라 재생성해도 동일)
+    item = universe["item"]
+    rng = np.random.default_rng([universe["config"]["seed"], snapshot_date.toordinal()])
+    tables["item"] = pd.DataFrame({
+        "date": date_str,
+        "item_id": item["item_id"],
+        "item_quantity": np.maximum(0, item["base_quantity"] + rng.integers(-20, 21, len(item))).astype(float),
+        "safety_stock": item["safety_stock"],
+    })
+    return tables
+
+def forecast_mocks(target_date: date, config: dict) -> dict:
+    """예측용 월말 KPI 이력 (회사별 계절성 + 잡음)"""
+    cfg = {**DEFAULT_CONFIG, **config}
+    rng = np.random.default_rng([cfg["seed"], 7])
+    months = pd.date_range(end=pd.Timestamp(target_date.replace(day=1)) - pd.Timedelta(days=1),
+                           periods=cfg["forecast_months"], freq="ME")
+    companies = np.arange(1, cfg["companies"] + 1)
+    cid = np.repeat(companies, len(months))
+    month = np.tile(months, len(companies))
+    phase = np.tile(months.month.to_numpy(), len(companies)) * 2 * np.pi / 12
+    level = np.repeat(rng.uniform(20, 80, len(companies)), len(months))
+    turnover = np.repeat(rng.uniform(0.5, 2.0, len(companies)), len(months))
+    base = pd.DataFrame({"companyId": cid, "snapshotDate": pd.DatetimeIndex(month).strftime("%Y-%m-%d")})
+    return {
+        "predict_leadtime_mock": base.assign(
+            shipmentLeadTimeAvg=level * (1 + 0.15 * np.sin(phase)) + rng.normal(0, 1.5, len(base))),
+        "predict_turnover_mock": base.assign(
+            turnOverRate=np.maximum(0, turnover * (1 + 0.2 * np.cos(phase)) + rng.normal(0, 0.05, len(base)))),
+    }
+
+def write_dataset(out_dir, target_date: date, config: dict = None, raw_prefix: str = "exports/daily/",
+                  fmt: str = "csv", days: int = 1) -> dict:
+    """
+    기준일 실행에 필요한 스냅샷 + Mock 파일 저장
+    days: 기준일까지 연속 실행일 수 (같은 세계에서 잘라내므로 날짜 간 변경분이 일관됨)
+    반환(+ {out}/dataset.json): 설정, 스냅샷 날짜, 테이블별 행 수 / 바이트
+    같은 설정의 dataset.json이 이미 있으면 다시 만들지 않음
+    """
+    cfg = {**DEFAULT_CONFIG, **(config or {})}
+    out = Path(out_dir)
+    manifest_path = out / "dataset.json"
+    spec = {"target_date": target_date.isoformat(), "days": days, "config": cfg, "raw_prefix": raw_prefix,
+            "format": fmt}
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+        if all(manifest.get(k) == v for k, v in spec.items()):
+            return manifest
+
+    raw_dir = out / raw_prefix
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    universe = build_universe(target_date, cfg)
+    run_dates = [target_date - timedelta(days=i) for i in range(max(1, days))]
+    dates = sorted({d for run_date in run_dates for d in snapshot_dates(run_date, cfg["sla_months"])})
+    rows, nbytes = {}, 0
+
+    def save(df: pd.DataFrame, name: str):
+        nonlocal nbytes
+        path = raw_dir / f"{name}.{fmt}"
+        if fmt == "parquet":
+            df.to_parquet(path, index=False, compression="zstd")
+        else:
+            df.to_csv(path, index=False)
+        nbytes += path.stat().st_size
+
+    for d in dates:
+        for table, df in snapshot_tables(universe, d).items():
+            save(df, f"{table}--{d.isoformat()}")
+            rows[f"{table}--{d.isoformat()}"] = len(df)
+    for name, df in forecast_mocks(target_date, cfg).items():
+        # 고정 파일은 get_static_csv가 CSV로만 읽음
+        path = raw_dir / f"{name}.csv"
+        df.to_csv(path, index=False)
+        nbytes += path.stat().st_size
+        rows[name] = len(df)
+
+    manifest = {**spec, "run_dates": [d.isoformat() for d in sorted(run_dates)], "snapshot_dates": [d.isoformat() for d in dates], "rows": rows, "bytes": nbytes}
+    manifest_path.write_text(json.dumps(manifest, indent=1))
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description="KPI 파이프라인 합성 원천 데이터 생성")
+    parser.add_argument("--out", required=True, help="출력 디렉터리 (LOCAL_DATA_DIR로 사용)")
+    parser.add_argument("--date", default="2026-01-15", help="분석 기준일 (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=1, help="기준일까지 연속 실행일 수")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="스냅샷 파일 형식")
+    parser.add_argument("--raw-prefix", default="exports/daily/", help="RAW_PREFIX와 같은 하위 경로")
+    for key, value in DEFAULT_CONFIG.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=type(value), default=value)
+    args = parser.parse_args()
+
+    config = {key: getattr(args, key) for key in DEFAULT_CONFIG}
+    manifest = write_dataset(args.out, date.fromisoformat(args.date), config, args.raw_prefix, args.format, args.days)
+    print(f"[Synthetic] {args.out}: {len(manifest['rows'])} files, {manifest['bytes'] / 1e6:.1f} MB, "
+          f"snapshots {manifest['snapshot_dates']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+람다 핸들러 import 시간 점검 (콜드 스타트 예산)
+새 인터프리터에서 python -X importtime으로 src/analytics 모듈을 import -> 모듈별 누적 시간을 보고하고,
+예산(ms)을 넘거나 지연 로드해야 할 모듈(xgboost, statsmodels 등)이 import 시점에 로드되면 실패(exit 1)
+
+예: python scripts/check_import_time.py --budget-ms 1000
+    python scripts/check_import_time.py --module run --runs 5 --forbid xgboost statsmodels sklearn
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ANALYTICS_DIR = Path(__file__).resolve().parent.parent / "src" / "analytics"
+
+def measure(module: str, python: str = sys.executable, lambda_env: bool = True) -> list:
+    """모듈 1회 import -> [(모듈명, 깊이, self us, cumulative us)] (-X importtime 출력 순서)"""
+    env = dict(os.environ)
+    if lambda_env:
+        # 람다와 같은 분기(.env 탐색 생략)로 측정
+        env.setdefault("AWS_LAMBDA_FUNCTION_NAME", "import-time-check")
+    proc = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"], cwd=ANALYTICS_DIR, env=env,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="analytics 모듈 import 시간 예산 점검")
+    parser.add_argument("--module", default="run", help="점검할 모듈 (기본: 람다 핸들러 run)")
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="누적 import 시간 예산 (ms)")
+    parser.add_argument("--runs", type=int, default=3, help="반복 측정 횟수 (가장 빠른 실행 기준)")
+    parser.add_argument("--top", type=int, default=15, help="보고할 모듈 수")
+    parser.add_argument("--forbid", nargs="*", default=["xgboost", "statsmodels", "sklearn"],
+                        help="import 시점에 로드되면 안 되는 모듈 (예측 단계에서 지연 로드)")
+    parser.add_argument("--local", action="store_true", help="람다 환경 변수 없이 측정 (.env 로드 포함)")
+    args = parser.parse_args()
+
+    runs = [measure(args.module, lambda_env=not args.local) for _ in range(max(1, args.runs))]
+    rows = min(runs, key=lambda r: r[-1][3])
+    total_ms = rows[-1][3] / 1000
+
+    # 인터프리터 시작 시 import(site 등) 제외 - 마지막 최상위 행이 점검 대상 모듈
+    start = max((i + 1 for i, r in enumerate(rows[:-1]) if r[1] == 0), default=0)
+    rows = rows[start:]
+
+    # 직접 import한 모듈 기준 누적 시간 상위
+    print(f"[Import Time] {args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms, best of {len(runs)})")
+    direct = sorted((r for r in rows if r[1] == 1), key=lambda r: -r[3])
+    for name, _, _, cumulative_us in direct[:args.top]:
+        print(f"  {cumulative_us / 1000:9.1f} ms  {name}")
+
+    failed = False
+    loaded = {name.split(".")[0] for name, *_ in rows}
+    for name in args.forbid:
+        if name in loaded:
+            print(f"[Error] {name} is imported at startup (should be loaded lazily by the stage that needs it)")
+            failed = True
+    if total_ms > args.budget_ms:
+        print(f"[Error] import time {total_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
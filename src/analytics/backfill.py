@@ -0,0 +1,150 @@
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import pandas as pd
+
+import run as pipeline
+from config import BACKFILL_MAX_WORKERS, FORECAST_SOURCE, ITEM_KPI_MODE
+from forecast_sources import load_forecast_sources, read_kpi_history
+from item_company_index import ItemCompanyIndex
+from predict_inventory_turnover import forecast_inventory_turnover_hybrid
+from predict_shipment_lead_time import forecast_lead_time_xgb
+from snapshot_loader import SnapshotStore, enable_copy_on_write
+
+def get_date_range(start_date: date, end_date: date) -> list:
+    """시작일 ~ 종료일 (양 끝 포함)"""
+    return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+def group_by_month(dates: list) -> list:
+    """날짜 목록 -> 월별 날짜 목록 (날짜순)"""
+    groups = {}
+    for d in sorted(dates):
+        groups.setdefault((d.year, d.month), []).append(d)
+    return list(groups.values())
+
+class PlanRefs:
+    """
+    (테이블, 날짜)별 남은 사용 날짜 수
+    날짜 처리가 끝날 때마다 줄이고, 0이 되면 공유 SnapshotStore에서 제거 (월초 / 전월 말 스냅샷은 끝까지 유지)
+    """
+
+    def __init__(self, store: SnapshotStore, plans: dict):
+        self.store = store
+        self.counts = {}
+        self._lock = threading.Lock()
+        for plan in plans.values():
+            for key in self._keys(plan):
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    @staticmethod
+    def _keys(plan: dict) -> set:
+        return {(table_name, date_str) for table_name, date_str, *_ in plan.values()}
+
+    def release(self, plan: dict):
+        with self._lock:
+            for key in self._keys(plan):
+                self.counts[key] -= 1
+                if self.counts[key] == 0:
+                    self.store.discard(*key)
+
+    def discard_unplanned(self):
+        """사전 계산에만 쓴 스냅샷 (SLA 원천 월말 등) 제거"""
+        for key in self.store.keys():
+            if key not in self.counts:
+                self.store.discard(*key)
+
+def prepare_shared(groups: list, store: SnapshotStore) -> list:
+    """
+    월 단위로 바뀌지 않는 결과를 병렬 처리 전에 한 번만 계산
+    - SLA: 월별 (같은 마감월 아티팩트를 여러 작업이 동시에 만들지 않도록 순차 생성)
+    - 월초 품목 매핑: 월별 (같은 달 날짜가 동시에 실행돼도 한 번만 생성, chunked 모드는 사용하지 않음)
+    - 예측: 월별 학습 입력(해당 월 이전 KPI 이력 / mock)이 같은 달끼리는 한 번만 학습
+    반환: 월별 shared dict (run(shared=...))
+    """
+    history = read_kpi_history() if FORECAST_SOURCE == "history" else None
+    forecasts = {}
+    shared = []
+    for group in groups:
+        dates = pipeline.get_run_dates(group[0])
+        sources = load_forecast_sources(history, store, dates["month"])
+        month_shared = {"sla": pipeline.calculate_sla(dates["hist"], store)}
+        if ITEM_KPI_MODE != "chunked":
+            month_shared["first_index"] = ItemCompanyIndex.from_tables(
+                {table: store.get(table, dates["first_day"]) for table in pipeline.get_loaded_tables()})
+        for key, (source, forecast) in {"forecast_lead_time": ("leadtime", forecast_lead_time_xgb),
+                                        "forecast_turnover": ("turnover", forecast_inventory_turnover_hybrid)}.items():
+            # 입력 내용 해시로 메모 (mock으로 대체되는 달은 기간 전체에 1회)
+            digest = (key, int(pd.util.hash_pandas_object(sources[source], index=False).sum()))
+            if digest not in forecasts:
+                forecasts[digest] = forecast(sources[source])
+            month_shared[key] = forecasts[digest]
+        shared.append(month_shared)
+    return shared
+
+def run_backfill(start_date: date, end_date: date, max_workers: int = BACKFILL_MAX_WORKERS) -> dict:
+    """
+    기간 재처리 (장애 복구 / 로직 수정 후 재계산)
+    - 전체 기간 로드 계획의 (테이블, 날짜)를 공유 SnapshotStore로 한 번씩만 로드
+    - 날짜끼리 의존이 없으므로 월 구분 없이 max_workers개 날짜를 동시에 처리 (날짜순으로 제출)
+    - 같은 달 실행은 SLA / 월초 품목 매핑 / 예측 결과를 공유
+    월 누적 KPI는 날짜별 스냅샷 전체를 읽어야 하므로 (날짜, 회사) 단위로 묶어 한 번에 계산하지 않음
+    (여러 날짜를 합쳐 groupby하면 concat / 더 큰 중복 제거 비용으로 날짜별 계산보다 느림)
+    병렬 처리 중 단계별 읽은 바이트 지표에는 다른 날짜의 로드분이 섞일 수 있음
+    반환: {"succeeded": [날짜], "failed": {날짜: 오류 메시지}}
+    """
+    dates = get_date_range(start_date, end_date)
+    if not dates:
+        raise ValueError(f"잘못된 기간입니다: {start_date} ~ {end_date}")
+    groups = group_by_month(dates)
+    plans = {d: pipeline.get_daily_load_plan(d) for d in dates}
+    print(f"[Backfill] {dates[0]} ~ {dates[-1]}: {len(dates)} dates, {len(groups)} months, workers {max_workers}")
+
+    started = time.perf_counter()
+    store = SnapshotStore()
+    refs = PlanRefs(store, plans)
+    succeeded, failed = [], {}
+    lock = threading.Lock()
+
+    def run_date(args):
+        d, shared = args
+        try:
+            pipeline.run(d, store=store, shared=shared)
+            with lock:
+                succeeded.append(d)
+        except Exception as e:
+            # 실패한 날짜는 건너뛰고 계속
+            print(f"[Error] Backfill failed: {d}, {e}")
+            with lock:
+                failed[d] = str(e)
+        finally:
+            refs.release(plans[d])
+
+    try:
+        shared = prepare_shared(groups, store)
+        refs.discard_unplanned()
+        tasks = [(d, month_shared) for group, month_shared in zip(groups, shared) for d in group]
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks))), thread_name_prefix="backfill") as pool:
+            list(pool.map(run_date, tasks))
+    finally:
+        store.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"[Backfill] done in {elapsed:.1f}s: {len(succeeded)} ok, {len(failed)} failed, snapshot store {store.stats()}")
+    return {"succeeded": sorted(succeeded), "failed": dict(sorted(failed.items()))}
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="기간 KPI 재처리 (backfill)")
+    parser.add_argument("start_date", type=date.fromisoformat, help="시작일 (YYYY-MM-DD)")
+    parser.add_argument("end_date", type=date.fromisoformat, help="종료일 (YYYY-MM-DD, 포함)")
+    parser.add_argument("--workers", type=int, default=BACKFILL_MAX_WORKERS, help="동시 처리 날짜 수")
+    args = parser.parse_args()
+    enable_copy_on_write()
+    result = run_backfill(args.start_date, args.end_date, args.workers)
+    return 1 if result["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
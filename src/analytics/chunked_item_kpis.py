@@ -0,0 +1,157 @@
+import pandas as pd
+
+from config import ITEM_CHUNK_MEMORY_MB
+from inventory_turnover import summarize_inventory_turnover
+from item_company_index import ItemCompanyIndexBuilder
+from safety_stock_kpi import summarize_safety_stock
+from snapshot_loader import iter_snapshot
+from table_schema import TABLE_SCHEMAS
+
+# 청크 처리 모드에서 스트리밍하는 품목 단위 테이블 (나머지 차원 테이블은 전체 로드)
+ITEM_TABLES = ["inventory_item", "logistics_item", "item"]
+# CSV 청크 파싱 중 행당 컬럼 메모리 추정치 (문자열 객체 기준, 보수적으로 잡음)
+PARSE_BYTES_PER_COLUMN = 64
+MIN_CHUNK_ROWS = 1000
+
+def chunk_rows(table_name: str, memory_mb: float = ITEM_CHUNK_MEMORY_MB) -> int:
+    """메모리 상한(MB) 안에 들어가는 청크 행 수"""
+    row_bytes = len(TABLE_SCHEMAS[table_name]["columns"]) * PARSE_BYTES_PER_COLUMN
+    return max(MIN_CHUNK_ROWS, int(memory_mb * 2 ** 20 // row_bytes))
+
+def _nbytes(part) -> int:
+    usage = part.memory_usage(index=True)
+    return int(usage.sum()) if isinstance(part, pd.DataFrame) else int(usage)
+
+def _group_reducer(how: str):
+    """같은 키는 sum / max"""
+    def reduce(parts):
+        return pd.concat(parts).groupby(level=list(range(parts[0].index.nlevels))).agg(how)
+    return reduce
+
+def _last_row_reducer(keys: list):
+    """같은 키는 마지막 행 유지"""
+    def reduce(parts):
+        return pd.concat(parts, ignore_index=True).drop_duplicates(subset=keys, keep="last")
+    return reduce
+
+class PartialAggregate:
+    """
+    청크 부분 집계 누적
+    청크마다 누적 상태 전체와 다시 합치면 청크 수만큼 상태를 반복 집계하므로 (청크 수의 제곱),
+    부분 집계를 모아 두었다가 미합산 크기가 max(메모리 상한, 누적 상태 크기)를 넘을 때만 한 번에 합침 (전체 비용 선형)
+    메모리: 미합산 부분 집계 + 누적 상태 (키 수에 비례, 청크 크기로 제한되지 않음 - 상한을 넘으면 경고)
+    """
+
+    def __init__(self, name: str, reduce, memory_mb: float = ITEM_CHUNK_MEMORY_MB):
+        self.name = name
+        self.reduce = reduce
+        self.limit_bytes = int(memory_mb * 2 ** 20)
+        self.state = None
+        self.state_bytes = 0
+        self.parts = []
+        self.pending_bytes = 0
+
+    def add(self, part):
+        self.parts.append(part)
+        self.pending_bytes += _nbytes(part)
+        if self.pending_bytes >= max(self.limit_bytes, self.state_bytes):
+            self._flush()
+
+    def result(self):
+        """누적 결과 (부분 집계가 없었으면 None)"""
+        self._flush()
+        if self.state_bytes > self.limit_bytes:
+            print(f"[Warning] Chunked {self.name} state {self.state_bytes / 2 ** 20:.1f}MB exceeds "
+                  f"ITEM_CHUNK_MEMORY_MB ({self.limit_bytes / 2 ** 20:.1f}MB)")
+        return self.state
+
+    def _flush(self):
+        if not self.parts:
+            return
+        parts = self.parts if self.state is None else [self.state] + self.parts
+        self.state = self.reduce(parts)
+        self.state_bytes = _nbytes(self.state)
+        self.parts, self.pending_bytes = [], 0
+
+def _company_series(state, name: str) -> pd.DataFrame:
+    if state is None:
+        state = pd.Series(dtype=float, index=pd.Index([], dtype="Int64", name="company_id"))
+    return state.reset_index(name=name)
+
+def _ship_frame(shipment, name: str) -> pd.DataFrame:
+    if shipment is None:
+        return pd.DataFrame({"company_id": pd.Series(dtype="Int64"), "logistics_item_id": pd.Series(dtype="Int64"),
+                             name: pd.Series(dtype=float)})
+    return shipment.reset_index(name=name)
+
+def scan_item_snapshot(date_str: str, dims: dict, memory_mb: float = ITEM_CHUNK_MEMORY_MB,
+                       with_safety: bool = False) -> dict:
+    """
+    스냅샷 1개의 품목 단위 테이블을 청크로 한 번씩 읽어 회사별 부분 집계
+    dims: {"project", "inventory", "logistics"} 같은 날짜 차원 테이블 (전체)
+    반환: inventory(회사별 재고 합계), shipment((회사, 출하 품목)별 최대 누적 출하량),
+          item_level(품목별 안전재고 확보 여부, with_safety), item_rows(item 행 수)
+    """
+    builder = ItemCompanyIndexBuilder(dims["project"], dims["inventory"], dims["logistics"])
+    for chunk in iter_snapshot("inventory_item", date_str, chunk_rows("inventory_item", memory_mb)):
+        builder.add_inventory_items(chunk)
+
+    # 출하 품목의 회사는 매핑이 끝나야 정해지므로 (출하 품목, 품목)별 최대값만 누적
+    shipped = PartialAggregate("shipment", _group_reducer("max"), memory_mb)
+    for chunk in iter_snapshot("logistics_item", date_str, chunk_rows("logistics_item", memory_mb)):
+        builder.add_logistics_items(chunk)
+        shipped.add(chunk.groupby(["logistics_item_id", "item_id"])["logistics_processed_quantity"].max())
+    shipped = shipped.result()
+    index = builder.build()
+
+    inventory = PartialAggregate("inventory", _group_reducer("sum"), memory_mb)
+    item_level = PartialAggregate("item_level", _last_row_reducer(["company_id", "item_id"]), memory_mb)
+    item_rows = 0
+    for chunk in iter_snapshot("item", date_str, chunk_rows("item", memory_mb)):
+        item_rows += len(chunk)
+        company = index.lookup(chunk["item_id"], latest_logistics=True)["company_id"]
+        inventory.add(chunk["item_quantity"].groupby(company).sum())
+        if not with_safety:
+            continue
+
+        # calculate_safety_stock_rate 5~8단계를 청크마다 적용, (회사, 품목)은 마지막 행 유지
+        df = chunk.join(index.lookup(chunk["item_id"]))
+        df = df.dropna(subset=["company_id", "project_id"])
+        flags = df[["company_id", "item_id"]].assign(
+            secured_flag=(df["item_quantity"].fillna(0) >= df["safety_stock"].fillna(0)).astype(int))
+        item_level.add(flags)
+    inventory, item_level = inventory.result(), item_level.result()
+
+    shipment = None
+    if shipped is not None:
+        item_ids = pd.Series(shipped.index.get_level_values("item_id"))
+        shipment = pd.DataFrame({
+            "company_id": index.lookup(item_ids, latest_logistics=True)["company_id"].array,
+            "logistics_item_id": shipped.index.get_level_values("logistics_item_id"),
+            "qty": shipped.to_numpy(),
+        }).dropna(subset=["company_id"]).groupby(["company_id", "logistics_item_id"])["qty"].max()
+
+    if item_level is None:
+        item_level = pd.DataFrame({"company_id": pd.Series(dtype="Int64"), "item_id": pd.Series(dtype="Int64"),
+                                   "secured_flag": pd.Series(dtype=int)})
+    return {"inventory": inventory, "shipment": shipment, "item_level": item_level, "item_rows": item_rows}
+
+def calculate_item_kpis_chunked(target_date_str: str, first_day_str: str, dims_last: dict, dims_first: dict,
+                                memory_mb: float = ITEM_CHUNK_MEMORY_MB):
+    """
+    청크 처리 모드 안전재고 확보율 + 재고 회전율
+    (calculate_safety_stock_rate / calculate_inventory_turnover와 같은 결과, 품목 단위 테이블은 스트리밍)
+    반환: (안전재고 결과, 재고 회전율 결과, 당일 item 행 수)
+    """
+    last = scan_item_snapshot(target_date_str, dims_last, memory_mb, with_safety=True)
+    # 1일 실행이면 월초 = 당일 스냅샷
+    first = last if first_day_str == target_date_str else scan_item_snapshot(first_day_str, dims_first, memory_mb)
+
+    safety_results = summarize_safety_stock(last["item_level"])
+    turnover_results = summarize_inventory_turnover(
+        _company_series(first["inventory"], "begin_inventory"),
+        _company_series(last["inventory"], "end_inventory"),
+        _ship_frame(last["shipment"], "last_qty"),
+        _ship_frame(first["shipment"], "first_qty"),
+    )
+    return safety_results, turnover_results, last["item_rows"]
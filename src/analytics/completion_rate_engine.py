@@ -0,0 +1,39 @@
+import pandas as pd
+
+def calculate_carry_over_completion(carry_over: pd.DataFrame, started: pd.DataFrame, completed: pd.DataFrame,
+                                    id_col: str, total_col: str, done_col: str, rate_col: str,
+                                    group_cols=("company_id",), keep_missing_ids: bool = False):
+    """
+    이월 기반 완료율 공통 엔진 (출하 / 프로젝트 완료율)
+    eligible = 이월 건 ∪ 당월 시작 건, completed = eligible ∩ 당월 완료 건
+    carry_over / started / completed: group_cols + id_col 컬럼을 가진 프레임
+    keep_missing_ids: 결측 ID를 하나의 ID로 집계 (기존 출하 완료율의 집합 연산과 같은 결과)
+    회사별 루프/집합 대신 concat -> 중복 제거 -> groupby 한 번으로 집계
+    """
+    group_cols = list(group_cols)
+    keys = group_cols + [id_col]
+
+    # 1. 요청 대상 (이월 ∪ 신규) / 완료 건 - 결측 회사(keep_missing_ids가 아니면 결측 ID도)는 집계 대상 아님
+    subset = group_cols if keep_missing_ids else keys
+    eligible = pd.concat([carry_over[keys], started[keys]], ignore_index=True).dropna(subset=subset).drop_duplicates()
+    done = completed[keys].dropna(subset=subset).drop_duplicates()
+
+    # 2. 완료 ∩ 요청 대상
+    done = eligible.merge(done, on=keys, how="inner")
+
+    # 3. 그룹별 건수
+    total_counts = eligible.groupby(group_cols).size()
+    done_counts = done.groupby(group_cols).size().reindex(total_counts.index, fill_value=0)
+
+    # 4. 결과 레코드 (기존 함수와 같은 형태 / 반올림)
+    results = []
+    for key, total_count, done_count in zip(total_counts.index.tolist(), total_counts.tolist(), done_counts.tolist()):
+        rate = (done_count / total_count * 100.0) if total_count > 0 else 0.0
+        record = dict(zip(group_cols, key if isinstance(key, tuple) else (key,)))
+        record.update({
+            total_col: total_count,
+            done_col: done_count,
+            rate_col: round(float(rate), 3),
+        })
+        results.append(record)
+    return results
@@ -1,17 +1,62 @@
 import os
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-    print("Environment variables loaded from .env file")
-except ImportError:
-    # 람다 환경에서는 여기로 들어옴.
-    print("python-dotenv not found. Using system environment variables.")
+if os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
+    # 람다 환경: .env 파일이 없으므로 python-dotenv import / 파일 탐색 생략 (콜드 스타트 단축)
+    print("AWS Lambda runtime. Using system environment variables.")
+else:
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+        print("Environment variables loaded from .env file")
+    except ImportError:
+        print("python-dotenv not found. Using system environment variables.")
 
 S3_BUCKET = os.getenv("S3_BUCKET")
 AWS_REGION = os.getenv("AWS_REGION", "ap_southeast-2")
 RAW_PREFIX = os.getenv("RAW_PREFIX", "exports/daily/")
 KPI_PREFIX = os.getenv("KPI_PREFIX", "kpi")
 
+# 로컬 S3 호환 서버(MinIO, moto 등)로 벤치마크할 때만 지정
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") or None
+# S3 대신 로컬 디렉터리 사용 (객체 키 = 상대 경로, 벤치마크 / 오프라인 실행용)
+LOCAL_DATA_DIR = os.getenv("LOCAL_DATA_DIR") or None
+# 스냅샷 동시 로드 스레드 수 (S3 커넥션 풀 크기도 이 값에 맞춤)
+LOAD_MAX_WORKERS = int(os.getenv("LOAD_MAX_WORKERS", "16"))
+# KPI 리포트 동시 업로드 스레드 수 / 업로드 실패 시 재시도 횟수
+UPLOAD_MAX_WORKERS = int(os.getenv("UPLOAD_MAX_WORKERS", "16"))
+UPLOAD_MAX_RETRIES = int(os.getenv("UPLOAD_MAX_RETRIES", "3"))
+# CSV만 있는 스냅샷을 읽을 때 Parquet 사본을 RAW_PREFIX에 같이 저장할지 여부
+PARQUET_WRITE_BACK = os.getenv("PARQUET_WRITE_BACK", "true").lower() == "true"
+# 업무 장기 처리율 SLA(P80) 산정에 사용할 과거 월 수
+SLA_WINDOW_MONTHS = int(os.getenv("SLA_WINDOW_MONTHS", "3"))
+# SLA 분위수 계산 방식: exact(과거 리드타임 원본으로 계산) / tdigest(마감월 스케치 병합, 메모리 제한)
+SLA_SKETCH_MODE = os.getenv("SLA_SKETCH_MODE", "exact").lower()
+# tdigest 정밀도 (클수록 정확, 스케치당 centroid 최대 약 절반 개수 / 약 64건 미만 회사는 exact와 동일)
+SLA_SKETCH_COMPRESSION = float(os.getenv("SLA_SKETCH_COMPRESSION", "200"))
+# 회사별 예측 프로세스 수 (0이면 CPU 수, 1이면 현재 프로세스에서 순차 실행)
+FORECAST_MAX_WORKERS = int(os.getenv("FORECAST_MAX_WORKERS", "0"))
+# 예측 모델 방식: per_company(회사별 모델) / global(전체 회사 통합 모델 1개)
+FORECAST_MODE = os.getenv("FORECAST_MODE", "per_company").lower()
+# 예측 모델 레지스트리 사용 여부 (이력이 바뀐 회사만 재학습, 나머지는 저장된 예측값 사용)
+FORECAST_CACHE = os.getenv("FORECAST_CACHE", "true").lower() == "true"
+# 예측 학습 입력: history(월별 KPI 이력, 이력이 짧거나 없으면 mock 파일) / mock(predict_*_mock 고정 파일)
+FORECAST_SOURCE = os.getenv("FORECAST_SOURCE", "history").lower()
+# 예측 개월 수 (1이면 익월만, 3~6이면 리포트에 월별 전망(outlook) 추가)
+FORECAST_HORIZON = max(1, int(os.getenv("FORECAST_HORIZON", "1")))
+# 품목 단위 테이블(item, inventory_item, logistics_item) KPI 계산 방식: memory(전체 로드) / chunked(청크 스트리밍)
+ITEM_KPI_MODE = os.getenv("ITEM_KPI_MODE", "memory").lower()
+# chunked 모드 메모리 상한 (MB) - 청크 파싱 버퍼 크기 / 미합산 부분 집계를 합치는 기준
+# 합친 누적 상태(출하 품목 / (회사, 품목) 수에 비례)는 청크로 줄일 수 없어 상한을 넘으면 경고만 출력
+# 최대 사용량 ≈ 청크 버퍼(상한) + 미합산 부분 집계(상한과 누적 상태 중 큰 값) + 누적 상태
+ITEM_CHUNK_MEMORY_MB = float(os.getenv("ITEM_CHUNK_MEMORY_MB", "128"))
+# 실행 단계별 지표: CloudWatch EMF 레코드 stdout 출력 여부 / 지표 네임스페이스 / 로컬 JSON 저장 위치(없으면 저장 안 함)
+METRICS_EMF = os.getenv("METRICS_EMF", "true").lower() == "true"
+METRICS_NAMESPACE = os.getenv("METRICS_NAMESPACE", "NexERP/ETL")
+METRICS_DIR = os.getenv("METRICS_DIR") or None
+# 기간 재처리(backfill) 동시 처리 날짜 수
+BACKFILL_MAX_WORKERS = max(1, int(os.getenv("BACKFILL_MAX_WORKERS", "4")))
+# 월별 KPI 이력 생성 프로세스 수 (0이면 CPU 수)
+KPI_HISTORY_MAX_WORKERS = int(os.getenv("KPI_HISTORY_MAX_WORKERS", "0"))
+
 if not S3_BUCKET:
     print("경고: S3_BUCKET 환경 변수를 로드하지 못했습니다!")
\ No newline at end of file
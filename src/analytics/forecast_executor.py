@@ -0,0 +1,87 @@
+import heapq
+import multiprocessing as mp
+import os
+from multiprocessing.connection import wait
+
+from config import FORECAST_MAX_WORKERS
+
+def _lpt_chunks(costs: list, n_chunks: int) -> list:
+    """LPT(비용 큰 순서로 가장 덜 찬 묶음에 배정) 부하 분산 -> 묶음별 작업 인덱스"""
+    heap = [(0, c) for c in range(n_chunks)]
+    chunks = [[] for _ in range(n_chunks)]
+    for i in sorted(range(len(costs)), key=lambda i: -costs[i]):
+        load, c = heapq.heappop(heap)
+        chunks[c].append(i)
+        heapq.heappush(heap, (load + costs[i], c))
+    return [chunk for chunk in chunks if chunk]
+
+def _call(fn, history, n_jobs: int, kwargs: dict):
+    """회사 한 곳 예측 (예외는 메시지로 반환해 다른 회사에 영향 없도록)"""
+    try:
+        return fn(history, n_jobs=n_jobs, **kwargs), None
+    except Exception as e:
+        return None, str(e)
+
+def _worker(conn, fn, tasks: list, indices: list, n_jobs: int, kwargs: dict):
+    """자식 프로세스: 배정된 회사를 차례로 예측하고 한 건씩 부모에게 전송"""
+    # 자식에서 처음 초기화되는 OpenMP 런타임도 스레드 수 제한
+    os.environ["OMP_NUM_THREADS"] = str(n_jobs)
+    try:
+        for i in indices:
+            conn.send((i, *_call(fn, tasks[i][1], n_jobs, kwargs)))
+    finally:
+        conn.close()
+
+def resolve_workers(n_tasks: int, max_workers: int = FORECAST_MAX_WORKERS):
+    """(프로세스 수, 프로세스당 스레드 수) - max_workers 0이면 CPU 수만큼"""
+    cpus = os.cpu_count() or 1
+    workers = min(max_workers or cpus, n_tasks)
+    return max(1, workers), max(1, cpus // max(1, workers))
+
+def run_per_company(fn, tasks: list, label: str, max_workers: int = FORECAST_MAX_WORKERS, **kwargs) -> list:
+    """
+    회사별 예측 실행기
+    tasks: [(company_id, 이력 DataFrame)], fn(이력, n_jobs=..., **kwargs) -> 예측값 (None이면 결과 없음)
+    - 프로세스 여러 개에 이력 길이 기준 LPT로 나눠 배정하고, 프로세스당 XGBoost 스레드(n_jobs)를 고정
+    - 람다에는 /dev/shm이 없어 Pool 대신 Process + Pipe 사용
+    - 실패한 회사는 로그만 남기고 제외, 결과는 입력 순서 그대로 [(company_id, 예측값)]
+    """
+    if not tasks:
+        return []
+    workers, n_jobs = resolve_workers(len(tasks), max_workers)
+
+    outcomes = {}
+    if max_workers == 1:
+        # 현재 프로세스에서 순차 실행 (디버깅 / 로컬)
+        # 병렬 설정이면 회사가 1곳이어도 자식 프로세스 사용 - 부모에서 OpenMP를 초기화한 뒤 fork하지 않도록
+        for i, (_, history) in enumerate(tasks):
+            outcomes[i] = _call(fn, history, n_jobs, kwargs)
+    else:
+        ctx = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else mp.get_context()
+        procs, conns = [], []
+        for indices in _lpt_chunks([len(history) for _, history in tasks], workers):
+            parent_conn, child_conn = ctx.Pipe(duplex=False)
+            proc = ctx.Process(target=_worker, args=(child_conn, fn, tasks, indices, n_jobs, kwargs), daemon=True)
+            proc.start()
+            child_conn.close()
+            procs.append(proc)
+            conns.append(parent_conn)
+
+        while conns:
+            for conn in wait(conns):
+                try:
+                    i, value, error = conn.recv()
+                    outcomes[i] = (value, error)
+                except EOFError:
+                    conns.remove(conn)
+        for proc in procs:
+            proc.join()
+
+    results = []
+    for i, (cid, _) in enumerate(tasks):
+        value, error = outcomes.get(i, (None, "worker process exited"))
+        if error is not None:
+            print(f"[Error] {label} failed for Company {cid}: {error}")
+        elif value is not None:
+            results.append((cid, value))
+    return results
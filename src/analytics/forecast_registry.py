@@ -0,0 +1,138 @@
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from config import S3_BUCKET, KPI_PREFIX
+from snapshot_loader import get_s3_client, read_body
+
+# 모델 코드/피처가 바뀌면 올려서 기존 캐시 무효화
+MODEL_VERSION = 2
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:24]
+
+def model_to_json(model) -> str:
+    """XGBoost 모델 -> JSON 문자열 (xgb.Booster.load_model(bytearray(...))로 복원)"""
+    return model.get_booster().save_raw(raw_format="json").decode("utf-8")
+
+def ets_params(result) -> dict:
+    """statsmodels ExponentialSmoothing 적합 결과 -> JSON 저장 가능한 파라미터"""
+    return {k: (v.tolist() if hasattr(v, "tolist") else v) for k, v in result.params.items()}
+
+class ForecastRegistry:
+    """
+    예측 모델 / 예측값 레지스트리 (S3: {KPI_PREFIX}/models/{name}/)
+    - manifest.json: 항목(회사 또는 global) -> 이력 해시, 예측값, 모델 아티팩트 경로
+    - {항목}.json: 항목별 최신 모델 아티팩트 1개 (재학습 시 덮어씀, 이력 해시 포함)
+    - 이력(월말 값)과 모델 설정이 같으면 저장된 예측값을 그대로 사용하고,
+      새 월말 데이터가 들어왔거나 이력이 바뀐 항목만 재학습
+    """
+
+    def __init__(self, name: str, model_config: dict):
+        self.name = name
+        self.config_digest = _digest(json.dumps({"version": MODEL_VERSION, **model_config}, sort_keys=True, default=str).encode())
+        self.manifest = self._load_manifest()
+        self._pending = []
+
+    @property
+    def prefix(self) -> str:
+        return f"{KPI_PREFIX}/models/{self.name}"
+
+    def _load_manifest(self) -> dict:
+        s3_client = get_s3_client()
+        try:
+            response = s3_client.get_object(Bucket=S3_BUCKET, Key=f"{self.prefix}/manifest.json")
+            return json.loads(read_body(response))
+        except s3_client.exceptions.NoSuchKey:
+            return {}
+        except Exception as e:
+            print(f"[Warning] Forecast registry unavailable, retraining all: {self.name}, {e}")
+            return {}
+
+    def history_digest(self, history: pd.DataFrame, target_col: str) -> str:
+        """이력 (snapshotDate, 값) + 모델 설정 해시"""
+        hashed = pd.util.hash_pandas_object(history[["snapshotDate", target_col]], index=False).to_numpy()
+        return _digest(hashed.tobytes() + self.config_digest.encode())
+
+    def lookup(self, entry: str, digest: str):
+        """해시가 같은 저장 예측값 (없으면 None)"""
+        cached = self.manifest.get(entry)
+        if cached is None or cached.get("digest") != digest:
+            return None
+        return cached["prediction"]
+
+    def store(self, entry: str, digest: str, prediction, artifact: dict):
+        """
+        예측값 등록 (모델 아티팩트는 save 시 함께 저장)
+        아티팩트는 항목별 고정 키에 덮어씀 - 해시별 키로 쌓으면 매월 재학습마다 객체가 늘어남
+        """
+        key = f"{self.prefix}/{entry}.json"
+        self.manifest[entry] = {
+            "digest": digest,
+            "prediction": prediction,
+            "artifact": key,
+            "trainedAt": datetime.now(timezone.utc).isoformat(),
+        }
+        self._pending.append((key, json.dumps({"digest": digest, "prediction": prediction, **artifact}, default=str)))
+
+    def save(self):
+        """새 모델 아티팩트 -> manifest 순서로 저장 (실패해도 다음 실행에서 재학습만 하면 되므로 경고만)"""
+        if not self._pending:
+            return
+        s3_client = get_s3_client()
+
+        def put(item):
+            key, body = item
+            s3_client.put_object(Bucket=S3_BUCKET, Key=key, Body=body, ContentType="application/json")
+
+        try:
+            with ThreadPoolExecutor(max_workers=min(8, len(self._pending)), thread_name_prefix="model-registry") as pool:
+                list(pool.map(put, self._pending))
+            put((f"{self.prefix}/manifest.json", json.dumps(self.manifest)))
+            self._pending = []
+        except Exception as e:
+            print(f"[Warning] Forecast registry save failed: {self.name}, {e}")
+
+def cached_per_company(registry: ForecastRegistry, tasks: list, target_col: str, fit) -> list:
+    """
+    회사별 모델 캐시
+    fit([(company_id, 이력)]) -> [(company_id, (예측값, 아티팩트))] - 캐시에 없는 회사만 학습
+    반환: [(company_id, 예측값)] (입력 순서)
+    """
+    digests = {cid: registry.history_digest(g, target_col) for cid, g in tasks}
+    preds, misses = {}, []
+    for cid, g in tasks:
+        cached = registry.lookup(f"company-{int(cid)}", digests[cid])
+        if cached is None:
+            misses.append((cid, g))
+        else:
+            preds[cid] = cached
+
+    for cid, (prediction, artifact) in fit(misses) if misses else []:
+        registry.store(f"company-{int(cid)}", digests[cid], prediction, artifact)
+        preds[cid] = prediction
+    registry.save()
+
+    print(f"[Forecast Cache] {registry.name}: hit {len(tasks) - len(misses)}, trained {len(misses)}")
+    return [(cid, preds[cid]) for cid, _ in tasks if cid in preds]
+
+def cached_global(registry: ForecastRegistry, tasks: list, target_col: str, fit) -> list:
+    """
+    통합 모델 캐시 (회사 하나라도 이력이 바뀌면 전체 재학습)
+    fit(tasks) -> ([(company_id, 예측값)], 아티팩트)
+    """
+    if not tasks:
+        return []
+    digest = _digest("".join(f"{int(cid)}:{registry.history_digest(g, target_col)};" for cid, g in tasks).encode())
+    cached = registry.lookup("global", digest)
+    hit = cached is not None
+    if not hit:
+        preds, artifact = fit(tasks)
+        cached = {str(int(cid)): prediction for cid, prediction in preds}
+        registry.store("global", digest, cached, artifact)
+        registry.save()
+    print(f"[Forecast Cache] {registry.name}: {'hit' if hit else 'trained'} ({len(tasks)} companies)")
+    return [(cid, cached[str(int(cid))]) for cid, _ in tasks if str(int(cid)) in cached]
@@ -0,0 +1,45 @@
+import pandas as pd
+
+from config import KPI_PREFIX
+from snapshot_loader import read_parquet_object
+
+# 월별 KPI 이력 (kpi_history.py가 생성)
+HISTORY_KEY = f"{KPI_PREFIX}/history/kpi_monthly.parquet"
+# 예측 입력 이름 -> (이력 컬럼, mock 고정 파일, 최소 이력 개월 수)
+# 최소 이력 = 예측 함수 min_history 기본값 (forecast_lead_time_xgb 24, forecast_inventory_turnover_hybrid 12)
+# 이 기간보다 짧은 이력이면 학습할 회사가 없으므로 mock 사용
+FORECAST_TARGETS = {
+    "leadtime": ("shipmentLeadTimeAvg", "predict_leadtime_mock", 24),
+    "turnover": ("turnOverRate", "predict_turnover_mock", 12),
+}
+
+def read_kpi_history():
+    """월별 KPI 이력 (companyId, snapshotDate(월말), KPI 컬럼) - 없으면 None"""
+    return read_parquet_object(HISTORY_KEY)
+
+def history_series(history: pd.DataFrame, column: str, before_month: str) -> pd.DataFrame:
+    """
+    이력 -> 예측 입력 (mock 파일과 같은 형태: companyId, snapshotDate, KPI)
+    before_month('YYYY-MM') 이전에 마감된 달만 사용 (기간 재처리 시 미래 값이 학습에 섞이지 않도록)
+    """
+    df = history[history["snapshotDate"] < f"{before_month}-01"]
+    df = df.loc[df[column].notna(), ["companyId", "snapshotDate", column]]
+    return df.sort_values(["companyId", "snapshotDate"]).reset_index(drop=True)
+
+def load_forecast_sources(history, store, before_month: str) -> dict:
+    """
+    예측 학습 입력 {"leadtime": DataFrame, "turnover": DataFrame}
+    history: read_kpi_history() 결과 (None이면 mock만 사용)
+    KPI별로 최소 이력 개월 수(FORECAST_TARGETS) 이상 쌓인 회사가 없으면 mock 고정 파일로 대체 (store로 로드)
+    """
+    sources = {}
+    for name, (column, mock_table, min_history) in FORECAST_TARGETS.items():
+        if history is not None and column in history.columns:
+            series = history_series(history, column, before_month)
+            if not series.empty and series.groupby("companyId").size().max() >= min_history:
+                print(f"[Forecast] {name}: KPI history ({series['snapshotDate'].nunique()} months)")
+                sources[name] = series
+                continue
+        print(f"[Forecast] {name}: static file {mock_table}")
+        sources[name] = store.get(mock_table, None)
+    return sources
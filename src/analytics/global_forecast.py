@@ -0,0 +1,139 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from forecast_registry import model_to_json
+from ts_features import FEATURE_COLUMNS, LagState, build_features, stack_tasks, feature_matrix
+
+# 회사 수준 피처 (시계열 피처 뒤에 붙음)
+COMPANY_COLUMNS = ["company_mean", "company_std", "company_months"]
+
+def company_scales(stacked: pd.DataFrame, target_col: str) -> pd.DataFrame:
+    """회사별 정규화 기준 (평균, 표준편차, 개월 수) - 값이 일정하면 표준편차 1"""
+    by_company = stacked[target_col].astype(float).groupby(stacked["company_id"], sort=False)
+    scales = pd.DataFrame({
+        "company_mean": by_company.mean(),
+        "company_std": by_company.std(ddof=0),
+        "company_months": by_company.size(),
+    })
+    valid = np.isfinite(scales["company_std"]) & (scales["company_std"] > 0)
+    scales["company_std"] = scales["company_std"].where(valid, 1.0)
+    return scales
+
+def stack_company_features(tasks: list, target_col: str):
+    """
+    회사별 이력 -> 전체 회사 학습 행 / 익월 예측 행
+    - 타깃을 회사별 평균/표준편차로 정규화한 뒤 전체 회사 피처를 한 번에 생성 (회사 간 규모 차이 제거)
+    - 회사 수준 피처: company_mean, company_std, company_months
+    반환: (train, next_rows, feature_cols)
+    """
+    stacked = stack_tasks(tasks, target_col, "company_id")
+    scales = company_scales(stacked, target_col)
+    company = scales.reindex(stacked["company_id"])
+    stacked[target_col] = (stacked[target_col].astype(float).to_numpy() - company["company_mean"].to_numpy()) \
+        / company["company_std"].to_numpy()
+
+    feat = build_features(stacked, target_col, group_col="company_id").join(scales, on="company_id")
+    is_next = feat.groupby("company_id", sort=False).cumcount(ascending=False) == 0
+    train = feat[~is_next].reset_index(drop=True)
+    next_rows = feat[is_next].reset_index(drop=True)
+    return train, next_rows, FEATURE_COLUMNS + COMPANY_COLUMNS
+
+def forecast_global(tasks: list, target_col: str, params: dict, H: int = 1, clip_zero: bool = False,
+                    with_model: bool = False):
+    """
+    전체 회사 통합 모델 1개 학습 -> 모든 회사 예측을 시점마다 predict 한 번으로 산출
+    반환: [(company_id, [H개월 예측값])] (입력 순서) / with_model이면 ([...], 모델 아티팩트)
+    """
+    preds, model = [], None
+    if tasks:
+        import xgboost as xgb  # 학습할 때만 로드
+        train, next_rows, feature_cols = stack_company_features(tasks, target_col)
+        train_mask = train[feature_cols + [target_col]].notnull().all(axis=1)
+        if train_mask.any():
+            model = xgb.XGBRegressor(**params)
+            model.fit(feature_matrix(train[train_mask], feature_cols), train.loc[train_mask, target_col].to_numpy())
+            preds = _predict_global(model, train, next_rows, target_col, H, clip_zero)
+
+    if with_model:
+        return preds, {"xgb": model_to_json(model) if model is not None else None}
+    return preds
+
+def _predict_global(model, train: pd.DataFrame, next_rows: pd.DataFrame, target_col: str, H: int,
+                    clip_zero: bool) -> list:
+    """
+    익월 행 일괄 예측 -> 정규화된 예측값을 회사 규모로 되돌림
+    H > 1이면 예측값을 lag/rolling 상태에 넣어 다음 달 피처만 갱신하며 재귀 예측
+    """
+    mean = next_rows["company_mean"].to_numpy()
+    std = next_rows["company_std"].to_numpy()
+    company = feature_matrix(next_rows, COMPANY_COLUMNS)
+    state = LagState.from_frame(train, target_col, "company_id", keys=next_rows["company_id"])
+
+    x = feature_matrix(next_rows, FEATURE_COLUMNS + COMPANY_COLUMNS)
+    y_hat = np.empty((len(next_rows), H))
+    for h in range(H):
+        if h:
+            x = np.ascontiguousarray(np.hstack([state.next_rows(), company]))
+        y = model.predict(x) * std + mean
+        if clip_zero:
+            y = np.maximum(y, 0.0)
+        y_hat[:, h] = y
+        state.push((y - mean) / std)
+    return [(cid, [round(float(v), 3) for v in row]) for cid, row in zip(next_rows["company_id"], y_hat)]
+
+def backtest_modes(tasks: list, target_col: str, fit_per_company, fit_global, folds: int = 3,
+                   min_train: int = 12) -> pd.DataFrame:
+    """
+    회사별 모델 vs 통합 모델 백테스트 (rolling origin)
+    마지막 folds개월을 한 달씩 가려 두고 그 전까지 이력으로 다음 달 예측 -> MAE / MAPE / 소요 시간 비교
+    fit_per_company / fit_global: [(company_id, 이력)] -> [(company_id, [익월 예측값, ...])]
+    """
+    actuals, preds, elapsed = [], {"per_company": [], "global": []}, {"per_company": 0.0, "global": 0.0}
+    for k in range(folds, 0, -1):
+        cut = [(cid, g.iloc[:len(g) - k].reset_index(drop=True)) for cid, g in tasks if len(g) - k >= min_train]
+        actual = {cid: float(g[target_col].iloc[len(g) - k]) for cid, g in tasks if len(g) - k >= min_train}
+        if not cut:
+            continue
+
+        started = time.perf_counter()
+        per_company = {cid: values[0] for cid, values in fit_per_company(cut)}
+        elapsed["per_company"] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        pooled = {cid: values[0] for cid, values in fit_global(cut)}
+        elapsed["global"] += time.perf_counter() - started
+
+        # 두 방식 모두 예측한 회사만 비교
+        for cid in actual.keys() & per_company.keys() & pooled.keys():
+            actuals.append(actual[cid])
+            preds["per_company"].append(per_company[cid])
+            preds["global"].append(pooled[cid])
+
+    y = np.asarray(actuals, dtype=float)
+    rows = []
+    for mode, values in preds.items():
+        err = np.asarray(values, dtype=float) - y
+        nonzero = y != 0
+        rows.append({
+            "mode": mode,
+            "n": len(y),
+            "mae": float(np.abs(err).mean()) if len(y) else np.nan,
+            "mape": float(np.abs(err[nonzero] / y[nonzero]).mean() * 100) if nonzero.any() else np.nan,
+            "seconds": round(elapsed[mode], 3),
+        })
+    return pd.DataFrame(rows)
+
+if __name__ == "__main__":
+    # 예: python global_forecast.py [리드타임 CSV] [재고 회전율 CSV] (생략 시 S3 Mock 데이터)
+    import sys
+
+    from predict_shipment_lead_time import backtest_lead_time
+    from predict_inventory_turnover import backtest_inventory_turnover
+    from snapshot_loader import get_static_csv
+
+    df_leadtime = pd.read_csv(sys.argv[1]) if len(sys.argv) > 1 else get_static_csv("predict_leadtime_mock")
+    df_turnover = pd.read_csv(sys.argv[2]) if len(sys.argv) > 2 else get_static_csv("predict_turnover_mock")
+    print("[Backtest] shipment lead time\n", backtest_lead_time(df_leadtime).to_string(index=False))
+    print("[Backtest] inventory turnover\n", backtest_inventory_turnover(df_turnover).to_string(index=False))
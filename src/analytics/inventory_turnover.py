@@ -1,56 +1,61 @@
 import pandas as pd
 import numpy as np
+from item_company_index import ItemCompanyIndex
+from table_schema import merge_outer
 
-def calculate_inventory_turnover(df_first: dict, df_last: dict):
+def calculate_inventory_turnover(df_first: dict, df_last: dict,
+                                 first_index: ItemCompanyIndex = None, last_index: ItemCompanyIndex = None):
     """
     재고 회전율 계산
     df_first: 월초 데이터프레임들을 담은 딕셔너리
     df_last: 월말(현재) 데이터프레임들을 담은 딕셔너리
+    first_index / last_index: 같은 스냅샷으로 이미 만든 품목 매핑 인덱스가 있으면 재사용
     """
 
-    def get_item_company_map(project, inventory, inventory_item, logistics, logistics_item):
-        """품목별 회사 매핑 """
-        inv_map = inventory_item.merge(inventory, on="inventory_id", how="left") \
-                                .merge(project, on="project_id", how="left") \
-                                .dropna(subset=["company_id"]) \
-                                .drop_duplicates(subset=["item_id"], keep="last")
-        log_map = logistics_item.merge(logistics, on="logistics_id", how="left") \
-                                .merge(project, on="project_id", how="left") \
-                                .drop_duplicates(subset=["item_id"], keep="last")[["item_id", "company_id"]]
+    # 1. 월초/월말 아이템-회사 매핑 (출하 경로는 품목의 최신 출하 행 기준)
+    if first_index is None:
+        first_index = ItemCompanyIndex.from_tables(df_first)
+    if last_index is None:
+        last_index = ItemCompanyIndex.from_tables(df_last)
 
-        item_map = inv_map.merge(log_map, on="item_id", how="outer", suffixes=("_inv", "_log"))
-        item_map["company_id"] = item_map["company_id_inv"].combine_first(item_map["company_id_log"])
-        return item_map[["item_id", "company_id"]]
-
-    # 1. 월초/월말 아이템-회사 매핑 생성
-    first_map = get_item_company_map(df_first['project'], df_first['inventory'], df_first['inventory_item'], df_first['logistics'], df_first['logistics_item'])
-    last_map = get_item_company_map(df_last['project'], df_last['inventory'], df_last['inventory_item'], df_last['logistics'], df_last['logistics_item'])
+    def with_company(df, index):
+        df = df.assign(company_id=index.lookup(df["item_id"], latest_logistics=True)["company_id"])
+        return df.dropna(subset=["company_id"])
 
     # 2. 평균 재고량 계산
-    first_df = df_first['item'].merge(first_map, on="item_id", how="left").dropna(subset=["company_id"])
-    last_df = df_last['item'].merge(last_map, on="item_id", how="left").dropna(subset=["company_id"])
+    first_df = with_company(df_first['item'], first_index)
+    last_df = with_company(df_last['item'], last_index)
 
     begin_inv = first_df.groupby("company_id")["item_quantity"].sum().reset_index(name="begin_inventory")
     end_inv = last_df.groupby("company_id")["item_quantity"].sum().reset_index(name="end_inventory")
 
-    inv_summary = begin_inv.merge(end_inv, on="company_id", how="outer").fillna(0)
-    inv_summary["avg_inventory"] = (inv_summary["begin_inventory"] + inv_summary["end_inventory"]) / 2
-
     # 3. 월간 출하량 계산
     # 당월 누적 출하량 - 월초 누적 출하량 = 당월 순수 출하량
-    last_log_items = df_last['logistics_item'].merge(last_map, on="item_id", how="left").dropna(subset=["company_id"])
-    first_log_items = df_first['logistics_item'].merge(first_map, on="item_id", how="left").dropna(subset=["company_id"])
+    last_log_items = with_company(df_last['logistics_item'], last_index)
+    first_log_items = with_company(df_first['logistics_item'], first_index)
 
     last_ship = last_log_items.groupby(["company_id", "logistics_item_id"])["logistics_processed_quantity"].max().reset_index(name="last_qty")
     first_ship = first_log_items.groupby(["company_id", "logistics_item_id"])["logistics_processed_quantity"].max().reset_index(name="first_qty")
 
+    return summarize_inventory_turnover(begin_inv, end_inv, last_ship, first_ship)
+
+def summarize_inventory_turnover(begin_inv: pd.DataFrame, end_inv: pd.DataFrame,
+                                 last_ship: pd.DataFrame, first_ship: pd.DataFrame):
+    """
+    회사별 월초/월말 재고 합계 + 출하 품목별 최대 누적 출하량 -> 회사별 재고 회전율
+    (청크 처리 모드와 공통)
+    월초 / 월말 company_id는 서로 다른 스냅샷에서 와서 정수 폭이 다를 수 있음 -> merge_outer
+    """
+    inv_summary = merge_outer(begin_inv, end_inv, on="company_id").fillna(0)
+    inv_summary["avg_inventory"] = (inv_summary["begin_inventory"] + inv_summary["end_inventory"]) / 2
+
     shipment = last_ship.merge(first_ship, on=["company_id", "logistics_item_id"], how="left").fillna(0)
     shipment["delta_ship"] = (shipment["last_qty"] - shipment["first_qty"]).clip(lower=0)
 
     total_ship = shipment.groupby("company_id")["delta_ship"].sum().reset_index(name="month_ship")
 
     # 4. 최종 재고 회전율 산출
-    kpi = inv_summary.merge(total_ship, on="company_id", how="outer").fillna(0)
+    kpi = merge_outer(inv_summary, total_ship, on="company_id").fillna(0)
     kpi["inventory_turnover"] = np.where(
         kpi["avg_inventory"] == 0,
         0.0,
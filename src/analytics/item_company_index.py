@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import take
+
+class _LastRowLookup:
+    """키 -> 마지막으로 등장하는 행 위치 (같은 키 목록을 여러 번 조회할 때 인덱스 재사용)"""
+
+    def __init__(self, keys: pd.Series):
+        index = pd.Index(keys)
+        if index.is_unique:
+            self._index, self._rows = index, None
+        else:
+            # 키가 중복되면 merge 후 keep="last"와 같도록 마지막 행을 사용
+            keep = ~index.duplicated(keep="last")
+            self._index, self._rows = index[keep], np.flatnonzero(keep)
+
+    def positions(self, query) -> np.ndarray:
+        pos = self._index.get_indexer(query)
+        return pos if self._rows is None else np.where(pos >= 0, self._rows[pos], -1)
+
+def _positions(keys: pd.Series, query: pd.Series) -> np.ndarray:
+    """query 값이 keys에서 마지막으로 등장하는 행 위치 (없으면 -1)"""
+    return _LastRowLookup(keys).positions(query)
+
+def _take(values: pd.Series, pos: np.ndarray):
+    """위치 배열로 값 조회 (-1은 결측)"""
+    return take(values.array, pos, allow_fill=True)
+
+def _lookup_index(values) -> pd.Index:
+    """
+    조회용 품목 Index (해시 테이블을 생성 시점에 미리 만듦)
+    pandas는 첫 get_indexer 때 해시 테이블을 지연 생성하므로, 같은 인덱스를 여러 스레드가 처음 동시에 조회하면
+    (backfill의 월초 매핑 공유) 생성이 겹쳐 고유하지 않은 인덱스로 판단될 수 있음
+    """
+    index = pd.Index(values)
+    index.is_unique  # 해시 테이블 생성
+    return index
+
+def _last_rows(codes: np.ndarray, mask: np.ndarray, n_items: int) -> np.ndarray:
+    """품목 코드별 조건을 만족하는 마지막 행 위치 (없으면 -1)"""
+    last = np.full(n_items, -1, dtype=np.int64)
+    rows = np.flatnonzero(mask & (codes >= 0))
+    np.maximum.at(last, codes[rows], rows)
+    return last
+
+class ItemCompanyIndex:
+    """
+    품목(item_id) -> 회사/프로젝트 매핑 인덱스 (스냅샷당 한 번 생성)
+    입고 경로 (inventory_item -> inventory -> project)와
+    출하 경로 (logistics_item -> logistics -> project)를 merge 대신 배열 조회로 연결하고,
+    입고 정보가 있으면 입고, 없으면 출하 정보를 사용 (combine_first와 동일)
+    """
+
+    def __init__(self, project: pd.DataFrame, inventory: pd.DataFrame, inventory_item: pd.DataFrame,
+                 logistics: pd.DataFrame, logistics_item: pd.DataFrame):
+        # 1. 행 단위 경로 연결 (item 행 -> 작업 -> 프로젝트 -> 회사)
+        inv_company, inv_project = self._resolve_path(project, inventory, inventory_item, "inventory_id")
+        log_company, log_project = self._resolve_path(project, logistics, logistics_item, "logistics_id")
+
+        # 2. 품목 코드 (두 경로의 item_id를 하나의 정수 코드 공간으로)
+        codes, uniques = pd.factorize(
+            pd.concat([inventory_item["item_id"], logistics_item["item_id"]], ignore_index=True)
+        )
+        inv_codes, log_codes = codes[:len(inventory_item)], codes[len(inventory_item):]
+        n_items = len(uniques)
+        self.item_index = _lookup_index(uniques)
+
+        # 3. 품목별 마지막 행 (회사/프로젝트가 확인된 행 기준 / 출하는 확인 여부와 무관한 최신 행도 보관)
+        inv_valid = ~(pd.isna(inv_company) | pd.isna(inv_project))
+        log_valid = ~(pd.isna(log_company) | pd.isna(log_project))
+        inv_last = _last_rows(inv_codes, inv_valid, n_items)
+        log_last = _last_rows(log_codes, log_valid, n_items)
+        log_latest = _last_rows(log_codes, np.ones(len(log_codes), dtype=bool), n_items)
+
+        # 4. 입고 우선, 없으면 출하
+        inv_company_by_item = take(inv_company, inv_last, allow_fill=True)
+        inv_project_by_item = take(inv_project, inv_last, allow_fill=True)
+        has_inv = inv_last >= 0
+        self._company = self._combine(has_inv, inv_company_by_item, take(log_company, log_last, allow_fill=True))
+        self._project = self._combine(has_inv, inv_project_by_item, take(log_project, log_last, allow_fill=True))
+        self._company_latest = self._combine(has_inv, inv_company_by_item, take(log_company, log_latest, allow_fill=True))
+
+    @classmethod
+    def from_tables(cls, tables: dict):
+        """{'project', 'inventory', 'inventory_item', 'logistics', 'logistics_item', ...} 딕셔너리로 생성"""
+        return cls(tables["project"], tables["inventory"], tables["inventory_item"],
+                   tables["logistics"], tables["logistics_item"])
+
+    @classmethod
+    def from_mapping(cls, item_index: pd.Index, company, project, company_latest):
+        """품목별 매핑 배열로 직접 생성 (ItemCompanyIndexBuilder용, 배열 순서 = item_index 순서)"""
+        index = cls.__new__(cls)
+        index.item_index = _lookup_index(item_index)
+        index._company, index._project, index._company_latest = company, project, company_latest
+        return index
+
+    @staticmethod
+    def _resolve_path(project, tasks, task_items, task_key):
+        """작업 품목 행마다 (company_id, project_id) 배열 반환"""
+        task_pos = _positions(tasks[task_key], task_items[task_key])
+        project_ids = _take(tasks["project_id"], task_pos)
+        project_pos = _positions(project["project_id"], pd.Series(project_ids))
+        company_ids = _take(project["company_id"], project_pos)
+        return company_ids, project_ids
+
+    @staticmethod
+    def _combine(has_first, first, second):
+        out = second.copy()
+        out[has_first] = first[has_first]
+        return out
+
+    def lookup(self, item_ids: pd.Series, latest_logistics: bool = False) -> pd.DataFrame:
+        """
+        item_ids와 같은 순서로 company_id / project_id 반환 (매핑 없으면 결측)
+        latest_logistics: 출하 경로에서 회사 확인 여부와 무관하게 품목의 최신 출하 행으로 company_id 결정
+                          (재고 회전율의 기존 매핑 방식, project_id는 항상 확인된 행 기준)
+        """
+        pos = self.item_index.get_indexer(item_ids)
+        company = self._company_latest if latest_logistics else self._company
+        return pd.DataFrame({
+            "company_id": take(company, pos, allow_fill=True),
+            "project_id": take(self._project, pos, allow_fill=True),
+        }, index=item_ids.index)
+
+class ItemCompanyIndexBuilder:
+    """
+    입고/출하 품목 행을 청크 단위로 받아 ItemCompanyIndex 생성 (품목 행 전체를 메모리에 올리지 않음)
+    - 작업/프로젝트 차원 테이블은 전체(작음)로 받고, 품목 행은 파일 순서대로 add_* 후 build()
+    - 품목별 "마지막 행" 상태만 유지 -> 전체 행으로 만든 ItemCompanyIndex와 같은 매핑
+    """
+
+    def __init__(self, project: pd.DataFrame, inventory: pd.DataFrame, logistics: pd.DataFrame):
+        self._project = (_LastRowLookup(project["project_id"]), project["company_id"])
+        self._tasks = {
+            "inventory_id": (_LastRowLookup(inventory["inventory_id"]), inventory["project_id"]),
+            "logistics_id": (_LastRowLookup(logistics["logistics_id"]), logistics["project_id"]),
+        }
+        self._inv = self._resolve(pd.DataFrame({"item_id": pd.Series(dtype="Int64"),
+                                                "inventory_id": pd.Series(dtype="Int64")}), "inventory_id")
+        self._log = self._log_latest = self._resolve(pd.DataFrame({"item_id": pd.Series(dtype="Int64"),
+                                                                   "logistics_id": pd.Series(dtype="Int64")}), "logistics_id")
+
+    def _resolve(self, task_items: pd.DataFrame, task_key: str) -> pd.DataFrame:
+        """품목 행 -> item_id / company_id / project_id (ItemCompanyIndex._resolve_path와 같은 연결)"""
+        task_lookup, task_projects = self._tasks[task_key]
+        project_ids = _take(task_projects, task_lookup.positions(task_items[task_key]))
+        project_lookup, project_companies = self._project
+        company_ids = _take(project_companies, project_lookup.positions(pd.Series(project_ids)))
+        rows = pd.DataFrame({"item_id": task_items["item_id"].array, "company_id": company_ids, "project_id": project_ids})
+        return rows.dropna(subset=["item_id"])
+
+    @staticmethod
+    def _keep_last(state: pd.DataFrame, rows: pd.DataFrame, valid_only: bool) -> pd.DataFrame:
+        if valid_only:
+            rows = rows.dropna(subset=["company_id", "project_id"])
+        return pd.concat([state, rows], ignore_index=True).drop_duplicates("item_id", keep="last")
+
+    def add_inventory_items(self, chunk: pd.DataFrame):
+        """inventory_item 청크 (파일 순서대로)"""
+        self._inv = self._keep_last(self._inv, self._resolve(chunk, "inventory_id"), valid_only=True)
+
+    def add_logistics_items(self, chunk: pd.DataFrame):
+        """logistics_item 청크 (파일 순서대로)"""
+        rows = self._resolve(chunk, "logistics_id")
+        self._log = self._keep_last(self._log, rows, valid_only=True)
+        self._log_latest = self._keep_last(self._log_latest, rows, valid_only=False)
+
+    def build(self) -> ItemCompanyIndex:
+        """입고 우선, 없으면 출하 (ItemCompanyIndex와 같은 규칙)"""
+        item_index = pd.Index(pd.concat([self._inv["item_id"], self._log_latest["item_id"]]).unique())
+        inv_pos = pd.Index(self._inv["item_id"]).get_indexer(item_index)
+        log_pos = pd.Index(self._log["item_id"]).get_indexer(item_index)
+        latest_pos = pd.Index(self._log_latest["item_id"]).get_indexer(item_index)
+        has_inv = inv_pos >= 0
+
+        def pick(column, log_state, pos):
+            inv_values = _take(self._inv[column], inv_pos)
+            return ItemCompanyIndex._combine(has_inv, inv_values, _take(log_state[column], pos))
+
+        return ItemCompanyIndex.from_mapping(item_index, pick("company_id", self._log, log_pos),
+                                             pick("project_id", self._log, log_pos),
+                                             pick("company_id", self._log_latest, latest_pos))
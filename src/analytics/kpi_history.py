@@ -0,0 +1,163 @@
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import pandas as pd
+
+import run as pipeline
+from config import KPI_HISTORY_MAX_WORKERS
+from forecast_sources import HISTORY_KEY, read_kpi_history
+from inventory_turnover import calculate_inventory_turnover
+from item_company_index import ItemCompanyIndex
+from month_to_date_kpi import calculate_month_to_date_kpis
+from safety_stock_kpi import calculate_safety_stock_rate
+from snapshot_loader import SnapshotStore, enable_copy_on_write, list_snapshot_dates, reset_s3_client, write_parquet_object
+
+# KPI 결과 이름 -> (결과 필드, 이력 컬럼) - 이력 컬럼명은 일일 리포트 metrics와 동일
+HISTORY_METRICS = {
+    "safety_stock": ("safety_stock_rate_monthly", "safetyStockRate"),
+    "shipment_lead_time": ("shipment_lead_time_avg_hours", "shipmentLeadTimeAvg"),
+    "shipping_completion": ("shipping_completion_rate", "shippingCompletionRate"),
+    "project_completion": ("project_completion_rate", "projectCompletionRate"),
+    "long_term": ("long_term_task_rate", "longTermTaskRate"),
+    "inventory_turnover": ("inventory_turnover", "turnOverRate"),
+}
+HISTORY_COLUMNS = ["companyId", "snapshotDate"] + [column for _, column in HISTORY_METRICS.values()]
+
+def list_month_ends(start_month: str = None, end_month: str = None) -> list:
+    """원천 경로에 프로젝트 스냅샷이 있는 월말 날짜 (start_month ~ end_month, 'YYYY-MM', 양 끝 포함)"""
+    month_ends = []
+    for date_str in list_snapshot_dates("project"):
+        d = date.fromisoformat(date_str)
+        if (pd.Timestamp(d) + pd.offsets.MonthEnd(0)).date() != d:
+            continue
+        if (start_month and date_str[:7] < start_month) or (end_month and date_str[:7] > end_month):
+            continue
+        month_ends.append(d)
+    return month_ends
+
+def month_kpis(month_end: date, store: SnapshotStore) -> pd.DataFrame:
+    """
+    월말 스냅샷 기준 회사별 월 KPI 1행씩 (run()과 같은 KPI 함수 / 같은 입력)
+    품목 단위 테이블은 항상 전체 로드 (오프라인 작업, 한 달씩 처리)
+    월초 품목 스냅샷이 없으면 재고 회전율은 NaN, 회사별로 없는 KPI도 NaN
+    """
+    dates = pipeline.get_run_dates(month_end)
+    frames = store.load(pipeline.build_load_plan(dates["target"], dates["first_day"], dates["prev_month_end"]))
+    df_sla = pipeline.calculate_sla(dates["hist"], store)
+
+    results = calculate_month_to_date_kpis(dates["month"], frames["project"], frames["prev_project"],
+                                           frames["logistics"], frames["prev_logistics"], frames["inventory"], df_sla)
+    df_first_dict = {table: frames[f"{table}_first"] for table in pipeline.TABLES}
+    df_last_dict = {table: frames[table] for table in pipeline.TABLES}
+    last_index = ItemCompanyIndex.from_tables(df_last_dict)
+    results["safety_stock"] = calculate_safety_stock_rate(
+        frames["project"], frames["inventory"], frames["inventory_item"], frames["logistics"],
+        frames["logistics_item"], frames["item"], item_index=last_index)
+    results["inventory_turnover"] = []
+    if not frames["item_first"].empty:
+        results["inventory_turnover"] = calculate_inventory_turnover(df_first_dict, df_last_dict, last_index=last_index)
+
+    rows = {}
+    for name, (field, column) in HISTORY_METRICS.items():
+        for item in results[name]:
+            if pd.isna(item["company_id"]):
+                continue
+            rows.setdefault(int(item["company_id"]), {})[column] = item[field]
+    df = pd.DataFrame([{"companyId": cid, "snapshotDate": dates["target"], **metrics} for cid, metrics in rows.items()],
+                      columns=HISTORY_COLUMNS)
+    return df.astype({"companyId": "int64", **{column: "float64" for column in HISTORY_COLUMNS[2:]}})
+
+def _build_chunk(month_ends: list) -> tuple:
+    """
+    자식 프로세스: 연속된 월말 묶음을 순서대로 계산 (SnapshotStore 1개 공유)
+    다음 달의 전월 말 스냅샷이 이번 달 월말이므로 그 날짜만 남기고 나머지는 제거
+    반환: ({월말: KPI DataFrame}, {월말: 오류 메시지})
+    """
+    frames, failed = {}, {}
+    store = SnapshotStore()
+    try:
+        for month_end in month_ends:
+            date_str = month_end.strftime("%Y-%m-%d")
+            try:
+                frames[date_str] = month_kpis(month_end, store)
+                print(f"[History] {date_str}: {len(frames[date_str])} companies")
+            except Exception as e:
+                print(f"[Error] History failed: {date_str}, {e}")
+                failed[date_str] = str(e)
+            for table_name, snapshot_date in store.keys():
+                if snapshot_date != date_str:
+                    store.discard(table_name, snapshot_date)
+    finally:
+        store.close()
+    return frames, failed
+
+def _split_contiguous(month_ends: list, n_chunks: int) -> list:
+    """월말 목록을 연속 구간 n_chunks개로 분할 (구간 안에서는 전월 말 스냅샷 재사용)"""
+    size, extra = divmod(len(month_ends), n_chunks)
+    chunks, start = [], 0
+    for i in range(n_chunks):
+        end = start + size + (1 if i < extra else 0)
+        chunks.append(month_ends[start:end])
+        start = end
+    return [chunk for chunk in chunks if chunk]
+
+def build_kpi_history(start_month: str = None, end_month: str = None,
+                      max_workers: int = KPI_HISTORY_MAX_WORKERS) -> dict:
+    """
+    월별 KPI 이력 생성 (예측 학습 입력, forecast_sources가 사용)
+    - 원천 월말 스냅샷마다 일일 실행과 같은 KPI 함수로 월 KPI 계산
+    - 월말을 연속 구간으로 나눠 프로세스별로 처리 (max_workers 0이면 CPU 수)
+    - 기존 이력에 병합 (다시 계산한 달은 교체) 후 HISTORY_KEY에 Parquet으로 저장
+    반환: {"months": [계산한 월말], "failed": {월말: 오류 메시지}}
+    """
+    month_ends = list_month_ends(start_month, end_month)
+    if not month_ends:
+        raise ValueError(f"월말 스냅샷이 없습니다: {start_month} ~ {end_month}")
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(month_ends)))
+    print(f"[History] {month_ends[0]} ~ {month_ends[-1]}: {len(month_ends)} months, workers {workers}")
+
+    started = time.perf_counter()
+    chunks = _split_contiguous(month_ends, workers)
+    if workers == 1:
+        outcomes = [_build_chunk(month_ends)]
+    else:
+        # 자식은 부모의 S3 클라이언트(커넥션 풀)를 물려받지 않고 새로 생성
+        ctx = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else mp.get_context()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=reset_s3_client) as pool:
+            outcomes = list(pool.map(_build_chunk, chunks))
+
+    frames = {month: df for chunk_frames, _ in outcomes for month, df in chunk_frames.items()}
+    failed = {month: error for _, chunk_failed in outcomes for month, error in chunk_failed.items()}
+    if not frames:
+        raise RuntimeError(f"월별 KPI를 하나도 계산하지 못했습니다: {failed}")
+    computed = pd.concat(list(frames.values()), ignore_index=True)
+
+    history = read_kpi_history()
+    if history is not None:
+        history = history[~history["snapshotDate"].isin(list(frames))]
+        computed = pd.concat([history, computed], ignore_index=True)
+    computed = computed.sort_values(["snapshotDate", "companyId"]).reset_index(drop=True)
+    write_parquet_object(computed, HISTORY_KEY)
+
+    elapsed = time.perf_counter() - started
+    print(f"[History] done in {elapsed:.1f}s: {len(frames)} months, {len(failed)} failed, "
+          f"{computed['snapshotDate'].nunique()} months in {HISTORY_KEY}")
+    return {"months": sorted(frames), "failed": dict(sorted(failed.items()))}
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="월별 KPI 이력 생성 (예측 학습 입력)")
+    parser.add_argument("--start", help="시작 월 (YYYY-MM, 없으면 가장 오래된 월말 스냅샷부터)")
+    parser.add_argument("--end", help="종료 월 (YYYY-MM, 포함)")
+    parser.add_argument("--workers", type=int, default=KPI_HISTORY_MAX_WORKERS, help="프로세스 수 (0이면 CPU 수)")
+    args = parser.parse_args()
+    enable_copy_on_write()
+    result = build_kpi_history(args.start, args.end, args.workers)
+    return 1 if result["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from config import KPI_PREFIX, SLA_SKETCH_COMPRESSION
+from long_term_task_rate_kpi import build_hist_leadtimes_like_v1, build_leadtime_sketches
+from quantile_sketch import sketches_from_frame, sketches_to_frame
+from snapshot_loader import read_parquet_object, write_parquet_object
+
+LEADTIME_COLUMNS = ["company_id", "task_id", "lead_time"]
+SKETCH_KEY_COLUMNS = ["company_id", "task_type"]
+
+def artifact_key(month_str: str, task_type: str) -> str:
+    """마감월 업무별 리드타임 아티팩트 경로 (예: kpi/artifacts/leadtime/2025-12/logistics.parquet)"""
+    return f"{KPI_PREFIX}/artifacts/leadtime/{month_str}/{task_type}.parquet"
+
+def read_month_leadtimes(month_str: str):
+    """마감월 (출하, 입고) 리드타임 아티팩트 로드 (둘 중 하나라도 없으면 None)"""
+    hist_log = read_parquet_object(artifact_key(month_str, "logistics"))
+    hist_inv = read_parquet_object(artifact_key(month_str, "inventory"))
+    if hist_log is None or hist_inv is None:
+        return None
+    return hist_log, hist_inv
+
+def read_month_sketches(month_str: str, compression: float = SLA_SKETCH_COMPRESSION):
+    """
+    마감월 회사/업무별 리드타임 스케치 로드 (없으면 None)
+    저장된 정밀도가 설정과 다르면 None (리드타임 아티팩트에서 다시 생성)
+    """
+    df = read_parquet_object(artifact_key(month_str, "sketch"))
+    if df is None or (not df.empty and df["compression"].iloc[0] != compression):
+        return None
+    return sketches_from_frame(df, SKETCH_KEY_COLUMNS)
+
+def write_month_sketches(month_str: str, sketches: dict):
+    write_parquet_object(sketches_to_frame(sketches, SKETCH_KEY_COLUMNS), artifact_key(month_str, "sketch"))
+
+def write_month_leadtimes(month_str: str, hist_log: pd.DataFrame, hist_inv: pd.DataFrame, sketches: dict):
+    """마감월 리드타임과 스케치를 아티팩트로 저장 (마감된 달은 값이 바뀌지 않으므로 한 번만 생성)"""
+    write_parquet_object(hist_log[LEADTIME_COLUMNS], artifact_key(month_str, "logistics"))
+    write_parquet_object(hist_inv[LEADTIME_COLUMNS], artifact_key(month_str, "inventory"))
+    write_month_sketches(month_str, sketches)
+    print(f"[Artifact] Lead times written for {month_str}")
+
+def build_month_leadtimes(month_end_str: str, store, compression: float = SLA_SKETCH_COMPRESSION):
+    """
+    월말 원천 스냅샷에서 리드타임 / 스케치를 만들어 아티팩트로 저장 (월 마감 처리)
+    반환: (hist_log, hist_inv, 스케치) - 스냅샷이 없으면 None (나중에 적재될 수 있으므로 아티팩트도 만들지 않음)
+    """
+    h_proj = store.get("project", month_end_str)
+    h_log = store.get("logistics", month_end_str)
+    h_inv = store.get("inventory", month_end_str)
+    if h_log.empty or h_inv.empty:
+        print(f"[Warning] Month-end snapshot missing, SLA month skipped: {month_end_str}")
+        return None
+
+    hist_log, hist_inv = build_hist_leadtimes_like_v1(h_proj, h_log, h_inv)
+    sketches = build_leadtime_sketches(hist_log, hist_inv, compression)
+    try:
+        write_month_leadtimes(month_end_str[:7], hist_log, hist_inv, sketches)
+    except Exception as e:
+        # 저장 실패해도 이번 실행 결과에는 영향 없음 (다음 실행에서 다시 생성)
+        print(f"[Warning] Lead time artifact write failed: {month_end_str[:7]}, {e}")
+    return hist_log, hist_inv, sketches
+
+def load_sla_history(month_end_strs: list, store):
+    """
+    SLA 기준 기간(과거 N개월)의 업무별 리드타임 로드
+    마감월 아티팩트만 읽고, 아직 없는 달만 원천 월말 스냅샷으로 생성
+    반환: (hist_logs, hist_invs) - 월별 DataFrame 리스트
+    """
+    def load_month(month_end_str):
+        cached = read_month_leadtimes(month_end_str[:7])
+        if cached is not None:
+            return cached
+        built = build_month_leadtimes(month_end_str, store)
+        return None if built is None else built[:2]
+
+    with ThreadPoolExecutor(max_workers=max(1, len(month_end_strs)), thread_name_prefix="sla-history") as pool:
+        months = list(pool.map(load_month, month_end_strs))
+
+    hist_logs = [m[0] for m in months if m is not None]
+    hist_invs = [m[1] for m in months if m is not None]
+    return hist_logs, hist_invs
+
+def load_sla_sketches(month_end_strs: list, store, compression: float = SLA_SKETCH_COMPRESSION):
+    """
+    SLA 기준 기간의 월별 리드타임 스케치 로드 (tdigest 모드)
+    스케치 -> 리드타임 아티팩트 -> 원천 월말 스냅샷 순으로 찾고, 스케치가 없던 달은 새로 저장
+    반환: 월별 {(company_id, 업무 유형): QuantileSketch} 리스트
+    """
+    def load_month(month_end_str):
+        month_str = month_end_str[:7]
+        sketches = read_month_sketches(month_str, compression)
+        if sketches is not None:
+            return sketches
+
+        leadtimes = read_month_leadtimes(month_str)
+        if leadtimes is None:
+            # 월 마감 처리에서 만든 스케치를 그대로 사용 (아티팩트로도 함께 저장됨)
+            built = build_month_leadtimes(month_end_str, store, compression)
+            return None if built is None else built[2]
+
+        # 스케치 도입 전 아티팩트 / 정밀도 변경 -> 리드타임에서 다시 생성
+        sketches = build_leadtime_sketches(*leadtimes, compression)
+        try:
+            write_month_sketches(month_str, sketches)
+        except Exception as e:
+            print(f"[Warning] Sketch artifact write failed: {month_str}, {e}")
+        return sketches
+
+    with ThreadPoolExecutor(max_workers=max(1, len(month_end_strs)), thread_name_prefix="sla-sketch") as pool:
+        months = list(pool.map(load_month, month_end_strs))
+    return [m for m in months if m is not None]
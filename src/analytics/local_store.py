@@ -0,0 +1,64 @@
+import os
+import threading
+from pathlib import Path
+
+class NoSuchKey(Exception):
+    """로컬 파일이 없을 때 (boto3 client.exceptions.NoSuchKey와 같은 용도)"""
+
+class LocalS3Client:
+    """
+    S3 대신 로컬 디렉터리를 쓰는 클라이언트 (LOCAL_DATA_DIR 지정 시 get_s3_client가 반환)
+    - 객체 키를 그대로 상대 경로로 사용: {root}/{Key} (Bucket은 무시)
+    - 파이프라인이 쓰는 get_object / put_object / list_objects_v2만 지원 -> 벤치마크 / 오프라인 실행용
+    """
+
+    class exceptions:
+        NoSuchKey = NoSuchKey
+
+    def __init__(self, root: str, on_read=None):
+        self.root = Path(root).resolve()
+        self.on_read = on_read  # 읽은 바이트 수 콜백 (S3 클라이언트의 after-call 훅과 같은 용도)
+        self._lock = threading.Lock()
+        self._tmp_seq = 0
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"Key outside LOCAL_DATA_DIR: {key}")
+        return path
+
+    def get_object(self, Bucket=None, Key=None, **kwargs) -> dict:
+        # S3 StreamingBody처럼 파일 스트림 반환 (청크 읽기 시 전체를 메모리에 올리지 않음)
+        try:
+            body = open(self._path(Key), "rb")
+        except FileNotFoundError:
+            raise NoSuchKey(Key) from None
+        size = os.fstat(body.fileno()).st_size
+        if self.on_read:
+            self.on_read(size)
+        return {"Body": body, "ContentLength": size}
+
+    def put_object(self, Bucket=None, Key=None, Body=b"", **kwargs) -> dict:
+        path = self._path(Key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = Body.encode("utf-8") if isinstance(Body, str) else bytes(Body)
+
+        # 임시 파일에 쓴 뒤 교체 (동시 업로드 중에도 반쯤 쓰인 파일이 읽히지 않도록)
+        with self._lock:
+            self._tmp_seq += 1
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.{self._tmp_seq}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        return {}
+
+    def list_objects_v2(self, Bucket=None, Prefix="", **kwargs) -> dict:
+        # 한 번에 전체 목록 반환 (S3처럼 1000건 페이지 나눔 없음)
+        base = self.root / Prefix.rsplit("/", 1)[0] if "/" in Prefix else self.root
+        contents = []
+        if base.is_dir():
+            for path in base.rglob("*"):
+                key = path.relative_to(self.root).as_posix()
+                if path.is_file() and key.startswith(Prefix) and not path.name.startswith("."):
+                    contents.append({"Key": key, "Size": path.stat().st_size})
+        contents.sort(key=lambda obj: obj["Key"])
+        return {"Contents": contents, "KeyCount": len(contents), "IsTruncated": False}
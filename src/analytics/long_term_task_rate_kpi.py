@@ -1,64 +1,51 @@
 import pandas as pd
 import numpy as np
+from table_schema import merge_outer
+from task_frames import TaskFrames
 
-def calculate_leadtimes(df_project: pd.DataFrame, df_tasks: pd.DataFrame, task_type: str, target_month: str):
+def calculate_leadtimes(df_project: pd.DataFrame, df_tasks: pd.DataFrame, task_type: str, target_month: str,
+                        frames: TaskFrames = None):
     """
     개별 업무의 (Logistics 또는 Inventory) 리드 타임을 계산하는 공통 함수
+    frames: 같은 스냅샷의 TaskFrames (프로젝트 조인 / 리드타임 계산 공유)
     """
 
     # 0. 데이터가 비어있는 경우 빈 데이터프레임 반환
     if df_tasks.empty or df_project.empty:
         return pd.DataFrame(columns=["company_id", "task_id", "lead_time"])
 
-    # 1. 컬럼 매핑 정보 설정 (입고 / 출하 구분)
-    col_map = {
-        "logistics": {"id": "logistics_id", "start": "logistic_created_at", "end": "logistics_completed_at", "status": "logistics_status"},
-        "inventory": {"id": "inventory_id", "start": "inventory_created_at", "end": "inventory_completed_at", "status": "inventory_status"}
-    }[task_type]
+    # 1. 데이터 병합 / 리드타임(시간 단위)은 TaskFrames에서 스냅샷당 한 번 계산
+    if frames is None:
+        frames = TaskFrames(df_project, **{f"df_{task_type}": df_tasks})
 
-    # 2. 데이터 병합 및 타입 변환
-    df = df_tasks.merge(df_project[["project_id", "company_id"]], on="project_id", how="left")
-
-    df[col_map["start"]] = pd.to_datetime(df[col_map["start"]], errors="coerce")
-    df[col_map["end"]] = pd.to_datetime(df[col_map["end"]], errors="coerce")
-    df[col_map["status"]] = df[col_map["status"]].str.upper()
-
-    # 3. 분석 대상 월 필터링 (완료일 기준)
-    df["_end_month"] = df[col_map["end"]].dt.to_period("M").astype(str)
-
-    mask = (df[col_map["status"]] == "COMPLETED") & \
-           (df[col_map["start"]].notna()) & \
-           (df[col_map["end"]].notna()) & \
-           (df["_end_month"] == target_month)
-
-    df_valid = df[mask].copy()
+    # 2. 분석 대상 월 필터링 (완료일 기준, 시작/완료일이 모두 있는 건)
+    df_valid = frames.get("leadtimes", task_type, target_month)
 
     if df_valid.empty:
         return pd.DataFrame(columns=["company_id", "task_id", "lead_time"])
-
-    # 4. 리드타임 계산 (시간 단위)
-    df_valid["lead_time"] = (df_valid[col_map["end"]] - df_valid[col_map["start"]]).dt.total_seconds() / 3600.0
-
-    return df_valid.rename(columns={col_map["id"]: "task_id"})[["company_id", "task_id", "lead_time"]]
+    return df_valid
 
 import pandas as pd
 import numpy as np
 
+from quantile_sketch import QuantileSketch
+
 def snapshot_month_from_date(df_tasks: pd.DataFrame) -> str:
     """파일의 date 컬럼 최댓값에서 'YYYY-MM' 형식의 월 추출"""
     if df_tasks.empty: return ""
-    max_date = pd.to_datetime(df_tasks["date"], errors="coerce").max()
+    max_date = df_tasks["date"].max()
     return str(max_date.to_period("M"))
 
 def build_hist_leadtimes_like_v1(df_project_hist, df_log_hist, df_inv_hist):
     """각 과거 스냅샷 파일별로 '자기 월'의 데이터만 정확히 추출"""
     m = snapshot_month_from_date(df_log_hist)
-    hist_log = calculate_leadtimes(df_project_hist, df_log_hist, "logistics", m)
-    hist_inv = calculate_leadtimes(df_project_hist, df_inv_hist, "inventory", m)
+    frames = TaskFrames(df_project_hist, df_log_hist, df_inv_hist)
+    hist_log = calculate_leadtimes(df_project_hist, df_log_hist, "logistics", m, frames)
+    hist_inv = calculate_leadtimes(df_project_hist, df_inv_hist, "inventory", m, frames)
     return hist_log, hist_inv
 
-def calculate_sla_like_v1(all_hist_log: pd.DataFrame, all_hist_inv: pd.DataFrame) -> pd.DataFrame:
-    """분석팀과 동일하게 groupby quantile을 사용하여 회사별 SLA(P80) 산출"""
+def calculate_sla_like_v1(all_hist_log: pd.DataFrame, all_hist_inv: pd.DataFrame, q: float = 0.8) -> pd.DataFrame:
+    """분석팀과 동일하게 groupby quantile을 사용하여 회사별 SLA(P80) 산출 (exact 모드)"""
     # 리드타임 0 초과 데이터만 전처리
     if not all_hist_log.empty:
         all_hist_log = all_hist_log[all_hist_log["lead_time"].notna() & (all_hist_log["lead_time"] > 0)]
@@ -70,15 +57,45 @@ def calculate_sla_like_v1(all_hist_log: pd.DataFrame, all_hist_inv: pd.DataFrame
 
     log_sla = pd.DataFrame({
         "company_id": log_grp.size().index,
-        "log_p80": log_grp.quantile(0.8).values,
+        "log_p80": log_grp.quantile(q).values,
     }) if log_grp is not None else pd.DataFrame(columns=["company_id", "log_p80"])
 
     inv_sla = pd.DataFrame({
         "company_id": inv_grp.size().index,
-        "inv_p80": inv_grp.quantile(0.8).values,
+        "inv_p80": inv_grp.quantile(q).values,
     }) if inv_grp is not None else pd.DataFrame(columns=["company_id", "inv_p80"])
 
-    return log_sla.merge(inv_sla, on="company_id", how="outer")
+    return merge_outer(log_sla, inv_sla, on="company_id")
+
+def build_leadtime_sketches(hist_log: pd.DataFrame, hist_inv: pd.DataFrame, compression: float = 200.0) -> dict:
+    """마감월 리드타임 -> {(company_id, 업무 유형): QuantileSketch} (리드타임 0 초과만, calculate_sla_like_v1과 동일 전처리)"""
+    sketches = {}
+    for task_type, df in (("logistics", hist_log), ("inventory", hist_inv)):
+        if df.empty:
+            continue
+        df = df[df["lead_time"].notna() & (df["lead_time"] > 0)]
+        for cid, lead_times in df.groupby("company_id")["lead_time"]:
+            sketches[(cid, task_type)] = QuantileSketch.from_values(lead_times.to_numpy(dtype=np.float64), compression)
+    return sketches
+
+def calculate_sla_from_sketches(month_sketches: list, q: float = 0.8) -> pd.DataFrame:
+    """
+    월별 스케치를 회사/업무별로 병합해 SLA 산출 (tdigest 모드)
+    과거 리드타임 원본을 합치지 않으므로 메모리는 회사 수 x 스케치 크기로 제한됨
+    반환 형태는 calculate_sla_like_v1과 동일
+    """
+    parts = {}
+    for sketches in month_sketches:
+        for key, sketch in sketches.items():
+            parts.setdefault(key, []).append(sketch)
+
+    sla = {"logistics": {}, "inventory": {}}
+    for (cid, task_type), sketches in parts.items():
+        sla[task_type][cid] = QuantileSketch.merge_all(sketches).quantile(q)
+
+    log_sla = pd.DataFrame({"company_id": list(sla["logistics"]), "log_p80": list(sla["logistics"].values())})
+    inv_sla = pd.DataFrame({"company_id": list(sla["inventory"]), "inv_p80": list(sla["inventory"].values())})
+    return merge_outer(log_sla, inv_sla, on="company_id")
 
 def add_is_over_column(target_df: pd.DataFrame, df_sla: pd.DataFrame, sla_col_name: str):
     """Merge 방식을 사용하여 인덱스 꼬임 방지 및 NaN 처리 유지"""
@@ -97,43 +114,62 @@ def add_is_over_column(target_df: pd.DataFrame, df_sla: pd.DataFrame, sla_col_na
     )
     return merged
 
+def calculate_sla_from_history(hist_logs: list, hist_invs: list, q: float = 0.8) -> pd.DataFrame:
+    """월별 과거 리드타임 리스트를 합쳐 SLA 산출 (exact 모드)"""
+    all_hist_log = pd.concat(hist_logs, ignore_index=True) if hist_logs else pd.DataFrame()
+    all_hist_inv = pd.concat(hist_invs, ignore_index=True) if hist_invs else pd.DataFrame()
+    return calculate_sla_like_v1(all_hist_log, all_hist_inv, q)
+
 def calculate_long_term_task_rate(df_project: pd.DataFrame, df_log: pd.DataFrame, df_inv: pd.DataFrame,
-                                  hist_logs: list, hist_invs: list, target_month: str):
+                                  hist_logs: list, hist_invs: list, target_month: str, df_sla: pd.DataFrame = None,
+                                  frames: TaskFrames = None):
+    """
+    업무 장기 처리율
+    df_sla: 미리 계산한 SLA (스케치 모드) - 없으면 hist_logs / hist_invs로 정확히 계산
+    frames: 당일 스냅샷의 TaskFrames (다른 KPI와 공유)
+    """
     # 1. 현재 월 데이터 추출
-    cur_log = calculate_leadtimes(df_project, df_log, "logistics", target_month)
-    cur_inv = calculate_leadtimes(df_project, df_inv, "inventory", target_month)
+    if frames is None:
+        frames = TaskFrames(df_project, df_log, df_inv)
+    cur_log = calculate_leadtimes(df_project, df_log, "logistics", target_month, frames)
+    cur_inv = calculate_leadtimes(df_project, df_inv, "inventory", target_month, frames)
 
     # 2. 통합 SLA 데이터프레임 생성
-    all_hist_log = pd.concat(hist_logs, ignore_index=True) if hist_logs else pd.DataFrame()
-    all_hist_inv = pd.concat(hist_invs, ignore_index=True) if hist_invs else pd.DataFrame()
-    df_sla = calculate_sla_like_v1(all_hist_log, all_hist_inv)
+    if df_sla is None:
+        df_sla = calculate_sla_from_history(hist_logs, hist_invs)
 
     # 3. 초과 여부 판단 (Merge 기반)
     cur_log = add_is_over_column(cur_log, df_sla, "log_p80")
     cur_inv = add_is_over_column(cur_inv, df_sla, "inv_p80")
 
-    # 4. 회사별 최종 집계
-    results = []
-    for cid in df_project["company_id"].unique():
-        if pd.isna(cid): continue
-
-        c_log = cur_log[cur_log["company_id"] == cid]
-        c_inv = cur_inv[cur_inv["company_id"] == cid]
-
-        total_tasks = len(c_log) + len(c_inv)
-        # sum()은 NaN을 무시하고 계산함
-        total_over = c_log["is_over"].sum() + c_inv["is_over"].sum()
+    # 4. 회사별 최종 집계 (회사별 필터링 대신 groupby 한 번으로 건수/초과 건수 산출)
+    companies = pd.Index(df_project["company_id"].dropna().unique())
+    log_agg = _task_counts(cur_log, companies)
+    inv_agg = _task_counts(cur_inv, companies)
 
-        rate = (total_over / total_tasks * 100) if total_tasks > 0 else 0.0
+    total_tasks = log_agg["task_count"] + inv_agg["task_count"]
+    # is_over의 NaN(SLA 기준 없음)은 sum에서 제외됨
+    total_over = log_agg["delayed_count"] + inv_agg["delayed_count"]
+    rates = np.where(total_tasks > 0, total_over / total_tasks.where(total_tasks > 0, 1) * 100, 0.0)
 
-        results.append({
+    return [
+        {
             "company_id": int(cid),
             "long_term_task_rate": round(float(rate), 3),
-            "total_task_count": int(total_tasks),
-            "total_delayed_count": int(total_over),
-            "logistics_task_count": len(c_log),
-            "inventory_task_count": len(c_inv),
-            "logistics_delayed_count": int(c_log["is_over"].sum()),
-            "inventory_delayed_count": int(c_inv["is_over"].sum())
-        })
-    return results
\ No newline at end of file
+            "total_task_count": int(n_total),
+            "total_delayed_count": int(n_over),
+            "logistics_task_count": int(n_log),
+            "inventory_task_count": int(n_inv),
+            "logistics_delayed_count": int(n_log_over),
+            "inventory_delayed_count": int(n_inv_over)
+        }
+        for cid, rate, n_total, n_over, n_log, n_inv, n_log_over, n_inv_over in zip(
+            companies, rates, total_tasks, total_over,
+            log_agg["task_count"], inv_agg["task_count"], log_agg["delayed_count"], inv_agg["delayed_count"]
+        )
+    ]
+
+def _task_counts(df_tasks: pd.DataFrame, companies: pd.Index) -> pd.DataFrame:
+    """회사별 업무 건수 / 초과(is_over) 건수 - 업무가 없는 회사는 0"""
+    agg = df_tasks.groupby("company_id")["is_over"].agg(task_count="size", delayed_count="sum")
+    return agg.reindex(companies, fill_value=0)
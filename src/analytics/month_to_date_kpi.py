@@ -0,0 +1,22 @@
+from long_term_task_rate_kpi import calculate_long_term_task_rate
+from project_completion_kpi import calculate_project_completion_rate
+from shipment_lead_time import calculate_shipment_lead_time
+from shipping_completion_rate import calculate_shipping_completion_rate
+from task_frames import TaskFrames
+
+def calculate_month_to_date_kpis(target_month: str, df_project, df_prev_project, df_logistics, df_prev_logistics,
+                                 df_inventory, df_sla, frames: TaskFrames = None) -> dict:
+    """
+    월 누적 KPI (출하 리드타임 / 출하 완료율 / 프로젝트 완료율 / 업무 장기 처리율)
+    당일 스냅샷 정규화 업무 테이블(TaskFrames)을 네 KPI가 같이 사용 - 프로젝트 조인 / 월 키 / 리드타임은 한 번만 계산
+    반환: {"shipment_lead_time", "shipping_completion", "project_completion", "long_term": 회사별 결과 레코드}
+    """
+    if frames is None:
+        frames = TaskFrames(df_project, df_logistics, df_inventory)
+    return {
+        "shipment_lead_time": calculate_shipment_lead_time(df_project, df_logistics, target_month, frames),
+        "shipping_completion": calculate_shipping_completion_rate(df_project, df_logistics, df_prev_logistics, target_month, frames),
+        "project_completion": calculate_project_completion_rate(df_project, df_prev_project, target_month, frames),
+        "long_term": calculate_long_term_task_rate(df_project, df_logistics, df_inventory, None, None, target_month,
+                                                   df_sla=df_sla, frames=frames),
+    }
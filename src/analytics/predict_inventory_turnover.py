@@ -1,30 +1,20 @@
 import pandas as pd
-import numpy as np
-import xgboost as xgb
-from statsmodels.tsa.holtwinters import ExponentialSmoothing
-
-def _make_features(df: pd.DataFrame, target_col: str, lags=(1, 2, 3, 6), rolls=(3, 6)):
-    """시계열 피처 생성 (내부용)"""
-    out = df.copy()
-    out = out.sort_values("snapshotDate").reset_index(drop=True)
-    out["moy"] = out["snapshotDate"].dt.month
-    out["moy_sin"] = np.sin(2 * np.pi * out["moy"] / 12)
-    out["moy_cos"] = np.cos(2 * np.pi * out["moy"] / 12)
-
-    for k in lags:
-        out[f"lag_{k}"] = out[target_col].shift(k)
-    for w in rolls:
-        s = out[target_col].shift(1)
-        out[f"roll_mean_{w}"] = s.rolling(w, min_periods=1).mean()
-        out[f"roll_std_{w}"] = s.rolling(w, min_periods=2).std()
-    return out
-
-def forecast_inventory_turnover_hybrid(df_source: pd.DataFrame, target_col="turnOverRate", H=1, min_history=12):
-    """
-    ETS + XGBoost 하이브리드 예측
-    익월 재고 회전율 예측 결과를 리스트로 반환
-    """
 
+from config import FORECAST_MAX_WORKERS, FORECAST_MODE, FORECAST_CACHE, FORECAST_HORIZON
+from forecast_executor import run_per_company
+from global_forecast import forecast_global, backtest_modes
+from forecast_registry import ForecastRegistry, cached_per_company, cached_global, ets_params, model_to_json
+from ts_features import FEATURE_COLUMNS, LagState, task_features, feature_matrix, horizon_months
+
+# 하이브리드 잔차 모델 설정 (스레드 수는 실행기가 프로세스당 n_jobs로 지정)
+RESID_XGB_PARAMS = {"n_estimators": 600, "learning_rate": 0.03, "max_depth": 4, "subsample": 0.9,
+                    "colsample_bytree": 0.9, "reg_lambda": 1.0, "objective": "reg:squarederror",
+                    "random_state": 42}
+# 통합(global) 모드 모델 설정 (잔차 모델과 같은 하이퍼파라미터, 전체 코어 사용)
+GLOBAL_XGB_PARAMS = {**RESID_XGB_PARAMS, "n_jobs": -1}
+
+def _prepare_tasks(df_source: pd.DataFrame, target_col: str, min_history: int) -> list:
+    """월말 이력 정리 -> [(company_id, 이력)] (이력이 짧은 회사 제외)"""
     if df_source.empty:
         return []
 
@@ -38,71 +28,120 @@ def forecast_inventory_turnover_hybrid(df_source: pd.DataFrame, target_col="turn
     df["snapshotDate"] = df["snapshotDate"] + pd.offsets.MonthEnd(0)
     df = df.sort_values(["companyId", "snapshotDate"]).drop_duplicates(subset=["companyId", "snapshotDate"], keep="last")
 
-    results = []
+    tasks = []
     for cid, g in df.groupby("companyId"):
         g = g.sort_values("snapshotDate").reset_index(drop=True)
-        y = g[target_col].astype(float)
-
-        if len(y) < min_history:
+        if len(g) < min_history:
             continue
+        tasks.append((cid, g[["snapshotDate", target_col]]))
+    return tasks
 
-        try:
-            # 1. ETS 적합 및 예측
-            seasonal_periods = 12 if len(y) >= 24 else None
-            seasonal = "add" if seasonal_periods else None
-
-            ets_model = ExponentialSmoothing(
-                y,
-                trend="add",
-                damped_trend=True,
-                seasonal=seasonal,
-                seasonal_periods=seasonal_periods,
-                initialization_method="estimated"
-            )
-            ets_res = ets_model.fit(optimized=True)
-            ets_fc = float(ets_res.forecast(H).iloc[0])
-
-            # 2. XGBoost를 이용한 잔차(Residual) 보정
-            fitted = pd.Series(ets_res.fittedvalues).astype(float)
-            resid = y - fitted
-
-            feat_hist = _make_features(g[["snapshotDate", target_col]], target_col=target_col)
-            feature_cols = [c for c in feat_hist.columns if c not in ["snapshotDate", target_col]]
-
-            train_mask = feat_hist[feature_cols].notnull().all(axis=1)
-            X_train = feat_hist.loc[train_mask, feature_cols]
-            y_resid_train = resid.loc[train_mask]
-
-            resid_hat = 0.0
-            if len(X_train) >= 12: # 최소 학습 데이터 확보 시
-                xgb_model = xgb.XGBRegressor(
-                    n_estimators=600,
-                    learning_rate=0.03,
-                    max_depth=4,
-                    subsample=0.9,
-                    colsample_bytree=0.9,
-                    reg_lambda=1.0,
-                    objective="reg:squarederror",
-                    random_state=42)
-                xgb_model.fit(X_train, y_resid_train)
-
-                # 익월 피처 생성 및 예측
-                next_date = g["snapshotDate"].max() + pd.offsets.MonthEnd(1)
-                tmp = pd.concat([g[["snapshotDate", target_col]],
-                                 pd.DataFrame({"snapshotDate": [next_date], target_col: [np.nan]})], ignore_index=True)
-                feat_next = _make_features(tmp, target_col=target_col)
-                X_next = feat_next.iloc[-1:][feature_cols]
-                resid_hat = float(xgb_model.predict(X_next)[0])
-
-            # ETS 결과와 XGB 잔차 예측값 합산 (최솟값 0 보정)
-            y_hat = max(0.0, ets_fc + resid_hat)
-
-            results.append({
-                "company_id": int(cid),
-                "pred_inventory_turnover": round(y_hat, 3)
-            })
-        except Exception as e:
-            print(f"[Error] Hybrid model failed for Company {cid}: {e}")
-            continue
+def forecast_inventory_turnover_hybrid(df_source: pd.DataFrame, target_col="turnOverRate", H=FORECAST_HORIZON, min_history=12,
+                                      max_workers=FORECAST_MAX_WORKERS, mode=FORECAST_MODE, use_cache=FORECAST_CACHE):
+    """
+    ETS + XGBoost 하이브리드 예측
+    익월 재고 회전율 예측 결과를 리스트로 반환
+    H: 예측 개월 수 (H > 1이면 pred_inventory_turnover_outlook에 월별 예측값 추가)
+    mode: per_company(회사별 하이브리드) / global(전체 회사 통합 XGBoost 1개, ETS 없음)
+    use_cache: 모델 레지스트리에서 이력이 같은 예측값 재사용
+    """
+    tasks = _prepare_tasks(df_source, target_col, min_history)
+
+    def fit_per_company(miss_tasks):
+        return _fit_per_company(miss_tasks, target_col, H, max_workers, with_model=use_cache)
+
+    def fit_global(miss_tasks):
+        return forecast_global(miss_tasks, target_col, GLOBAL_XGB_PARAMS, H, clip_zero=True,
+                               with_model=use_cache)
+
+    if not use_cache:
+        preds = fit_global(tasks) if mode == "global" else fit_per_company(tasks)
+    else:
+        # 이력(월말 값)이 그대로인 회사는 저장된 예측값 사용 - 새 월말 데이터가 들어온 날만 재학습
+        registry = ForecastRegistry(f"inventory_turnover/{mode}", {
+            "target_col": target_col, "H": H, "min_history": min_history,
+            "params": GLOBAL_XGB_PARAMS if mode == "global" else RESID_XGB_PARAMS,
+        })
+        cached = cached_global if mode == "global" else cached_per_company
+        preds = cached(registry, tasks, target_col, fit_global if mode == "global" else fit_per_company)
+
+    last_dates = {cid: g["snapshotDate"].max() for cid, g in tasks}
+    results = []
+    for cid, values in preds:
+        item = {"company_id": int(cid), "pred_inventory_turnover": values[0]}
+        if H > 1:
+            item["pred_inventory_turnover_outlook"] = [
+                {"month": month, "value": value} for month, value in zip(horizon_months(last_dates[cid], H), values)]
+        results.append(item)
+    return results
+
+def backtest_inventory_turnover(df_source: pd.DataFrame, target_col="turnOverRate", min_history=12, folds=3) -> pd.DataFrame:
+    """회사별 하이브리드 vs 통합 모델 백테스트 (마지막 folds개월 rolling origin)"""
+    tasks = _prepare_tasks(df_source, target_col, min_history)
+    return backtest_modes(tasks, target_col,
+                          lambda cut: _fit_per_company(cut, target_col),
+                          lambda cut: forecast_global(cut, target_col, GLOBAL_XGB_PARAMS, clip_zero=True), folds=folds)
+
+def _fit_per_company(tasks: list, target_col: str, H: int = 1, max_workers=FORECAST_MAX_WORKERS,
+                     with_model: bool = False) -> list:
+    """
+    회사별 하이브리드 학습/예측 -> [(company_id, [H개월 예측값])] (실패한 회사만 제외, 입력 순서)
+    피처는 전체 회사를 한 번에 만들고, 학습/예측만 프로세스 병렬
+    """
+    return run_per_company(_forecast_company, task_features(tasks, target_col), "Hybrid model",
+                           max_workers=max_workers, target_col=target_col, H=H, with_model=with_model)
 
-    return results
\ No newline at end of file
+def _forecast_company(feat: pd.DataFrame, target_col: str, H: int = 1, n_jobs: int = 1, with_model: bool = False):
+    """
+    회사 한 곳의 H개월 재고 회전율 예측 (ETS + XGBoost 잔차 보정)
+    feat: task_features 결과 (이력 행 + 마지막 익월 행)
+    - 2개월 차부터는 예측값을 lag/rolling 상태에 넣어 다음 달 잔차 피처만 갱신 (재귀 예측)
+    with_model: ([예측값], 모델 아티팩트(ETS 파라미터 / XGBoost JSON)) 반환
+    """
+    # statsmodels / xgboost는 학습할 때만 로드 - 캐시 적중 실행은 import 비용 없음
+    import xgboost as xgb
+    from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+    hist = feat.iloc[:-1]
+    y = hist[target_col].astype(float)
+
+    # 1. ETS 적합 및 예측
+    seasonal_periods = 12 if len(y) >= 24 else None
+    seasonal = "add" if seasonal_periods else None
+
+    ets_model = ExponentialSmoothing(
+        y,
+        trend="add",
+        damped_trend=True,
+        seasonal=seasonal,
+        seasonal_periods=seasonal_periods,
+        initialization_method="estimated"
+    )
+    ets_res = ets_model.fit(optimized=True)
+    ets_fc = ets_res.forecast(H).to_numpy(dtype=float)
+
+    # 2. XGBoost를 이용한 잔차(Residual) 보정
+    fitted = pd.Series(ets_res.fittedvalues).astype(float)
+    resid = y - fitted
+
+    train_mask = hist[FEATURE_COLUMNS].notnull().all(axis=1)
+
+    xgb_model = None
+    if train_mask.sum() >= 12: # 최소 학습 데이터 확보 시
+        xgb_model = xgb.XGBRegressor(**RESID_XGB_PARAMS, n_jobs=n_jobs)
+        xgb_model.fit(feature_matrix(hist[train_mask]), resid[train_mask].to_numpy())
+
+    # ETS 결과와 XGB 잔차 예측값 합산 (최솟값 0 보정), 익월 피처(마지막 행)부터 시작
+    state = LagState.from_frame(hist, target_col)
+    x = feature_matrix(feat.iloc[-1:])
+    y_hat = []
+    for h in range(H):
+        if h:
+            x = state.next_rows()
+        resid_hat = float(xgb_model.predict(x)[0]) if xgb_model is not None else 0.0
+        value = max(0.0, float(ets_fc[h]) + resid_hat)
+        y_hat.append(round(value, 3))
+        state.push([value])
+    if with_model:
+        return y_hat, {"ets": ets_params(ets_res), "xgb": model_to_json(xgb_model) if xgb_model is not None else None}
+    return y_hat
@@ -1,27 +1,18 @@
 import pandas as pd
-import numpy as np
-import xgboost as xgb
-
-def _make_features(df: pd.DataFrame, target_col: str, lags=(1, 2, 3, 6), rolls=(3, 6)):
-    """시계열 피처 생성"""
-    out = df.copy()
-    out = out.sort_values("snapshotDate").reset_index(drop=True)
-    out["moy"] = out["snapshotDate"].dt.month
-    out["moy_sin"] = np.sin(2 * np.pi * out["moy"] / 12)
-    out["moy_cos"] = np.cos(2 * np.pi * out["moy"] / 12)
-
-    for k in lags:
-        out[f"lag_{k}"] = out[target_col].shift(k)
-    for w in rolls:
-        s = out[target_col].shift(1)
-        out[f"roll_mean_{w}"] = s.rolling(w, min_periods=1).mean()
-        out[f"roll_std_{w}"] = s.rolling(w, min_periods=2).std()
-    return out
-
-def forecast_lead_time_xgb(df_source: pd.DataFrame, target_col="shipmentLeadTimeAvg", H=1, min_history=24):
-    """
-    S3에서 로드된 DF를 받아 익월 리드타임을 예측하여 리스트로 반환
-    """
+
+from config import FORECAST_MAX_WORKERS, FORECAST_MODE, FORECAST_CACHE, FORECAST_HORIZON
+from forecast_executor import run_per_company
+from global_forecast import forecast_global, backtest_modes
+from forecast_registry import ForecastRegistry, cached_per_company, cached_global, model_to_json
+from ts_features import FEATURE_COLUMNS, LagState, task_features, feature_matrix, horizon_months
+
+# 회사별 모델 설정 (스레드 수는 실행기가 프로세스당 n_jobs로 지정)
+COMPANY_XGB_PARAMS = {"n_estimators": 500, "learning_rate": 0.05, "max_depth": 5, "random_state": 42}
+# 통합(global) 모드 모델 설정 (회사별 모델과 같은 하이퍼파라미터, 학습은 한 번이므로 전체 코어 사용)
+GLOBAL_XGB_PARAMS = {**COMPANY_XGB_PARAMS, "n_jobs": -1}
+
+def _prepare_tasks(df_source: pd.DataFrame, target_col: str, min_history: int) -> list:
+    """월말 이력 정리 -> [(company_id, 이력)] (이력이 짧은 회사 제외)"""
     if df_source.empty:
         return []
 
@@ -36,41 +27,95 @@ def forecast_lead_time_xgb(df_source: pd.DataFrame, target_col="shipmentLeadTime
     df = df[df["snapshotDate"] == month_end].copy()
     df = df.sort_values(["companyId", "snapshotDate"]).drop_duplicates(subset=["companyId", "snapshotDate"], keep="last")
 
-    results = []
+    tasks = []
     for cid, g in df.groupby("companyId"):
         g = g.sort_values("snapshotDate").reset_index(drop=True).copy()
 
         if len(g) < min_history:
             print(f"[Skip] Company {cid} has only {len(g)} months.")
             continue
+        tasks.append((cid, g[["snapshotDate", target_col]]))
+    return tasks
 
-        feat = _make_features(g[["snapshotDate", target_col]].copy(), target_col=target_col)
-        feature_cols = [c for c in feat.columns if c not in ["snapshotDate", target_col, "companyId"]]
-
-        train_mask = feat[feature_cols].notnull().all(axis=1)
-        X_train = feat.loc[train_mask, feature_cols]
-        y_train = feat.loc[train_mask, target_col].astype(float)
-
-        if X_train.empty:
-            continue
-
-        model = xgb.XGBRegressor(n_estimators=500, learning_rate=0.05, max_depth=5, random_state=42, n_jobs=-1)
-        model.fit(X_train, y_train)
-
-        # 예측 (익월 말일 기준)
-        last_date = g["snapshotDate"].max()
-        next_date = last_date + pd.offsets.MonthEnd(1)
+def forecast_lead_time_xgb(df_source: pd.DataFrame, target_col="shipmentLeadTimeAvg", H=FORECAST_HORIZON, min_history=24,
+                           max_workers=FORECAST_MAX_WORKERS, mode=FORECAST_MODE, use_cache=FORECAST_CACHE):
+    """
+    S3에서 로드된 DF를 받아 익월 리드타임을 예측하여 리스트로 반환
+    H: 예측 개월 수 (H > 1이면 pred_shipment_lead_time_outlook에 월별 예측값 추가)
+    mode: per_company(회사별 모델) / global(전체 회사 통합 모델 1개)
+    use_cache: 모델 레지스트리에서 이력이 같은 예측값 재사용
+    """
+    tasks = _prepare_tasks(df_source, target_col, min_history)
 
-        tmp = pd.concat([g[["snapshotDate", target_col]],
-                         pd.DataFrame({"snapshotDate": [next_date], target_col: [np.nan]})], ignore_index=True)
-        feat_tmp = _make_features(tmp, target_col=target_col)
-        X_last = feat_tmp.iloc[-1:][feature_cols]
+    def fit_per_company(miss_tasks):
+        return _fit_per_company(miss_tasks, target_col, H, max_workers, with_model=use_cache)
 
-        y_hat = float(model.predict(X_last)[0])
+    def fit_global(miss_tasks):
+        return forecast_global(miss_tasks, target_col, GLOBAL_XGB_PARAMS, H, with_model=use_cache)
 
-        results.append({
-            "company_id": int(cid),
-            "pred_shipment_lead_time": round(y_hat, 3)
+    if not use_cache:
+        preds = fit_global(tasks) if mode == "global" else fit_per_company(tasks)
+    else:
+        # 이력(월말 값)이 그대로인 회사는 저장된 예측값 사용 - 새 월말 데이터가 들어온 날만 재학습
+        registry = ForecastRegistry(f"shipment_lead_time/{mode}", {
+            "target_col": target_col, "H": H, "min_history": min_history,
+            "params": GLOBAL_XGB_PARAMS if mode == "global" else COMPANY_XGB_PARAMS,
         })
+        cached = cached_global if mode == "global" else cached_per_company
+        preds = cached(registry, tasks, target_col, fit_global if mode == "global" else fit_per_company)
+
+    last_dates = {cid: g["snapshotDate"].max() for cid, g in tasks}
+    results = []
+    for cid, values in preds:
+        item = {"company_id": int(cid), "pred_shipment_lead_time": values[0]}
+        if H > 1:
+            item["pred_shipment_lead_time_outlook"] = [
+                {"month": month, "value": value} for month, value in zip(horizon_months(last_dates[cid], H), values)]
+        results.append(item)
+    return results
+
+def backtest_lead_time(df_source: pd.DataFrame, target_col="shipmentLeadTimeAvg", min_history=24, folds=3) -> pd.DataFrame:
+    """회사별 모델 vs 통합 모델 백테스트 (마지막 folds개월 rolling origin)"""
+    tasks = _prepare_tasks(df_source, target_col, min_history)
+    return backtest_modes(tasks, target_col,
+                          lambda cut: _fit_per_company(cut, target_col),
+                          lambda cut: forecast_global(cut, target_col, GLOBAL_XGB_PARAMS), folds=folds)
+
+def _fit_per_company(tasks: list, target_col: str, H: int = 1, max_workers=FORECAST_MAX_WORKERS,
+                     with_model: bool = False) -> list:
+    """
+    회사별 모델 학습/예측 -> [(company_id, [H개월 예측값])] (입력 순서)
+    피처는 전체 회사를 한 번에 만들고, 학습/예측만 프로세스 병렬
+    """
+    return run_per_company(_forecast_company, task_features(tasks, target_col), "Lead time model",
+                           max_workers=max_workers, target_col=target_col, H=H, with_model=with_model)
 
-    return results
\ No newline at end of file
+def _forecast_company(feat: pd.DataFrame, target_col: str, H: int = 1, n_jobs: int = 1, with_model: bool = False):
+    """
+    회사 한 곳의 H개월 리드타임 예측 (학습 데이터가 없으면 None)
+    feat: task_features 결과 (이력 행 + 마지막 익월 행)
+    - 2개월 차부터는 예측값을 lag/rolling 상태에 넣어 다음 달 피처만 갱신 (재귀 예측)
+    with_model: ([예측값], 모델 아티팩트) 반환
+    """
+    # xgboost(+ scikit-learn)는 학습할 때만 로드 - 캐시 적중 실행은 import 비용 없음
+    import xgboost as xgb
+
+    hist = feat.iloc[:-1]
+    train_mask = hist[FEATURE_COLUMNS].notnull().all(axis=1)
+    if not train_mask.any():
+        return None
+
+    model = xgb.XGBRegressor(**COMPANY_XGB_PARAMS, n_jobs=n_jobs)
+    model.fit(feature_matrix(hist[train_mask]), hist.loc[train_mask, target_col].astype(float).to_numpy())
+
+    # 예측 (익월 말일 기준 행부터)
+    state = LagState.from_frame(hist, target_col)
+    x = feature_matrix(feat.iloc[-1:])
+    y_hat = []
+    for h in range(H):
+        if h:
+            x = state.next_rows()
+        value = float(model.predict(x)[0])
+        y_hat.append(round(value, 3))
+        state.push([value])
+    return (y_hat, {"xgb": model_to_json(model)}) if with_model else y_hat
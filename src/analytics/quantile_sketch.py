@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+class QuantileSketch:
+    """
+    병합 가능한 분위수 스케치 (merging t-digest, k1 scale)
+    - compression(δ)이 클수록 정확 (centroid 최대 약 δ/2개, 순위 오차 약 1/δ 수준)
+    - 값이 적을 때(약 δ/π개 미만)는 모든 값을 그대로 보관 -> pandas quantile(linear)과 같은 결과
+    - 월별 스케치를 merge해서 기간 전체 분위수를 메모리 제한 안에서 계산
+    """
+
+    def __init__(self, means=(), weights=(), vmin=np.nan, vmax=np.nan, compression: float = 200.0):
+        self.means = np.asarray(means, dtype=np.float64)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.vmin = float(vmin)
+        self.vmax = float(vmax)
+        self.compression = float(compression)
+
+    @classmethod
+    def from_values(cls, values, compression: float = 200.0):
+        """원본 값으로 스케치 생성 (NaN 제외)"""
+        values = np.asarray(values, dtype=np.float64)
+        values = np.sort(values[~np.isnan(values)])
+        if len(values) == 0:
+            return cls(compression=compression)
+        sketch = cls(values, np.ones(len(values)), values[0], values[-1], compression)
+        return sketch._compress()
+
+    @classmethod
+    def merge_all(cls, sketches, compression: float = None):
+        """여러 스케치 병합 (월별 -> SLA 기간 전체)"""
+        sketches = [s for s in sketches if s.count > 0]
+        if compression is None:
+            compression = min((s.compression for s in sketches), default=200.0)
+        if not sketches:
+            return cls(compression=compression)
+        means = np.concatenate([s.means for s in sketches])
+        weights = np.concatenate([s.weights for s in sketches])
+        order = np.argsort(means, kind="stable")
+        merged = cls(means[order], weights[order],
+                     min(s.vmin for s in sketches), max(s.vmax for s in sketches), compression)
+        return merged._compress()
+
+    def merge(self, other):
+        return QuantileSketch.merge_all([self, other], self.compression)
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def _k(self, q):
+        """k1 scale 함수: 분포 양끝일수록 centroid를 잘게 유지"""
+        return self.compression / (2 * np.pi) * np.arcsin(2 * np.clip(q, 0.0, 1.0) - 1)
+
+    def _compress(self):
+        """정렬된 centroid를 k 구간(폭 1) 단위로 묶어 크기 제한"""
+        total = self.count
+        left = np.concatenate([[0.0], np.cumsum(self.weights)[:-1]]) / total
+        bucket = np.floor(self._k(left) - self._k(0.0)).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        weights = np.add.reduceat(self.weights, starts)
+        means = np.add.reduceat(self.means * self.weights, starts) / weights
+        self.means, self.weights = means, weights
+        return self
+
+    def quantile(self, q: float) -> float:
+        """
+        분위수 추정 (pandas 기본값과 같은 linear 방식)
+        centroid를 (누적 순위 중심, 평균) 점으로 보고 순위 (n-1)*q에서 선형 보간
+        """
+        total = self.count
+        if total == 0:
+            return np.nan
+        left = np.concatenate([[0.0], np.cumsum(self.weights)[:-1]])
+        ranks = left + (self.weights - 1) / 2
+        values = self.means
+        # 양 끝은 실제 최소/최대값으로 고정
+        if ranks[0] > 0:
+            ranks, values = np.r_[0.0, ranks], np.r_[self.vmin, values]
+        if ranks[-1] < total - 1:
+            ranks, values = np.r_[ranks, total - 1], np.r_[values, self.vmax]
+        return float(np.interp((total - 1) * q, ranks, values))
+
+def sketches_to_frame(sketches: dict, key_cols: list) -> pd.DataFrame:
+    """{키 튜플: 스케치} -> centroid 행 단위 DataFrame (Parquet 저장용)"""
+    rows = []
+    for key, sketch in sketches.items():
+        frame = pd.DataFrame({"mean": sketch.means, "weight": sketch.weights})
+        for col, value in zip(key_cols, key):
+            frame[col] = value
+        frame["vmin"], frame["vmax"], frame["compression"] = sketch.vmin, sketch.vmax, sketch.compression
+        rows.append(frame)
+    columns = key_cols + ["mean", "weight", "vmin", "vmax", "compression"]
+    if not rows:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(rows, ignore_index=True)[columns]
+
+def sketches_from_frame(df: pd.DataFrame, key_cols: list) -> dict:
+    """sketches_to_frame의 역변환"""
+    sketches = {}
+    for key, g in df.groupby(key_cols, sort=False):
+        key = key if isinstance(key, tuple) else (key,)
+        sketches[key] = QuantileSketch(g["mean"].to_numpy(), g["weight"].to_numpy(),
+                                       g["vmin"].iloc[0], g["vmax"].iloc[0], g["compression"].iloc[0])
+    return sketches
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from config import S3_BUCKET, KPI_PREFIX, UPLOAD_MAX_WORKERS, UPLOAD_MAX_RETRIES
+from snapshot_loader import get_s3_client, read_body
+
+def report_key(company_id: int, snapshot_date_str: str) -> str:
+    """회사별 Daily Report 저장 경로"""
+    return f"{KPI_PREFIX}/daily-report/company-{company_id}/report_{snapshot_date_str}.json"
+
+def manifest_key(snapshot_date_str: str) -> str:
+    """스냅샷 날짜별 업로드 매니페스트 (리포트 키 -> 내용 해시)"""
+    return f"{KPI_PREFIX}/daily-report/_manifest/manifest_{snapshot_date_str}.json"
+
+def consolidated_key(snapshot_date_str: str) -> str:
+    """전체 회사 리포트를 한 줄씩 담은 NDJSON 경로"""
+    return f"{KPI_PREFIX}/daily-report/all/report_{snapshot_date_str}.ndjson"
+
+def content_hash(payload: dict) -> str:
+    """calculatedAt(실행 시각)을 제외한 리포트 내용 해시"""
+    body = {k: v for k, v in payload.items() if k != "calculatedAt"}
+    return hashlib.sha256(json.dumps(body, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+def _put_with_retry(key: str, body: str, content_type: str, max_retries: int):
+    """put_object + 지수 백오프 재시도 (클라이언트 자체 재시도 이후에도 실패한 경우)"""
+    for attempt in range(max_retries + 1):
+        try:
+            get_s3_client().put_object(Bucket=S3_BUCKET, Key=key, Body=body, ContentType=content_type)
+            return
+        except (ClientError, BotoCoreError) as e:
+            if attempt == max_retries:
+                raise
+            delay = min(8.0, 0.5 * (2 ** attempt)) * random.uniform(0.5, 1.0)
+            print(f"[Retry] {key} ({attempt + 1}/{max_retries}) after {delay:.2f}s: {e}")
+            time.sleep(delay)
+
+def _load_manifest(snapshot_date_str: str) -> dict:
+    s3_client = get_s3_client()
+    try:
+        response = s3_client.get_object(Bucket=S3_BUCKET, Key=manifest_key(snapshot_date_str))
+        return json.loads(read_body(response))
+    except s3_client.exceptions.NoSuchKey:
+        return {}
+
+def upload_reports(payloads: list, snapshot_date_str: str,
+                   max_workers: int = UPLOAD_MAX_WORKERS, max_retries: int = UPLOAD_MAX_RETRIES) -> dict:
+    """
+    회사별 KPI 리포트 일괄 업로드
+    - 마지막으로 쓴 내용과 해시가 같은 리포트는 건너뜀 (같은 날짜 재실행 시)
+    - 나머지는 스레드 풀로 동시에 업로드
+    - 전체 회사 리포트를 NDJSON 한 파일로 함께 저장
+    """
+    manifest = _load_manifest(snapshot_date_str)
+
+    pending = []
+    for payload in payloads:
+        key = report_key(payload["companyId"], snapshot_date_str)
+        digest = content_hash(payload)
+        if manifest.get(key) == digest:
+            continue
+        pending.append((key, digest, json.dumps(payload, ensure_ascii=False)))
+
+    def upload(item):
+        key, digest, body = item
+        _put_with_retry(key, body, "application/json", max_retries)
+        print(f"[Success] Uploaded Integrated KPI -> {key}")
+        return key, digest
+
+    failed = []
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending))), thread_name_prefix="report-uploader") as pool:
+            futures = [pool.submit(upload, item) for item in pending]
+            for item, future in zip(pending, futures):
+                try:
+                    key, digest = future.result()
+                    manifest[key] = digest
+                except Exception as e:
+                    print(f"[Error] Upload failed: {item[0]}, {e}")
+                    failed.append(item[0])
+
+    # 통합 파일 + 매니페스트 (성공한 업로드만 반영)
+    ndjson = "\n".join(json.dumps(payload, ensure_ascii=False) for payload in payloads)
+    _put_with_retry(consolidated_key(snapshot_date_str), ndjson, "application/x-ndjson", max_retries)
+    _put_with_retry(manifest_key(snapshot_date_str), json.dumps(manifest), "application/json", max_retries)
+
+    summary = {"uploaded": len(pending) - len(failed), "skipped": len(payloads) - len(pending), "failed": len(failed)}
+    print(f"[Upload] {summary}")
+    if failed:
+        raise RuntimeError(f"리포트 업로드 실패 {len(failed)}건: {failed[:5]}")
+    return summary
@@ -1,20 +1,24 @@
 import pandas as pd
-import boto3
 import json
 # timezone, timedelta 추가
 from datetime import datetime, timezone, timedelta
 from safety_stock_kpi import calculate_safety_stock_rate
-from shipment_lead_time import calculate_shipment_lead_time
-from shipping_completion_rate import calculate_shipping_completion_rate
-from project_completion_kpi import calculate_project_completion_rate
-from long_term_task_rate_kpi import calculate_long_term_task_rate, calculate_leadtimes, build_hist_leadtimes_like_v1
+from month_to_date_kpi import calculate_month_to_date_kpis
+from long_term_task_rate_kpi import calculate_sla_from_history, calculate_sla_from_sketches
+from leadtime_artifacts import load_sla_history, load_sla_sketches
 from inventory_turnover import calculate_inventory_turnover
+from item_company_index import ItemCompanyIndex
+from chunked_item_kpis import ITEM_TABLES, calculate_item_kpis_chunked
 from predict_shipment_lead_time import forecast_lead_time_xgb
 from predict_inventory_turnover import forecast_inventory_turnover_hybrid
+from snapshot_loader import SnapshotStore, enable_copy_on_write
+from forecast_sources import read_kpi_history, load_forecast_sources
+from report_uploader import upload_reports
+from stage_metrics import RunMetrics
 
-from config import S3_BUCKET, RAW_PREFIX, KPI_PREFIX, AWS_REGION
+from config import SLA_WINDOW_MONTHS, SLA_SKETCH_MODE, FORECAST_HORIZON, FORECAST_SOURCE, ITEM_KPI_MODE
 
-s3_client = boto3.client("s3", region_name=AWS_REGION)
+TABLES = ["project", "inventory", "inventory_item", "logistics", "logistics_item", "item"]
 
 def get_last_day_of_month(base_date, month_offset):
     """기준일로부터 n개월 전 마지막 날짜 반환"""
@@ -27,206 +31,283 @@ def get_yesterday(date):
     """현재 날짜 기준 어제의 날짜 반환 (Daily Snapshot 용)"""
     return date - timedelta(days=1)
 
-def get_csv_by_date(table_name, target_date_str):
-    """지정된 날짜의 CSV를 S3에서 로드"""
-    # 예: exports/daily/item--2025-12-31.csv
-    file_key = f"{RAW_PREFIX}{table_name}--{target_date_str}.csv"
-    try:
-        print(f"[Loading] {file_key}")
-        response = s3_client.get_object(Bucket=S3_BUCKET, Key=file_key)
-        return pd.read_csv(response['Body'])
-    except s3_client.exceptions.NoSuchKey:
-        print(f"[Error] File not found: {file_key}")
-        return pd.DataFrame()
-
-def get_static_csv(file_name):
-    """날짜 접미사 없이 고정된 이름의 CSV 로드"""
-    file_key = f"{RAW_PREFIX}{file_name}.csv" # 접미사 제거
-    try:
-        print(f"[Loading Static] {file_key}")
-        response = s3_client.get_object(Bucket=S3_BUCKET, Key=file_key)
-        return pd.read_csv(response['Body'])
-    except Exception as e:
-        print(f"[Error] Static file not found: {file_key}, {e}")
-        return pd.DataFrame()
-def run():
+def build_load_plan(target_date_str, first_day_str, prev_month_end_str, tables=TABLES):
+    """
+    run()에 필요한 스냅샷 목록 {이름: (테이블명, 날짜)} 생성
+    tables: 당일/월초 전체 로드 테이블 (청크 처리 모드는 품목 단위 테이블 제외)
+    """
+    plan = {}
+    for table in tables:
+        plan[table] = (table, target_date_str)                 # 당일
+        plan[f"{table}_first"] = (table, first_day_str)        # 월초 (재고 회전율용)
+
+    plan["prev_project"] = ("project", prev_month_end_str)     # 전월 말 프로젝트 스냅샷
+    plan["prev_logistics"] = ("logistics", prev_month_end_str) # 전월 말 출하 스냅샷
+    # 예측 학습 입력(KPI 이력 / mock)은 forecast_sources에서 따로 로드
+    return plan
+
+def get_loaded_tables(mode=ITEM_KPI_MODE):
+    """전체 로드 테이블 (chunked 모드는 품목 단위 테이블을 KPI 계산 시 청크로 스트리밍하므로 제외)"""
+    return [t for t in TABLES if t not in ITEM_TABLES] if mode == "chunked" else TABLES
+
+def get_run_dates(target_date) -> dict:
+    """분석 기준일 -> 당일 / 당월 / 월초 / 전월 말 / SLA 기준 기간 월말 날짜 문자열"""
+    first_day_of_current = target_date.replace(day=1)
+    prev_month_end = first_day_of_current - timedelta(days=1)
+    return {
+        "target": target_date.strftime("%Y-%m-%d"),
+        "month": target_date.strftime("%Y-%m"),
+        "first_day": first_day_of_current.strftime("%Y-%m-%d"),
+        "prev_month_end": prev_month_end.strftime("%Y-%m-%d"),
+        # SLA 기준 기간 월말 (기본 과거 3개월, SLA_WINDOW_MONTHS로 변경)
+        "hist": [get_last_day_of_month(target_date, i).strftime("%Y-%m-%d") for i in range(1, SLA_WINDOW_MONTHS + 1)],
+    }
+
+def get_daily_load_plan(target_date) -> dict:
+    """run(target_date)이 로드하는 스냅샷 목록 (backfill 사전 계획과 공용)"""
+    dates = get_run_dates(target_date)
+    return build_load_plan(dates["target"], dates["first_day"], dates["prev_month_end"], get_loaded_tables())
+
+def calculate_sla(hist_date_strs: list, store) -> pd.DataFrame:
+    """
+    SLA 기준 기간 회사별 SLA
+    과거 월 리드타임은 마감월 아티팩트에서 읽음 (없는 달만 원천 월말 스냅샷으로 생성)
+    tdigest 모드는 리드타임 원본 대신 월별 스케치만 병합해 SLA 계산
+    """
+    if SLA_SKETCH_MODE == "tdigest":
+        return calculate_sla_from_sketches(load_sla_sketches(hist_date_strs, store))
+    return calculate_sla_from_history(*load_sla_history(hist_date_strs, store))
+
+def _shared(shared, key, builder):
+    """같은 달 실행끼리 공유하는 결과 (backfill) - shared가 없으면 매번 계산"""
+    if shared is None:
+        return builder()
+    if key not in shared:
+        shared[key] = builder()
+    return shared[key]
+
+def run(target_date=None, store=None, shared=None):
+    """
+    일일 KPI 분석 및 리포트 저장
+    target_date: 분석 기준일 (date/datetime, 기본은 KST 기준 어제)
+    store: 여러 날짜가 같이 쓰는 SnapshotStore (backfill) - 없으면 실행마다 만들고 닫음
+    shared: 같은 달 실행끼리 공유하는 결과 dict (backfill)
+            sla / first_index(월초 품목 매핑) / forecast_lead_time / forecast_turnover
+    예측은 전월까지 마감된 월별 KPI 이력으로 학습 (이력이 짧으면 mock 고정 파일)
+    """
     kst_timezone = timezone(timedelta(hours=9))
     now_kst = datetime.now(kst_timezone)
 
     # 1. 날짜 지정
-    target_date = get_yesterday(now_kst)
-    target_date_str = target_date.strftime("%Y-%m-%d")
-    target_month_str = target_date.strftime("%Y-%m")
+    if target_date is None:
+        target_date = get_yesterday(now_kst)
+    dates = get_run_dates(target_date)
+    target_date_str = dates["target"]
+    target_month_str = dates["month"]
+    first_day_str = dates["first_day"]
     print(f"[Target Date] Analyzing data for: {target_date_str}")
 
-    first_day_of_current = target_date.replace(day=1)
-    first_day_str = first_day_of_current.strftime("%Y-%m-%d")
-    prev_month_end = first_day_of_current - timedelta(days=1)
-    prev_month_end_str = prev_month_end.strftime("%Y-%m-%d")
-
-    # 2. 데이터 로드
-    df_item = get_csv_by_date("item", target_date_str)
-    df_project = get_csv_by_date("project", target_date_str)
-    df_prev_project = get_csv_by_date("project", prev_month_end_str) # 전월 말 프로젝트 스냅샷
-    df_logistics = get_csv_by_date("logistics", target_date_str)
-    df_logistics_item = get_csv_by_date("logistics_item", target_date_str)
-    df_prev_logistics = get_csv_by_date("logistics", prev_month_end_str) # 전월 말 출하 스냅샷
-    df_inventory = get_csv_by_date("inventory", target_date_str)
-    df_inventory_item = get_csv_by_date("inventory_item", target_date_str)
-
-    # 재고 회전율의 (월초 - 회전율 계산용)
-    df_item_f = get_csv_by_date("item", first_day_str)
-    df_project_f = get_csv_by_date("project", first_day_str)
-    df_logistics_f = get_csv_by_date("logistics", first_day_str)
-    df_logistics_item_f = get_csv_by_date("logistics_item", first_day_str)
-    df_inventory_f = get_csv_by_date("inventory", first_day_str)
-    df_inventory_item_f = get_csv_by_date("inventory_item", first_day_str)
+    # 단계별 지표 (실행당 EMF 레코드 1개, 실패 시 실패 단계까지 출력)
+    run_metrics = RunMetrics("daily_kpi", target_date_str)
+
+    # 2. 데이터 로드 (전체 로드 계획을 스레드 풀로 동시에 가져옴)
+    # 월초 = 당일(1일 실행), 전월 말 = 과거 1개월 말일처럼 겹치는 (테이블, 날짜)는 한 번만 로드
+    # chunked 모드는 품목 단위 테이블(item, inventory_item, logistics_item)을 KPI 계산 시 청크로 스트리밍
+    chunked = ITEM_KPI_MODE == "chunked"
+    loaded_tables = get_loaded_tables()
+    own_store = store is None
+    if own_store:
+        store = SnapshotStore()
+    try:
+        with run_metrics.stage("load") as st:
+            frames = store.load(get_daily_load_plan(target_date))
+            # 공유 예측 결과가 하나라도 없으면 예측 입력 로드 (출하 리드타임 / 재고 회전율)
+            if shared is None or not {"forecast_lead_time", "forecast_turnover"} <= shared.keys():
+                history = read_kpi_history() if FORECAST_SOURCE == "history" else None
+                forecast_sources = load_forecast_sources(history, store, target_month_str)
+            st.rows_out = sum(len(df) for df in frames.values())
+        with run_metrics.stage("sla") as st:
+            df_sla = _shared(shared, "sla", lambda: calculate_sla(dates["hist"], store))
+            st.rows_out = len(df_sla)
+    finally:
+        if own_store:
+            store.close()
+    if own_store:
+        print(f"[Cache] snapshot store: {store.stats()}")
+
+    df_project = frames["project"]
+    df_prev_project = frames["prev_project"] # 전월 말 프로젝트 스냅샷
+    df_logistics = frames["logistics"]
+    df_prev_logistics = frames["prev_logistics"] # 전월 말 출하 스냅샷
+    df_inventory = frames["inventory"]
 
     # 재고 회전율 월초 데이터 딕셔너리로 묶기
-    df_first_dict = {
-        'project': df_project_f,
-        'inventory': df_inventory_f,
-        'inventory_item': df_inventory_item_f,
-        'logistics': df_logistics_f,
-        'logistics_item': df_logistics_item_f,
-        'item': df_item_f
-    }
+    df_first_dict = {table: frames[f"{table}_first"] for table in loaded_tables}
 
     # 재고 회전율 월말 데이터 딕셔너리로 묶기
-    df_last_dict = {
-        'project': df_project,
-        'inventory': df_inventory,
-        'inventory_item': df_inventory_item,
-        'logistics': df_logistics,
-        'logistics_item': df_logistics_item,
-        'item': df_item
-    }
-
-    # 예측용 Mock 데이터 로드
-    df_leadtime_mock = get_static_csv("predict_leadtime_mock")
-    df_turnover_mock = get_static_csv("predict_turnover_mock")
-
-    # 과거 3개월 데이터 로드 (업무 장기 처리율 SLA 계산용)
-    hist_logs, hist_invs = [], []
-    for i in range(1, 4):
-        hist_date_str = get_last_day_of_month(target_date, i).strftime("%Y-%m-%d")
-
-        h_proj = get_csv_by_date("project", hist_date_str)
-        h_log = get_csv_by_date("logistics", hist_date_str)
-        h_inv = get_csv_by_date("inventory", hist_date_str)
+    df_last_dict = {table: frames[table] for table in loaded_tables}
 
-        if not h_log.empty and not h_inv.empty:
-            h_log_processed, h_inv_processed = build_hist_leadtimes_like_v1(h_proj, h_log, h_inv)
-
-        # 가공된(필터링 완료된) 리드타임 데이터프레임을 리스트에 추가
-        hist_logs.append(h_log_processed)
-        hist_invs.append(h_inv_processed)
-    # [디버깅 추가] 데이터 로드 확인
-    print(f"로드 결과: item({len(df_item)}건), project({len(df_project)}건), logistics({len(df_logistics)}건), logistics_item({len(df_logistics_item)}건)")
-
-    if df_item.empty:
+    # 3. KPI 분석
+    if chunked:
+        # 품목 단위 테이블은 청크로 읽으며 회사별 부분 집계 (ITEM_CHUNK_MEMORY_MB 상한)
+        with run_metrics.stage("item_kpis_chunked") as st:
+            safety_results, turn_over_results, item_rows = calculate_item_kpis_chunked(
+                target_date_str, first_day_str, df_last_dict, df_first_dict)
+            st.rows_in, st.rows_out = item_rows, len(safety_results) + len(turn_over_results)
+        print(f"로드 결과: item({item_rows}건, 청크), project({len(df_project)}건), logistics({len(df_logistics)}건)")
+    else:
+        df_item = frames["item"]
+        df_logistics_item = frames["logistics_item"]
+        df_inventory_item = frames["inventory_item"]
+        item_rows = len(df_item)
+        # [디버깅 추가] 데이터 로드 확인
+        print(f"로드 결과: item({len(df_item)}건), project({len(df_project)}건), logistics({len(df_logistics)}건), logistics_item({len(df_logistics_item)}건)")
+
+    if item_rows == 0:
+        run_metrics.emit(status="failed")
         raise RuntimeError(f"데이터가 없어 분석을 진행할 수 없습니다: {target_date_str}")
 
-    # 3. KPI 분석
-    safety_results = calculate_safety_stock_rate(df_project, df_inventory, df_inventory_item, df_logistics, df_logistics_item, df_item)
-    lead_time_results = calculate_shipment_lead_time(df_project, df_logistics, target_month_str)
-    log_comp_results = calculate_shipping_completion_rate(df_project, df_logistics, df_prev_logistics, target_month_str)
-    proj_comp_results = calculate_project_completion_rate(df_project, df_prev_project, target_month_str)
-    long_term_results = calculate_long_term_task_rate(df_project, df_logistics, df_inventory, hist_logs, hist_invs, target_month_str)
-    turn_over_results = calculate_inventory_turnover(df_first_dict, df_last_dict)
-    pred_lead_time_results = forecast_lead_time_xgb(df_leadtime_mock)
-    pred_turnover_results = forecast_inventory_turnover_hybrid(df_turnover_mock)
+    if not chunked:
+        # 품목 -> 회사/프로젝트 매핑은 스냅샷당 한 번만 만들어 안전재고/재고 회전율이 같이 사용
+        with run_metrics.stage("item_index", rows_in=len(df_inventory_item) + len(df_logistics_item)):
+            first_index = _shared(shared, "first_index", lambda: ItemCompanyIndex.from_tables(df_first_dict))
+            last_index = ItemCompanyIndex.from_tables(df_last_dict)
+
+        with run_metrics.stage("safety_stock", rows_in=len(df_item)) as st:
+            safety_results = calculate_safety_stock_rate(df_project, df_inventory, df_inventory_item, df_logistics, df_logistics_item, df_item, item_index=last_index)
+            st.rows_out = len(safety_results)
+        with run_metrics.stage("inventory_turnover", rows_in=len(df_item)) as st:
+            turn_over_results = calculate_inventory_turnover(df_first_dict, df_last_dict, first_index=first_index, last_index=last_index)
+            st.rows_out = len(turn_over_results)
+
+    # 출하 리드타임 / 출하 완료율 / 프로젝트 완료율 / 업무 장기 처리율은 당일 정규화 업무 테이블 하나로 같이 계산
+    with run_metrics.stage("month_to_date", rows_in=len(df_project) + len(df_logistics) + len(df_inventory)) as st:
+        mtd_results = calculate_month_to_date_kpis(target_month_str, df_project, df_prev_project, df_logistics,
+                                                   df_prev_logistics, df_inventory, df_sla)
+        st.rows_out = sum(len(results) for results in mtd_results.values())
+    lead_time_results = mtd_results["shipment_lead_time"]
+    log_comp_results = mtd_results["shipping_completion"]
+    proj_comp_results = mtd_results["project_completion"]
+    long_term_results = mtd_results["long_term"]
+    with run_metrics.stage("forecast_lead_time") as st:
+        pred_lead_time_results = _shared(shared, "forecast_lead_time",
+                                         lambda: forecast_lead_time_xgb(forecast_sources["leadtime"]))
+        st.rows_out = len(pred_lead_time_results)
+    with run_metrics.stage("forecast_turnover") as st:
+        pred_turnover_results = _shared(shared, "forecast_turnover",
+                                        lambda: forecast_inventory_turnover_hybrid(forecast_sources["turnover"]))
+        st.rows_out = len(pred_turnover_results)
+
     # 4. 데이터 병합
-    combined_kpis = {}
-
-    # 초기화 및 안전재고 확보율 병합
-    for item in safety_results:
-        cid = item["company_id"]
-        combined_kpis.setdefault(cid, {})["safety_stock_rate"] = item["safety_stock_rate_monthly"]
-
-    # 출하 리드타임 평균 병합
-    for item in lead_time_results:
-        cid = item["company_id"]
-        combined_kpis.setdefault(cid, {})["shipment_lead_time"] = item["shipment_lead_time_avg_hours"]
-
-    # 출하 완료율 병합 (신규 추가)
-    for item in log_comp_results:
-        cid = item["company_id"]
-        combined_kpis.setdefault(cid, {})["shipping_completion_rate"] = item["shipping_completion_rate"]
-
-    # 프로젝트 완료율 병합
-    for item in proj_comp_results:
-        cid = item["company_id"]
-        combined_kpis.setdefault(cid, {})["project_completion_rate"] = item["project_completion_rate"]
-
-    # 업무 장기 처리율 병합
-    for item in long_term_results:
-        cid = item["company_id"]
-        target = combined_kpis.setdefault(cid, {})
-        target["long_term_task_rate"] = item["long_term_task_rate"]
-        target["total_task_count"] = item["total_task_count"]
-        target["logistics_task_count"] = item["logistics_task_count"]
-        target["inventory_task_count"] = item["inventory_task_count"]
-        target["total_delayed_count"] = item["total_delayed_count"]
-        target["logistics_delayed_count"] = item["logistics_delayed_count"]
-        target["inventory_delayed_count"] = item["inventory_delayed_count"]
-
-    # 재고 회전율 병합
-    for item in turn_over_results:
-        cid = item["company_id"]
-        combined_kpis.setdefault(cid, {})["inventory_turnover"] = item["inventory_turnover"]
-
-    print(f"분석 완료: 총 {len(combined_kpis)}개 회사의 통합 KPI가 산출되었습니다.")
-
-    # 리드타임 예측치 병합
-    for item in pred_lead_time_results:
-        cid = item["company_id"]
-        combined_kpis.setdefault(cid, {})["pred_shipment_lead_time"] = item["pred_shipment_lead_time"]
-
-    # 재고회전율 예측치 병합
-    for item in pred_turnover_results:
-        cid = int(item["company_id"])
-        combined_kpis.setdefault(cid, {})["pred_inventory_turnover"] = item["pred_inventory_turnover"]
-
-    # 5. 결과 S3 저장 (JSON 적재)
-    for company_id, metrics in combined_kpis.items():
-        if pd.isna(company_id): continue
-
-        payload = {
-            "companyId": int(company_id),
-            "snapshotDate": target_date_str,
-            "metrics": {
-                "safetyStockRate": float(metrics.get("safety_stock_rate", 0.0)),
-                "shipmentLeadTimeAvg": float(metrics.get("shipment_lead_time", 0.0)),
-                "shippingCompletionRate": float(metrics.get("shipping_completion_rate", 0.0)),
-                "projectCompletionRate": float(metrics.get("project_completion_rate", 0.0)),
-                "longTermTaskRate": float(metrics.get("long_term_task_rate", 0.0)),
-                "totalTaskCount": int(metrics.get("total_task_count", 0)),
-                "logisticsTaskCount": int(metrics.get("logistics_task_count", 0)),
-                "inventoryTaskCount": int(metrics.get("inventory_task_count", 0)),
-                "totalDelayedCount": int(metrics.get("total_delayed_count", 0)),
-                "logisticsDelayedCount": int(metrics.get("logistics_delayed_count", 0)),
-                "inventoryDelayedCount": int(metrics.get("inventory_delayed_count", 0)),
-                "turnOverRate": float(metrics.get("inventory_turnover", 0.0)),
-                "predShipmentLeadTime": float(metrics.get("pred_shipment_lead_time", 0.0)),
-                "predTurnOverRate": float(metrics.get("pred_inventory_turnover", 0.0))
-            },
-            "calculatedAt": now_kst.isoformat()
-        }
-
-        # 저장 경로 (Daily Report 통합)
-        key = f"{KPI_PREFIX}/daily-report/company-{int(company_id)}/report_{target_date_str}.json"
-
-        s3_client.put_object(
-            Bucket=S3_BUCKET,
-            Key=key,
-            Body=json.dumps(payload, ensure_ascii=False),
-            ContentType="application/json"
-        )
-        print(f"[Success] Uploaded Integrated KPI -> {key}")
+    with run_metrics.stage("merge") as st:
+        combined_kpis = {}
+
+        # 초기화 및 안전재고 확보율 병합
+        for item in safety_results:
+            cid = item["company_id"]
+            combined_kpis.setdefault(cid, {})["safety_stock_rate"] = item["safety_stock_rate_monthly"]
+
+        # 출하 리드타임 평균 병합
+        for item in lead_time_results:
+            cid = item["company_id"]
+            combined_kpis.setdefault(cid, {})["shipment_lead_time"] = item["shipment_lead_time_avg_hours"]
+
+        # 출하 완료율 병합 (신규 추가)
+        for item in log_comp_results:
+            cid = item["company_id"]
+            combined_kpis.setdefault(cid, {})["shipping_completion_rate"] = item["shipping_completion_rate"]
+
+        # 프로젝트 완료율 병합
+        for item in proj_comp_results:
+            cid = item["company_id"]
+            combined_kpis.setdefault(cid, {})["project_completion_rate"] = item["project_completion_rate"]
+
+        # 업무 장기 처리율 병합
+        for item in long_term_results:
+            cid = item["company_id"]
+            target = combined_kpis.setdefault(cid, {})
+            target["long_term_task_rate"] = item["long_term_task_rate"]
+            target["total_task_count"] = item["total_task_count"]
+            target["logistics_task_count"] = item["logistics_task_count"]
+            target["inventory_task_count"] = item["inventory_task_count"]
+            target["total_delayed_count"] = item["total_delayed_count"]
+            target["logistics_delayed_count"] = item["logistics_delayed_count"]
+            target["inventory_delayed_count"] = item["inventory_delayed_count"]
+
+        # 재고 회전율 병합
+        for item in turn_over_results:
+            cid = item["company_id"]
+            combined_kpis.setdefault(cid, {})["inventory_turnover"] = item["inventory_turnover"]
+
+        print(f"분석 완료: 총 {len(combined_kpis)}개 회사의 통합 KPI가 산출되었습니다.")
+
+        # 리드타임 예측치 병합
+        for item in pred_lead_time_results:
+            cid = item["company_id"]
+            target = combined_kpis.setdefault(cid, {})
+            target["pred_shipment_lead_time"] = item["pred_shipment_lead_time"]
+            target["pred_shipment_lead_time_outlook"] = item.get("pred_shipment_lead_time_outlook", [])
+
+        # 재고회전율 예측치 병합
+        for item in pred_turnover_results:
+            cid = item["company_id"]
+            target = combined_kpis.setdefault(cid, {})
+            target["pred_inventory_turnover"] = item["pred_inventory_turnover"]
+            target["pred_inventory_turnover_outlook"] = item.get("pred_inventory_turnover_outlook", [])
+
+        # 5. 결과 S3 저장 (JSON 적재)
+        payloads = []
+        for company_id, metrics in combined_kpis.items():
+            if pd.isna(company_id): continue
+
+            payloads.append({
+                "companyId": int(company_id),
+                "snapshotDate": target_date_str,
+                "metrics": {
+                    "safetyStockRate": float(metrics.get("safety_stock_rate", 0.0)),
+                    "shipmentLeadTimeAvg": float(metrics.get("shipment_lead_time", 0.0)),
+                    "shippingCompletionRate": float(metrics.get("shipping_completion_rate", 0.0)),
+                    "projectCompletionRate": float(metrics.get("project_completion_rate", 0.0)),
+                    "longTermTaskRate": float(metrics.get("long_term_task_rate", 0.0)),
+                    "totalTaskCount": int(metrics.get("total_task_count", 0)),
+                    "logisticsTaskCount": int(metrics.get("logistics_task_count", 0)),
+                    "inventoryTaskCount": int(metrics.get("inventory_task_count", 0)),
+                    "totalDelayedCount": int(metrics.get("total_delayed_count", 0)),
+                    "logisticsDelayedCount": int(metrics.get("logistics_delayed_count", 0)),
+                    "inventoryDelayedCount": int(metrics.get("inventory_delayed_count", 0)),
+                    "turnOverRate": float(metrics.get("inventory_turnover", 0.0)),
+                    "predShipmentLeadTime": float(metrics.get("pred_shipment_lead_time", 0.0)),
+                    "predTurnOverRate": float(metrics.get("pred_inventory_turnover", 0.0))
+                },
+                "calculatedAt": now_kst.isoformat()
+            })
+            # 다개월 예측 시 월별 전망 추가 ([{"month": "YYYY-MM", "value": 예측값}])
+            if FORECAST_HORIZON > 1:
+                payloads[-1]["metrics"]["predShipmentLeadTimeOutlook"] = metrics.get("pred_shipment_lead_time_outlook", [])
+                payloads[-1]["metrics"]["predTurnOverRateOutlook"] = metrics.get("pred_inventory_turnover_outlook", [])
+
+        st.rows_out = len(payloads)
+
+    # 저장 경로 (Daily Report 통합) - 회사별 JSON 동시 업로드 + 전체 NDJSON 1개
+    with run_metrics.stage("upload", rows_in=len(payloads)):
+        upload_reports(payloads, target_date_str)
+    print(f"[Metrics] {run_metrics.summary()}")
+    run_metrics.emit()
 
 def lambda_handler(event, context):
+    # 공유 스냅샷 프레임을 복사 없이 나눠 쓰도록 copy-on-write (람다 진입점에서만 설정)
+    enable_copy_on_write()
     try:
+        # {"start_date": "YYYY-MM-DD", "end_date": "YYYY-MM-DD"} 이벤트는 기간 재처리
+        if event and event.get("start_date"):
+            from backfill import run_backfill
+            start_date = datetime.strptime(event["start_date"], "%Y-%m-%d").date()
+            end_date = datetime.strptime(event.get("end_date", event["start_date"]), "%Y-%m-%d").date()
+            result = run_backfill(start_date, end_date)
+            status = 500 if result["failed"] else 200
+            body = {"succeeded": [str(d) for d in result["succeeded"]],
+                    "failed": {str(d): error for d, error in result["failed"].items()}}
+            return {'statusCode': status, 'body': json.dumps(body, ensure_ascii=False)}
         run()
         return {'statusCode': 200, 'body': json.dumps('ETL Job successfully completed')}
     except Exception as e:
@@ -234,4 +315,5 @@ def lambda_handler(event, context):
         raise e
 
 if __name__ == "__main__":
+    enable_copy_on_write()
     run()
\ No newline at end of file
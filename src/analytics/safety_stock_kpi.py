@@ -1,43 +1,25 @@
 import pandas as pd
 import numpy as np
+from item_company_index import ItemCompanyIndex
 
-def calculate_safety_stock_rate(df_project: pd.DataFrame, df_inventory: pd.DataFrame, df_inventory_item: pd.DataFrame, df_logistics: pd.DataFrame, df_logistics_item: pd.DataFrame, df_item: pd.DataFrame):
+def calculate_safety_stock_rate(df_project: pd.DataFrame, df_inventory: pd.DataFrame, df_inventory_item: pd.DataFrame, df_logistics: pd.DataFrame, df_logistics_item: pd.DataFrame, df_item: pd.DataFrame,
+                                item_index: ItemCompanyIndex = None):
     """
     안전재고 확보율 계산:
     입고(Inventory)와 출하(Logistics) 경로를 모두 추적하여 품목별 회사/프로젝트 매핑을 수행
+    item_index: 같은 스냅샷으로 이미 만든 매핑 인덱스가 있으면 재사용
     """
 
-    # 가독성을 위해 컬럼 추출을 따로 빼지 않고, 경로 매핑에 포함
-    # 1. 입고 경로 매핑 (Item -> Inventory_Item -> Inventory -> Project)
-    inv_map = (
-        df_inventory_item.merge(df_inventory, on="inventory_id", how="left")
-        .merge(df_project, on="project_id", how="left")
-        .dropna(subset=["company_id", "project_id"])
-        .drop_duplicates(subset=["item_id"], keep="last")[["item_id", "company_id", "project_id"]]
-    )
-
-    # 2. 출하 경로 매핑 (Item -> Logistics_Item -> Logistics -> Project)
-    log_map = (
-        df_logistics_item.merge(df_logistics, on="logistics_id", how="left")
-        .merge(df_project, on="project_id", how="left")
-        .dropna(subset=["company_id", "project_id"])
-        .drop_duplicates(subset=["item_id"], keep="last")[["item_id", "company_id", "project_id"]]
-    )
-
-    # 3. 입고와 출하 데이터 통합 (어느 한쪽이라도 정보가 있으면 활용)
-    item_map = inv_map.merge(log_map, on="item_id", how="outer", suffixes=("_inv", "_log"))
-
-    # 입고 정보가 우선, 없으면 출하 정보 사용 (combine_first)
-    item_map["company_id"] = item_map["company_id_inv"].combine_first(item_map["company_id_log"])
-    item_map["project_id"] = item_map["project_id_inv"].combine_first(item_map["project_id_log"])
-    item_map = item_map[["item_id", "company_id", "project_id"]]
+    # 1~3. 품목별 회사/프로젝트 매핑 (입고 경로 우선, 없으면 출하 경로)
+    if item_index is None:
+        item_index = ItemCompanyIndex(df_project, df_inventory, df_inventory_item, df_logistics, df_logistics_item)
 
     # 4. 마스터 품목 리스트에 매핑 정보 결합
-    df = df_item.merge(item_map, on="item_id", how="left")
+    df = df_item.join(item_index.lookup(df_item["item_id"]))
 
-    # 5. 타입 보정 및 결측치 처리
-    df["item_quantity"] = pd.to_numeric(df["item_quantity"], errors="coerce").fillna(0)
-    df["safety_stock"] = pd.to_numeric(df["safety_stock"], errors="coerce").fillna(0)
+    # 5. 결측치 처리 (숫자 타입은 로드 시점에 table_schema로 변환됨)
+    df["item_quantity"] = df["item_quantity"].fillna(0)
+    df["safety_stock"] = df["safety_stock"].fillna(0)
 
     # 6. 분석 대상 필터링 (회사와 프로젝트가 확인된 품목만)
     kpi_base = df.dropna(subset=["company_id", "project_id"]).copy()
@@ -52,6 +34,13 @@ def calculate_safety_stock_rate(df_project: pd.DataFrame, df_inventory: pd.DataF
     # 8. 안전재고 확보 여부 파악 (secured_flag)
     item_level["secured_flag"] = (item_level["item_quantity"] >= item_level["safety_stock"]).astype(int)
 
+    return summarize_safety_stock(item_level)
+
+def summarize_safety_stock(item_level: pd.DataFrame):
+    """
+    품목 단위(회사/품목 중복 제거) company_id / item_id / secured_flag -> 회사별 안전재고 확보율
+    (청크 처리 모드와 공통)
+    """
     # 9. 회사별 집계
     kpi = (
         item_level.groupby("company_id", as_index=False)
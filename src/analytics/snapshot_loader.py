@@ -0,0 +1,296 @@
+import contextlib
+import io
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+import pandas as pd
+import pyarrow.parquet as pq
+from botocore.config import Config
+
+from config import S3_BUCKET, RAW_PREFIX, AWS_REGION, S3_ENDPOINT_URL, LOCAL_DATA_DIR, LOAD_MAX_WORKERS, UPLOAD_MAX_WORKERS, PARQUET_WRITE_BACK
+from local_store import LocalS3Client
+from stage_metrics import add_bytes_read
+from table_schema import TABLE_SCHEMAS, read_table_csv, read_table_csv_chunks, normalize_table, empty_table
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+def enable_copy_on_write():
+    """
+    pandas copy-on-write 모드 (실행 진입점에서 한 번 호출 - 프로세스 전체 설정이므로 라이브러리 import 시에는 바꾸지 않음)
+    켜져 있으면 SnapshotStore가 프레임을 복사 없이 얕은 복사본으로 공유
+    """
+    pd.set_option("mode.copy_on_write", True)
+
+def _count_get_object(parsed=None, **kwargs):
+    """get_object 응답 크기를 단계별 지표(읽은 바이트)에 누적"""
+    if parsed:
+        add_bytes_read(parsed.get("ContentLength"))
+
+def get_s3_client():
+    """
+    스레드 간 공유하는 S3 클라이언트 반환 (커넥션 풀을 동시 로드/업로드 수에 맞춤)
+    LOCAL_DATA_DIR이 있으면 같은 인터페이스의 로컬 디렉터리 클라이언트
+    (get_object 응답 크기는 stage_metrics로 집계)
+    """
+    global _s3_client
+    if _s3_client is None:
+        # boto3 기본 세션은 스레드 안전하지 않으므로 생성 시점만 잠금
+        with _s3_client_lock:
+            if _s3_client is None and LOCAL_DATA_DIR:
+                _s3_client = LocalS3Client(LOCAL_DATA_DIR, on_read=add_bytes_read)
+            elif _s3_client is None:
+                _s3_client = boto3.client(
+                    "s3",
+                    region_name=AWS_REGION,
+                    endpoint_url=S3_ENDPOINT_URL,
+                    config=Config(
+                        max_pool_connections=max(LOAD_MAX_WORKERS, UPLOAD_MAX_WORKERS, 10),
+                        retries={"max_attempts": 5, "mode": "standard"},
+                    ),
+                )
+                _s3_client.meta.events.register("after-call.s3.GetObject", _count_get_object)
+    return _s3_client
+
+def reset_s3_client():
+    """fork된 자식 프로세스에서 부모의 커넥션을 공유하지 않도록 클라이언트를 새로 만들게 함"""
+    global _s3_client
+    _s3_client = None
+
+def _read_parquet(body: bytes, columns=None) -> pd.DataFrame:
+    """Parquet 바이트를 (필요 컬럼만) 멀티스레드로 디코딩"""
+    table = pq.read_table(io.BytesIO(body), columns=columns, use_threads=True)
+    return table.to_pandas(use_threads=True)
+
+def read_body(response: dict) -> bytes:
+    """get_object 응답 본문 전체 읽기 (본문 스트림 / 로컬 파일 핸들은 읽은 뒤 닫음)"""
+    with contextlib.closing(response['Body']) as body:
+        return body.read()
+
+def read_parquet_object(key: str, columns=None):
+    """S3의 Parquet 객체 로드 (없으면 None)"""
+    s3_client = get_s3_client()
+    try:
+        response = s3_client.get_object(Bucket=S3_BUCKET, Key=key)
+    except s3_client.exceptions.NoSuchKey:
+        return None
+    print(f"[Loading] {key}")
+    return _read_parquet(read_body(response), columns)
+
+def write_parquet_object(df: pd.DataFrame, key: str):
+    """DataFrame을 zstd 압축 Parquet으로 S3에 저장"""
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, engine="pyarrow", index=False, compression="zstd")
+    get_s3_client().put_object(Bucket=S3_BUCKET, Key=key, Body=buffer.getvalue())
+
+def _write_parquet_back(df: pd.DataFrame, parquet_key: str):
+    """CSV를 파싱한 결과를 Parquet으로 저장 (다음 로드부터는 CSV 파싱 생략)"""
+    try:
+        write_parquet_object(df, parquet_key)
+        print(f"[Parquet] Written back -> {parquet_key}")
+    except Exception as e:
+        # 저장 실패는 분석에 영향 없음 (다음 실행에서 다시 시도)
+        print(f"[Warning] Parquet write-back failed: {parquet_key}, {e}")
+
+def read_snapshot(table_name, target_date_str, columns=None):
+    """
+    컬럼형 스냅샷 로드
+    {table}--{date}.parquet이 있으면 그대로 읽고, 없으면 CSV를 한 번 파싱한 뒤 Parquet으로 write-back
+    columns: 필요한 컬럼만 디코딩 (None이면 레지스트리에 선언된 전체 컬럼)
+    """
+    s3_client = get_s3_client()
+    base_key = f"{RAW_PREFIX}{table_name}--{target_date_str}"
+    df = read_parquet_object(f"{base_key}.parquet", columns)
+    if df is not None:
+        return normalize_table(df, table_name)
+
+    # 예: exports/daily/item--2025-12-31.csv
+    file_key = f"{base_key}.csv"
+    try:
+        print(f"[Loading] {file_key}")
+        response = s3_client.get_object(Bucket=S3_BUCKET, Key=file_key)
+        df = read_table_csv(io.BytesIO(read_body(response)), table_name)
+    except s3_client.exceptions.NoSuchKey:
+        print(f"[Error] File not found: {file_key}")
+        df = empty_table(table_name)
+        return df[columns] if columns else df
+
+    if PARQUET_WRITE_BACK:
+        _write_parquet_back(df, f"{base_key}.parquet")
+    return df[columns] if columns else df
+
+def _seekable_body(body):
+    """
+    Parquet 스트리밍용 임의 위치 읽기가 가능한 본문 (footer를 먼저 읽고 row group 단위로 이동)
+    로컬 파일 핸들은 그대로, S3 StreamingBody는 임시 파일(/tmp)로 내려받음 - 객체 전체를 메모리에 올리지 않음
+    """
+    if body.seekable():
+        return body
+    spool = tempfile.TemporaryFile(prefix="snapshot-")
+    with contextlib.closing(body):
+        shutil.copyfileobj(body, spool, 1 << 20)
+    spool.seek(0)
+    return spool
+
+def iter_snapshot(table_name, target_date_str, chunk_rows: int, columns=None):
+    """
+    스냅샷을 chunk_rows 행 단위 DataFrame으로 순서대로 반환 (테이블 전체를 메모리에 올리지 않음)
+    Parquet이 있으면 seek 가능한 본문(로컬 파일 / 임시 파일)에서 batch 단위로 디코딩,
+    없으면 CSV 본문 스트림을 청크 파싱 (Parquet write-back 없음)
+    없는 파일은 청크 없음
+    """
+    s3_client = get_s3_client()
+    base_key = f"{RAW_PREFIX}{table_name}--{target_date_str}"
+    try:
+        response = s3_client.get_object(Bucket=S3_BUCKET, Key=f"{base_key}.parquet")
+    except s3_client.exceptions.NoSuchKey:
+        response = None
+    if response is not None:
+        print(f"[Streaming] {base_key}.parquet")
+        with _seekable_body(response['Body']) as source:
+            parquet = pq.ParquetFile(source)
+            for batch in parquet.iter_batches(batch_size=chunk_rows, columns=columns):
+                yield normalize_table(batch.to_pandas(), table_name)
+        return
+
+    file_key = f"{base_key}.csv"
+    try:
+        response = s3_client.get_object(Bucket=S3_BUCKET, Key=file_key)
+    except s3_client.exceptions.NoSuchKey:
+        print(f"[Error] File not found: {file_key}")
+        return
+    print(f"[Streaming] {file_key}")
+    with contextlib.closing(response['Body']) as body:
+        for chunk in read_table_csv_chunks(body, table_name, chunk_rows):
+            yield chunk[columns] if columns else chunk
+
+def get_csv_by_date(table_name, target_date_str, columns=None):
+    """지정된 날짜의 스냅샷 로드 (레지스트리 테이블은 read_snapshot으로 Parquet 우선)"""
+    if table_name in TABLE_SCHEMAS:
+        return read_snapshot(table_name, target_date_str, columns)
+
+    s3_client = get_s3_client()
+    file_key = f"{RAW_PREFIX}{table_name}--{target_date_str}.csv"
+    try:
+        print(f"[Loading] {file_key}")
+        response = s3_client.get_object(Bucket=S3_BUCKET, Key=file_key)
+        with contextlib.closing(response['Body']) as body:
+            return pd.read_csv(body, usecols=columns)
+    except s3_client.exceptions.NoSuchKey:
+        print(f"[Error] File not found: {file_key}")
+        return pd.DataFrame()
+
+def get_static_csv(file_name):
+    """날짜 접미사 없이 고정된 이름의 CSV 로드"""
+    file_key = f"{RAW_PREFIX}{file_name}.csv" # 접미사 제거
+    try:
+        print(f"[Loading Static] {file_key}")
+        response = get_s3_client().get_object(Bucket=S3_BUCKET, Key=file_key)
+        with contextlib.closing(response['Body']) as body:
+            return pd.read_csv(body)
+    except Exception as e:
+        print(f"[Error] Static file not found: {file_key}, {e}")
+        return pd.DataFrame()
+
+def list_snapshot_dates(table_name) -> list:
+    """원천 경로에 있는 {table}--{날짜}.csv / .parquet 스냅샷 날짜 목록 (정렬, 중복 제거)"""
+    s3_client = get_s3_client()
+    prefix = f"{RAW_PREFIX}{table_name}--"
+    dates, token = set(), None
+    while True:
+        kwargs = {"ContinuationToken": token} if token else {}
+        response = s3_client.list_objects_v2(Bucket=S3_BUCKET, Prefix=prefix, **kwargs)
+        for obj in response.get("Contents", []):
+            date_str, _, ext = obj["Key"][len(prefix):].partition(".")
+            if ext in ("csv", "parquet") and len(date_str) == 10:
+                dates.add(date_str)
+        if not response.get("IsTruncated"):
+            return sorted(dates)
+        token = response["NextContinuationToken"]
+
+class SnapshotStore:
+    """
+    실행 단위 스냅샷 캐시 ((테이블, 날짜) 기준 중복 제거)
+    - 같은 키는 동시에 여러 번 요청돼도 한 번만 다운로드/파싱
+    - 프레임은 사용하는 쪽 수정이 원본에 전파되지 않는 사본으로 공유
+      (copy-on-write 모드면 얕은 복사, 아니면 깊은 복사 - enable_copy_on_write)
+    - hits / misses로 캐시 효과 확인
+    """
+
+    def __init__(self, max_workers: int = LOAD_MAX_WORKERS):
+        self.max_workers = max_workers
+        self.hits = 0
+        self.misses = 0
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="snapshot-loader")
+
+    @staticmethod
+    def _fetch(table_name, date_str):
+        if date_str is None:
+            return get_static_csv(table_name)
+        return get_csv_by_date(table_name, date_str)
+
+    def _submit(self, table_name, date_str):
+        key = (table_name, date_str)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                self.misses += 1
+                future = self._pool.submit(self._fetch, table_name, date_str)
+                self._futures[key] = future
+            else:
+                self.hits += 1
+        return future
+
+    @staticmethod
+    def _share(df, columns=None):
+        if columns:
+            # 컬럼 선택은 copy-on-write 여부와 관계없이 새 프레임
+            return df[columns]
+        return df.copy(deep=not pd.get_option("mode.copy_on_write"))
+
+    def get(self, table_name, date_str, columns=None) -> pd.DataFrame:
+        """단건 조회 (date_str이 None이면 고정 파일)"""
+        return self._share(self._submit(table_name, date_str).result(), columns)
+
+    def load(self, load_plan: dict) -> dict:
+        """
+        로드 계획을 스레드 풀로 한 번에 가져옴
+        load_plan: {이름: (테이블명, 날짜 문자열)} - 날짜가 None이면 고정 파일(get_static_csv)
+                   (테이블명, 날짜 문자열, 컬럼 목록)으로 필요한 컬럼만 받을 수도 있음
+        반환: {이름: DataFrame} (없는 파일은 기존과 동일하게 빈 DataFrame)
+        """
+        # 전부 먼저 제출해야 다운로드가 동시에 진행됨
+        futures = {}
+        for name, (table_name, date_str, *columns) in load_plan.items():
+            futures[name] = (self._submit(table_name, date_str), columns[0] if columns else None)
+        return {name: self._share(future.result(), columns) for name, (future, columns) in futures.items()}
+
+    def keys(self) -> list:
+        """캐시된 (테이블, 날짜) 목록"""
+        with self._lock:
+            return list(self._futures)
+
+    def discard(self, table_name, date_str):
+        """더 쓰지 않을 스냅샷을 캐시에서 제거 (여러 날짜를 처리하는 backfill 메모리 관리)"""
+        with self._lock:
+            self._futures.pop((table_name, date_str), None)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+        self._futures.clear()
+
+def load_snapshots(load_plan: dict, max_workers: int = LOAD_MAX_WORKERS) -> dict:
+    """일회성 로드 (SnapshotStore 하나로 로드 계획 전체를 가져옴)"""
+    store = SnapshotStore(max_workers=max(1, min(max_workers, len(load_plan))))
+    try:
+        return store.load(load_plan)
+    finally:
+        store.close()
@@ -0,0 +1,161 @@
+import json
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from config import METRICS_EMF, METRICS_NAMESPACE, METRICS_DIR
+
+# CloudWatch EMF 지시문 하나에 선언 가능한 최대 지표 수
+EMF_MAX_METRICS = 100
+
+# 단계 필드 -> (EMF 지표 이름, 단위)
+STAGE_METRICS = {
+    "wall_ms": ("WallTime", "Milliseconds"),
+    "cpu_ms": ("CpuTime", "Milliseconds"),
+    "rows_in": ("RowsIn", "Count"),
+    "rows_out": ("RowsOut", "Count"),
+    "bytes_read": ("BytesRead", "Bytes"),
+    "rss_delta_mb": ("PeakRssDelta", "Megabytes"),
+}
+
+_bytes_read = 0
+_bytes_lock = threading.Lock()
+
+def add_bytes_read(nbytes):
+    """S3(또는 로컬) get_object 응답 크기 누적 (로드 스레드에서 동시에 호출)"""
+    global _bytes_read
+    with _bytes_lock:
+        _bytes_read += int(nbytes or 0)
+
+def bytes_read() -> int:
+    return _bytes_read
+
+def _cpu_seconds() -> float:
+    # 예측 프로세스 풀 등 종료된 자식 프로세스 CPU 시간 포함
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+def _peak_rss_mb() -> float:
+    # 리눅스 ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+class StageRecord:
+    """단계 1개 측정값 (with 블록 안에서 rows_out 등을 채움)"""
+
+    def __init__(self, name: str, rows_in=None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.status = "ok"
+        self.wall_ms = self.cpu_ms = self.rss_delta_mb = 0.0
+        self.bytes_read = 0
+
+    def to_dict(self) -> dict:
+        out = {"stage": self.name, "status": self.status}
+        for field in STAGE_METRICS:
+            value = getattr(self, field)
+            if value is not None:
+                out[field] = round(value, 3) if isinstance(value, float) else int(value)
+        return out
+
+class RunMetrics:
+    """
+    run() 1회 단계별 지표 (wall / CPU 시간, 입출력 행 수, 읽은 바이트, 최대 RSS 증가분)
+    emit(): 실행당 CloudWatch EMF 레코드 1개를 stdout에 출력 (람다 로그 -> CloudWatch 지표)
+            + METRICS_DIR이 있으면 같은 레코드를 로컬 JSON 파일로 저장
+    """
+
+    def __init__(self, pipeline: str, target_date_str: str):
+        self.pipeline = pipeline
+        self.target_date_str = target_date_str
+        self.stages = []
+        self.started_at = datetime.now(timezone.utc)
+        self._wall = time.perf_counter()
+        self._cpu = _cpu_seconds()
+        self._bytes = bytes_read()
+        self._rss = _peak_rss_mb()
+        self._emitted = False
+
+    @contextmanager
+    def stage(self, name: str, rows_in=None):
+        """단계 측정 (예외 시 실패 단계까지의 레코드를 출력하고 다시 발생)"""
+        record = StageRecord(name, rows_in)
+        wall, cpu, nbytes, rss = time.perf_counter(), _cpu_seconds(), bytes_read(), _peak_rss_mb()
+        try:
+            yield record
+        except BaseException:
+            record.status = "failed"
+            raise
+        finally:
+            record.wall_ms = (time.perf_counter() - wall) * 1000
+            record.cpu_ms = (_cpu_seconds() - cpu) * 1000
+            record.bytes_read = bytes_read() - nbytes
+            record.rss_delta_mb = _peak_rss_mb() - rss
+            self.stages.append(record)
+            if record.status == "failed":
+                self.emit(status="failed")
+
+    def totals(self) -> dict:
+        return {
+            "wall_ms": round((time.perf_counter() - self._wall) * 1000, 3),
+            "cpu_ms": round((_cpu_seconds() - self._cpu) * 1000, 3),
+            "bytes_read": bytes_read() - self._bytes,
+            "rss_delta_mb": round(_peak_rss_mb() - self._rss, 3),
+            "peak_rss_mb": round(_peak_rss_mb(), 3),
+        }
+
+    def to_emf(self, status: str = "ok") -> dict:
+        """EMF 레코드 (지표 이름: {단계}.{지표}, 차원: Pipeline / 단계 상세는 stages 속성)"""
+        record = {"Pipeline": self.pipeline, "TargetDate": self.target_date_str, "Status": status}
+        declared = []
+        totals = self.totals()
+        for field, (metric, unit) in STAGE_METRICS.items():
+            if field in totals:
+                record[f"Total.{metric}"] = totals[field]
+                declared.append({"Name": f"Total.{metric}", "Unit": unit})
+        for stage in self.stages:
+            for field, value in stage.to_dict().items():
+                if field in STAGE_METRICS:
+                    metric, unit = STAGE_METRICS[field]
+                    record[f"{stage.name}.{metric}"] = value
+                    declared.append({"Name": f"{stage.name}.{metric}", "Unit": unit})
+
+        record["_aws"] = {
+            "Timestamp": int(self.started_at.timestamp() * 1000),
+            "CloudWatchMetrics": [
+                {"Namespace": METRICS_NAMESPACE, "Dimensions": [["Pipeline"]],
+                 "Metrics": declared[i:i + EMF_MAX_METRICS]}
+                for i in range(0, len(declared), EMF_MAX_METRICS)
+            ],
+        }
+        record["PeakRssMb"] = totals["peak_rss_mb"]
+        record["stages"] = [stage.to_dict() for stage in self.stages]
+        return record
+
+    def emit(self, status: str = "ok"):
+        """실행당 1회만 출력 (지표 출력 실패는 분석 결과에 영향 없음)"""
+        if self._emitted:
+            return None
+        self._emitted = True
+        try:
+            record = self.to_emf(status)
+            line = json.dumps(record, ensure_ascii=False)
+            if METRICS_EMF:
+                print(line)
+            if METRICS_DIR:
+                stamp = self.started_at.strftime("%Y%m%dT%H%M%S")
+                path = Path(METRICS_DIR) / f"{self.pipeline}-{self.target_date_str}-{stamp}.json"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(line + "\n", encoding="utf-8")
+            return record
+        except Exception as e:
+            print(f"[Warning] Metrics emit failed: {e}")
+            return None
+
+    def summary(self) -> str:
+        """콘솔용 한 줄 요약 (단계별 wall 시간)"""
+        return ", ".join(f"{s.name} {s.wall_ms / 1000:.2f}s" for s in self.stages)
@@ -0,0 +1,217 @@
+import numpy as np
+import pandas as pd
+
+# 원천 테이블 레지스트리 (analytics / init_analysis 공통)
+# columns: {컬럼명: 타입}
+#   - "datetime": datetime64로 변환 (파싱 실패 값은 NaT)
+#   - "category": 대문자 정규화 후 category 타입 (상태값)
+#   - "Int64": nullable 정수로 읽은 뒤 값 범위에 맞는 가장 작은 폭(Int8/16/32/64)으로 축소
+#   - 그 외: read_csv에 그대로 넘기는 pandas dtype
+# aliases: 추출본마다 다른 컬럼명 -> 표준 컬럼명
+TABLE_SCHEMAS = {
+    "project": {
+        "columns": {
+            "date": "datetime",
+            "project_id": "Int64",
+            "company_id": "Int64",
+            "project_status": "category",
+            "project_create_date": "datetime",
+            "project_end_date": "datetime",
+            "project_expected_end_date": "datetime",
+        },
+    },
+    "inventory": {
+        "columns": {
+            "date": "datetime",
+            "inventory_id": "Int64",
+            "project_id": "Int64",
+            "inventory_created_at": "datetime",
+            "inventory_status": "category",
+            "inventory_completed_at": "datetime",
+        },
+        "aliases": {"inventory_create_at": "inventory_created_at"},
+    },
+    "logistics": {
+        "columns": {
+            "date": "datetime",
+            "logistics_id": "Int64",
+            "project_id": "Int64",
+            "logistic_created_at": "datetime",
+            "logistics_status": "category",
+            "logistics_completed_at": "datetime",
+        },
+        "aliases": {"logistic_create_at": "logistic_created_at"},
+    },
+    "inventory_item": {
+        "columns": {
+            "date": "datetime",
+            "inventory_item_id": "Int64",
+            "item_id": "Int64",
+            "inventory_id": "Int64",
+        },
+    },
+    "logistics_item": {
+        "columns": {
+            "date": "datetime",
+            "logistics_item_id": "Int64",
+            "item_id": "Int64",
+            "logistics_id": "Int64",
+            "logistics_processed_quantity": "float64",
+        },
+    },
+    "item": {
+        "columns": {
+            "date": "datetime",
+            "item_id": "Int64",
+            "item_quantity": "float64",
+            "safety_stock": "float64",
+        },
+    },
+}
+
+# 작은 폭부터 (값 범위가 들어가는 첫 타입 사용)
+INT_WIDTHS = ("Int8", "Int16", "Int32", "Int64")
+
+def compact_int(values: pd.Series) -> pd.Series:
+    """
+    nullable 정수 컬럼을 값 범위에 맞는 가장 작은 nullable 정수 타입으로
+    (조회 / left / inner 조인 결과는 폭과 무관, 스냅샷끼리 outer 조인은 merge_outer 사용)
+    """
+    lo, hi = values.min(), values.max()
+    if pd.isna(lo):
+        return values.astype(INT_WIDTHS[0])
+    for dtype in INT_WIDTHS:
+        info = np.iinfo(dtype.lower())
+        if info.min <= lo and hi <= info.max:
+            return values if values.dtype == dtype else values.astype(dtype)
+    return values
+
+def merge_outer(left: pd.DataFrame, right: pd.DataFrame, on) -> pd.DataFrame:
+    """
+    outer merge - 키 컬럼의 nullable 정수 폭이 다르면 넓은 쪽으로 맞춘 뒤 merge
+    (pandas 2.2는 오른쪽에만 있는 키를 왼쪽 폭으로 변환해 값이 넘침: Int8 + Int16 키 200 -> -56)
+    """
+    left, right = left.copy(deep=False), right.copy(deep=False)
+    for col in [on] if isinstance(on, str) else on:
+        dtypes = {str(left[col].dtype), str(right[col].dtype)}
+        if len(dtypes) > 1 and dtypes <= set(INT_WIDTHS):
+            wide = max(dtypes, key=INT_WIDTHS.index)
+            left[col], right[col] = left[col].astype(wide), right[col].astype(wide)
+    return left.merge(right, on=on, how="outer")
+
+def month_bounds(month: str):
+    """'YYYY-MM' -> (월 시작, 다음 달 시작)"""
+    start = pd.Timestamp(f"{month}-01")
+    return start, start + pd.offsets.MonthBegin(1)
+
+def in_month(ts: pd.Series, month: str) -> pd.Series:
+    """
+    datetime 컬럼이 month('YYYY-MM')에 속하는지 (NaT는 False)
+    dt.to_period("M").astype(str) == month와 같은 조건을 행별 문자열 생성 없이 월 경계 비교로 계산
+    """
+    if not month:
+        return pd.Series(False, index=ts.index)
+    start, end = month_bounds(month)
+    return (ts >= start) & (ts < end)
+
+DAY_NS = 86_400 * 10 ** 9
+# datetime64 NaT의 int64 표현
+NAT_KEY = np.iinfo(np.int64).min
+
+def month_key(month: str):
+    """'YYYY-MM' -> 정수 월 키 (1970-01부터의 개월 수, 빈 값은 None)"""
+    return int(np.datetime64(month, "M").astype(np.int64)) if month else None
+
+def month_keys(ts: pd.Series) -> np.ndarray:
+    """
+    datetime 컬럼 -> 행별 정수 월 키 (NaT는 int64 최솟값이라 어떤 월 키와도 같지 않음)
+    행별 달력 변환 대신 일 단위로 자른 뒤 (최소~최대 일자) 월 키 표에서 조회
+    """
+    ns = ts.to_numpy(dtype="datetime64[ns]").view(np.int64)
+    keys = np.full(len(ns), NAT_KEY)
+    valid = ns != NAT_KEY
+    if valid.any():
+        days = ns[valid] // DAY_NS
+        lo = days.min()
+        table = np.arange(lo, days.max() + 1).astype("datetime64[D]").astype("datetime64[M]").view(np.int64)
+        keys[valid] = table[days - lo]
+    return keys
+
+def in_month_keys(keys, month: str):
+    """정수 월 키(month_keys)가 month('YYYY-MM')와 같은지 - in_month와 같은 조건"""
+    key = month_key(month)
+    return keys == key if key is not None else pd.Series(False, index=keys.index)
+
+def _csv_dtypes(schema: dict, header: list) -> dict:
+    """CSV 헤더 기준으로 read_csv에 넘길 dtype 구성 (별칭 컬럼 포함)"""
+    columns = schema["columns"]
+    aliases = schema.get("aliases", {})
+    dtypes = {}
+    for col in header:
+        kind = columns.get(aliases.get(col, col))
+        if kind == "datetime":
+            continue
+        dtypes[col] = "string" if kind == "category" else kind
+    return dtypes
+
+def normalize_table(df: pd.DataFrame, table_name: str) -> pd.DataFrame:
+    """별칭 컬럼명 정리 + 선언된 최종 타입으로 변환 (이미 변환된 컬럼은 그대로)"""
+    schema = TABLE_SCHEMAS[table_name]
+    df = df.rename(columns=schema.get("aliases", {}))
+    for col, kind in schema["columns"].items():
+        if col not in df.columns:
+            continue
+        if kind == "datetime":
+            if not pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = pd.to_datetime(df[col], errors="coerce")
+        elif kind == "category":
+            if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype("string").str.upper().astype("category")
+        elif kind == "Int64":
+            if str(df[col].dtype) not in INT_WIDTHS:
+                df[col] = pd.to_numeric(df[col], errors="coerce").astype(kind)
+            df[col] = compact_int(df[col])
+        elif df[col].dtype != kind:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(kind)
+    return df
+
+def empty_table(table_name: str) -> pd.DataFrame:
+    """스냅샷이 없을 때 사용할 (컬럼/타입만 있는) 빈 테이블"""
+    columns = TABLE_SCHEMAS[table_name]["columns"]
+    df = pd.DataFrame({col: pd.Series(dtype="object") for col in columns})
+    return normalize_table(df, table_name)
+
+def read_table_csv(source, table_name: str) -> pd.DataFrame:
+    """
+    레지스트리에 선언된 컬럼만 최종 타입으로 읽기
+    source: 파일 경로 또는 seek 가능한 버퍼 (헤더를 먼저 읽고 되감음)
+    """
+    schema = TABLE_SCHEMAS[table_name]
+    wanted = set(schema["columns"]) | set(schema.get("aliases", {}))
+
+    header = list(pd.read_csv(source, nrows=0).columns)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    usecols = [c for c in header if c in wanted]
+
+    try:
+        df = pd.read_csv(source, usecols=usecols, dtype=_csv_dtypes(schema, usecols))
+    except (ValueError, TypeError):
+        # 추출본에 타입이 안 맞는 값이 섞인 경우 -> 문자열로 읽고 컬럼별 강제 변환
+        if hasattr(source, "seek"):
+            source.seek(0)
+        df = pd.read_csv(source, usecols=usecols)
+
+    return normalize_table(df, table_name)
+
+def read_table_csv_chunks(source, table_name: str, chunk_rows: int):
+    """
+    레지스트리에 선언된 컬럼만 chunk_rows 행씩 읽기 (S3 본문 같은 스트림 입력, 되감지 않음)
+    중간 청크에서 타입 오류가 나도 다시 읽을 수 없으므로 타입 지정 없이 파싱 후 청크마다 normalize_table
+    (read_table_csv의 타입 불일치 대체 경로와 같은 변환)
+    """
+    schema = TABLE_SCHEMAS[table_name]
+    wanted = set(schema["columns"]) | set(schema.get("aliases", {}))
+    with pd.read_csv(source, usecols=lambda col: col in wanted, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            yield normalize_table(chunk, table_name)
@@ -0,0 +1,96 @@
+import pandas as pd
+
+from table_schema import month_keys, in_month_keys
+
+# 테이블별 (ID, 시작일, 완료일, 상태, 회사 연결) 컬럼
+TASK_SPECS = {
+    "logistics": {"id": "logistics_id", "start": "logistic_created_at", "end": "logistics_completed_at",
+                  "status": "logistics_status", "link": "project_id"},
+    "inventory": {"id": "inventory_id", "start": "inventory_created_at", "end": "inventory_completed_at",
+                  "status": "inventory_status", "link": "project_id"},
+    "project": {"id": "project_id", "start": "project_create_date", "end": "project_end_date",
+                "status": "project_status", "link": "company_id"},
+}
+
+def prepare_tasks(df: pd.DataFrame, table: str) -> pd.DataFrame:
+    """
+    원천 스냅샷 -> 정규화 업무 테이블 (원천과 같은 행 / 같은 인덱스)
+    컬럼: id, link(project_id / company_id), start, end, completed(상태 COMPLETED),
+          start_month / end_month(정수 월 키), lead_time(시작~완료 시간, 둘 중 하나라도 없으면 NaN)
+    """
+    spec = TASK_SPECS[table]
+    start, end = df[spec["start"]], df[spec["end"]]
+    return pd.DataFrame({
+        "id": df[spec["id"]],
+        "link": df[spec["link"]],
+        "start": start,
+        "end": end,
+        "completed": (df[spec["status"]] == "COMPLETED").to_numpy(dtype=bool),
+        "start_month": month_keys(start),
+        "end_month": month_keys(end),
+        "lead_time": (end - start).dt.total_seconds() / 3600.0,
+    }, index=df.index)
+
+def _company_tasks(frames, table: str) -> pd.DataFrame:
+    """
+    업무 테이블 + company_id (출하 / 입고는 프로젝트와 left merge - 기존 KPI 함수와 같은 조인)
+    프로젝트 ID가 유일하면 merge 대신 위치 조회로 붙임 (행 순서 / 결측 회사 결과 동일)
+    """
+    tasks = frames.tasks(table)
+    if table == "project":
+        return tasks.assign(company_id=tasks["link"])
+    companies = frames.project[["project_id", "company_id"]]
+    if not companies["project_id"].is_unique or companies["project_id"].hasnans:
+        return tasks.merge(companies, left_on="link", right_on="project_id", how="left")
+    positions = pd.Index(companies["project_id"]).get_indexer(tasks["link"])
+    return tasks.assign(company_id=companies["company_id"].array.take(positions, allow_fill=True))
+
+def _started(frames, table: str, month: str) -> pd.DataFrame:
+    """당월 시작 건"""
+    df = frames.get("company_tasks", table)
+    return df[in_month_keys(df["start_month"], month)]
+
+def _completed(frames, table: str, month: str) -> pd.DataFrame:
+    """당월 완료 건 (상태 COMPLETED + 완료일이 당월)"""
+    df = frames.get("company_tasks", table)
+    return df[df["completed"] & in_month_keys(df["end_month"], month)]
+
+def _leadtimes(frames, table: str, month: str) -> pd.DataFrame:
+    """당월 완료 건 중 시작/완료일이 모두 있는 건의 리드타임 (company_id, task_id, lead_time)"""
+    df = frames.get("completed", table, month)
+    df = df[df["lead_time"].notna()]
+    return pd.DataFrame({"company_id": df["company_id"], "task_id": df["id"], "lead_time": df["lead_time"]})
+
+# KPI 함수가 이름으로 요청하는 파생 중간 결과 (TaskFrames.get에서 한 번만 계산)
+DERIVED = {
+    "company_tasks": _company_tasks,
+    "started": _started,
+    "completed": _completed,
+    "leadtimes": _leadtimes,
+}
+
+class TaskFrames:
+    """
+    스냅샷 1개의 정규화 업무 테이블 (출하 / 입고 / 프로젝트) + 파생 중간 결과 메모
+    - tasks(table): 상태 / 월 키 / 리드타임을 한 번만 계산한 업무 테이블
+    - get(name, ...): DERIVED에 등록된 중간 결과를 인자별로 한 번만 계산
+    여러 KPI가 같은 스냅샷에 대해 프로젝트 조인 / 리드타임 계산을 반복하지 않도록 공유
+    """
+
+    def __init__(self, df_project: pd.DataFrame, df_logistics: pd.DataFrame = None,
+                 df_inventory: pd.DataFrame = None):
+        self.project = df_project
+        self.sources = {"project": df_project, "logistics": df_logistics, "inventory": df_inventory}
+        self._tasks = {}
+        self._memo = {}
+
+    def tasks(self, table: str) -> pd.DataFrame:
+        if table not in self._tasks:
+            self._tasks[table] = prepare_tasks(self.sources[table], table)
+        return self._tasks[table]
+
+    def get(self, name: str, *args):
+        key = (name,) + args
+        if key not in self._memo:
+            self._memo[key] = DERIVED[name](self, *args)
+        return self._memo[key]
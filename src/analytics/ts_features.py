@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+# 월말 시계열 -> 회귀(XGBoost)용 피처 (외생변수 없음)
+LAGS = (1, 2, 3, 6)
+ROLLS = (3, 6)
+
+def feature_columns(lags=LAGS, rolls=ROLLS) -> list:
+    """피처 컬럼 순서 (모델 입력 순서 고정)"""
+    cols = ["moy", "moy_sin", "moy_cos"] + [f"lag_{k}" for k in lags]
+    for w in rolls:
+        cols += [f"roll_mean_{w}", f"roll_std_{w}"]
+    return cols
+
+FEATURE_COLUMNS = feature_columns()
+
+def build_features(df: pd.DataFrame, target_col: str, group_col="companyId", lags=LAGS, rolls=ROLLS,
+                   with_next: bool = True) -> pd.DataFrame:
+    """
+    전체 그룹(회사) 시계열 피처를 한 번에 생성 (회사별 루프 대신 groupby shift / rolling)
+    df: group_col, snapshotDate(월말), target_col (group_col=None이면 단일 시계열)
+    with_next: 그룹마다 익월 행(타깃 NaN)을 마지막에 추가 -> 익월 예측 피처를 같이 생성
+    반환: 그룹/날짜 순으로 정렬된 입력 컬럼 + 피처 컬럼
+    - 월(moy)과 사인/코사인, lag_k, 직전 값까지의 rolling 평균/표준편차 (shift(1)로 미래 누수 방지)
+    """
+    keys = [group_col, "snapshotDate"] if group_col else ["snapshotDate"]
+    out = df.sort_values(keys, kind="stable")
+    if with_next:
+        last = out.groupby(group_col, sort=False).tail(1) if group_col else out.tail(1)
+        next_rows = pd.DataFrame({"snapshotDate": (last["snapshotDate"] + pd.offsets.MonthEnd(1)).to_numpy(),
+                                  target_col: np.nan})
+        if group_col:
+            next_rows.insert(0, group_col, last[group_col].to_numpy())
+        out = pd.concat([out, next_rows], ignore_index=True).sort_values(keys, kind="stable")
+    out = out.reset_index(drop=True)
+
+    month = out["snapshotDate"].dt.month
+    features = {
+        "moy": month,
+        "moy_sin": np.sin(2 * np.pi * month / 12),
+        "moy_cos": np.cos(2 * np.pi * month / 12),
+    }
+
+    groups = out[group_col] if group_col else np.zeros(len(out), dtype=np.int8)
+    by_group = out[target_col].astype(float).groupby(groups, sort=False)
+    for k in lags:
+        features[f"lag_{k}"] = by_group.shift(k)
+
+    prev_by_group = by_group.shift(1).groupby(groups, sort=False)
+    for w in rolls:
+        features[f"roll_mean_{w}"] = prev_by_group.rolling(w, min_periods=1).mean().reset_index(level=0, drop=True)
+        features[f"roll_std_{w}"] = prev_by_group.rolling(w, min_periods=2).std().reset_index(level=0, drop=True)
+
+    return pd.concat([out, pd.DataFrame(features, index=out.index)], axis=1)
+
+def stack_tasks(tasks: list, target_col: str, group_col="companyId") -> pd.DataFrame:
+    """[(company_id, 이력)] -> 그룹 컬럼을 붙인 하나의 DataFrame"""
+    stacked = pd.concat([g[["snapshotDate", target_col]] for _, g in tasks], ignore_index=True)
+    stacked.insert(0, group_col, np.repeat([cid for cid, _ in tasks], [len(g) for _, g in tasks]))
+    return stacked
+
+def task_features(tasks: list, target_col: str, lags=LAGS, rolls=ROLLS) -> list:
+    """
+    [(company_id, 이력)] -> [(company_id, 피처 프레임)] (입력 순서)
+    피처 프레임은 이력 행(인덱스 0부터) + 마지막 익월 행
+    """
+    if not tasks:
+        return []
+    feat = build_features(stack_tasks(tasks, target_col, "companyId"), target_col, "companyId", lags, rolls)
+    by_company = {cid: g.reset_index(drop=True) for cid, g in feat.groupby("companyId", sort=False)}
+    return [(cid, by_company[cid]) for cid, _ in tasks]
+
+def feature_matrix(feat: pd.DataFrame, columns=FEATURE_COLUMNS) -> np.ndarray:
+    """XGBoost 입력용 연속(C-contiguous) float32 행렬 (XGBoost 내부 저장 타입과 동일)"""
+    return np.ascontiguousarray(feat[list(columns)].to_numpy(dtype=np.float32, na_value=np.nan))
+
+class LagState:
+    """
+    다중 시점 재귀 예측용 피처 상태 (행 = 그룹/회사)
+    그룹별 최근 값 버퍼(최대 lag/rolling 길이)만 유지 -> 예측값을 넣을 때마다 다음 달 피처 행을
+    이력 길이와 무관하게 갱신 (매 시점 이력 concat + 전체 피처 재계산 없음)
+    """
+
+    def __init__(self, window: np.ndarray, last_dates, lags=LAGS, rolls=ROLLS):
+        self.window = np.asarray(window, dtype=float)  # (그룹 수, 버퍼 크기) 오른쪽이 최근 값, 부족분 NaN
+        self.last_dates = pd.DatetimeIndex(last_dates)
+        self.lags = lags
+        self.rolls = rolls
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, target_col: str, group_col=None, keys=None, lags=LAGS, rolls=ROLLS):
+        """
+        그룹별 날짜순 이력 -> 상태
+        keys: 행 순서 (기본은 그룹 등장 순서, group_col=None이면 단일 행)
+        """
+        size = max(max(lags), max(rolls))
+        groups = df[group_col] if group_col else pd.Series(0, index=df.index)
+        keys = pd.Index(pd.unique(groups) if keys is None else keys)
+
+        tail = df.groupby(groups, sort=False).tail(size)
+        tail_groups = groups.loc[tail.index]
+        rows = keys.get_indexer(tail_groups)
+        cols = size - 1 - tail.groupby(tail_groups, sort=False).cumcount(ascending=False).to_numpy()
+        window = np.full((len(keys), size), np.nan)
+        window[rows, cols] = tail[target_col].astype(float).to_numpy()
+
+        last_dates = df["snapshotDate"].groupby(groups, sort=False).max().reindex(keys)
+        return cls(window, last_dates.to_numpy(), lags, rolls)
+
+    def next_rows(self) -> np.ndarray:
+        """다음 달 피처 행렬 (feature_columns 순서, float32) - build_features의 익월 행과 같은 정의"""
+        n = len(self.window)
+        month = (self.last_dates + pd.offsets.MonthEnd(1)).month.to_numpy()
+        cols = [month, np.sin(2 * np.pi * month / 12), np.cos(2 * np.pi * month / 12)]
+        cols += [self.window[:, -k] for k in self.lags]
+
+        for w in self.rolls:
+            recent = self.window[:, -w:]
+            valid = ~np.isnan(recent)
+            count = valid.sum(axis=1)
+            mean = np.divide(np.where(valid, recent, 0.0).sum(axis=1), count,
+                             out=np.full(n, np.nan), where=count >= 1)
+            sq_dev = np.where(valid, recent - mean[:, None], 0.0) ** 2
+            var = np.divide(sq_dev.sum(axis=1), count - 1, out=np.full(n, np.nan), where=count >= 2)
+            cols += [mean, np.sqrt(var)]
+        return np.ascontiguousarray(np.column_stack(cols), dtype=np.float32)
+
+    def push(self, values):
+        """그룹별 이번 달 예측값 추가 -> 한 달 전진"""
+        self.window = np.column_stack([self.window[:, 1:], np.asarray(values, dtype=float)])
+        self.last_dates = self.last_dates + pd.offsets.MonthEnd(1)
+
+def horizon_months(last_date, H: int) -> list:
+    """마지막 이력 월 다음 달부터 H개월 (YYYY-MM)"""
+    return [(pd.Timestamp(last_date) + pd.offsets.MonthEnd(h)).strftime("%Y-%m") for h in range(1, H + 1)]
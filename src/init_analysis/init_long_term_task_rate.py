@@ -22,27 +22,16 @@ def calculate_task_leadtime(
     inventory_data: str
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
 
-    project = read_csv(project_data, fix_cols["project"], "project")
-    logistics = read_csv(logistics_data, fix_cols["logistics"], "logistics")
-    inventory = read_csv(inventory_data, fix_cols["inventory"], "inventory")
+    project = read_csv(project_data, fix_cols["project"], table="project")
+    logistics = read_csv(logistics_data, fix_cols["logistics"], table="logistics")
+    inventory = read_csv(inventory_data, fix_cols["inventory"], table="inventory")
 
     # 필요 컬럼 추출
-    log_small = logistics[["date", "logistics_id", "project_id", "logistic_create_at", "logistics_status", "logistics_completed_at"]].copy()
-    inv_small = inventory[["date", "inventory_id", "project_id", "inventory_create_at", "inventory_status", "inventory_completed_at"]].copy()
+    log_small = logistics[["date", "logistics_id", "project_id", "logistic_created_at", "logistics_status", "logistics_completed_at"]].copy()
+    inv_small = inventory[["date", "inventory_id", "project_id", "inventory_created_at", "inventory_status", "inventory_completed_at"]].copy()
     proj_small = project[["project_id", "company_id"]].copy()
 
-    # 데이터 타입 정리
-    log_small["logistic_create_at"] = pd.to_datetime(log_small["logistic_create_at"], errors="coerce")
-    log_small["logistics_completed_at"] = pd.to_datetime(log_small["logistics_completed_at"], errors="coerce")
-    log_small["logistics_status"] = log_small["logistics_status"].astype(str)
-
-    inv_small["inventory_create_at"] = pd.to_datetime(inv_small["inventory_create_at"], errors="coerce")
-    inv_small["inventory_completed_at"] = pd.to_datetime(inv_small["inventory_completed_at"], errors="coerce")
-    inv_small["inventory_status"] = inv_small["inventory_status"].astype(str)
-
-    # 날짜 타입 변환 -> 기존 max()에서 datetime으로 바로 변환하는 걸로 로직 변경
-    log_small["date"] = pd.to_datetime(log_small["date"], errors="coerce")
-    inv_small["date"] = pd.to_datetime(inv_small["date"], errors="coerce")
+    # 데이터 타입은 read_csv(레지스트리)에서 날짜/상태값까지 정리되어 들어옴
     month = str(log_small["date"].max().to_period("M"))
 
     log_small["_end_month"] = log_small["logistics_completed_at"].dt.to_period("M").astype(str)
@@ -60,18 +49,18 @@ def calculate_task_leadtime(
     )
 
     # 업무별 리드타임 계산
-    log_mask = (log_df["logistics_status"] == "완료") & (log_df["logistic_create_at"].notna()) & (log_df["logistics_completed_at"].notna()) & ((log_df["_end_month"] == month))
+    log_mask = (log_df["logistics_status"] == "완료") & (log_df["logistic_created_at"].notna()) & (log_df["logistics_completed_at"].notna()) & ((log_df["_end_month"] == month))
 
     log_df.loc[log_mask, "logistics_lead_time"] = (
-        (log_df.loc[log_mask, "logistics_completed_at"] - log_df.loc[log_mask, "logistic_create_at"])
+        (log_df.loc[log_mask, "logistics_completed_at"] - log_df.loc[log_mask, "logistic_created_at"])
         .dt.total_seconds()
         / 3600.0
     )
 
-    inv_mask = (inv_df["inventory_status"] == "완료") & (inv_df["inventory_create_at"].notna()) & (inv_df["inventory_completed_at"].notna())& ((inv_df["_end_month"] == month))
+    inv_mask = (inv_df["inventory_status"] == "완료") & (inv_df["inventory_created_at"].notna()) & (inv_df["inventory_completed_at"].notna())& ((inv_df["_end_month"] == month))
 
     inv_df.loc[inv_mask, "inventory_lead_time"] = (
-        (inv_df.loc[inv_mask, "inventory_completed_at"] - inv_df.loc[inv_mask, "inventory_create_at"])
+        (inv_df.loc[inv_mask, "inventory_completed_at"] - inv_df.loc[inv_mask, "inventory_created_at"])
         .dt.total_seconds()
         / 3600.0
     )
@@ -136,7 +125,7 @@ def long_term_task_rate() -> pd.DataFrame:
     )
 
     # 날짜 변환
-    as_of_date = pd.to_datetime(cur_log["date"], errors="coerce").max()
+    as_of_date = cur_log["date"].max()
     month = str(as_of_date.to_period("M"))
 
     # SLA 기준 계산 (3개월)
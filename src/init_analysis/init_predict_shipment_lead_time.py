@@ -1,7 +1,12 @@
+import sys
 import pandas as pd
-import numpy as np
 import xgboost as xgb
 import warnings
+from pathlib import Path
+
+# 시계열 피처는 운영(analytics)과 같은 피처 엔진을 사용
+sys.path.append(str(Path(__file__).resolve().parent.parent / "analytics"))
+from ts_features import FEATURE_COLUMNS, LagState, build_features
 
 warnings.filterwarnings('ignore')
 
@@ -28,35 +33,6 @@ def load_leadtime_csv() -> pd.DataFrame:
     return df.sort_values(["companyId", "snapshotDate"]).reset_index(drop=True)
 
 
-# 외생변수 없는 시계열용 피처 생성 함수 -> 시계열을 회귀로 바꾸는 작업 (XGB용)
-def make_features(
-    df: pd.DataFrame,
-    target_col: str,
-    lags=(1, 2, 3, 6),
-    rolls=(3, 6),
-) -> pd.DataFrame:
-    
-    out = df.copy()
-    out = out.sort_values("snapshotDate").reset_index(drop=True)
-
-    # month-of-year (1~12)
-    out["moy"] = out["snapshotDate"].dt.month
-    # 계절을 더 부드럽게 먹이기 위한 사인/코사인
-    out["moy_sin"] = np.sin(2 * np.pi * out["moy"] / 12)
-    out["moy_cos"] = np.cos(2 * np.pi * out["moy"] / 12)
-
-    for k in lags:
-        out[f"lag_{k}"] = out[target_col].shift(k)
-    
-    # rolling stats (shift(1)로 미래 누수 방지 -> t rolling 계산할 때 t-1까지의 값만 사용하도록)
-    for w in rolls:
-        s = out[target_col].shift(1)
-        out[f"roll_mean_{w}"] = s.rolling(w, min_periods=1).mean()
-        out[f"roll_std_{w}"] = s.rolling(w, min_periods=2).std()
-
-    return out
-
-    
 def forecast_xgb(
     target_col = "shipmentLeadTimeAvg",
     H: int = 1,
@@ -86,8 +62,8 @@ def forecast_xgb(
             continue
 
         # 학습 피쳐 생성
-        feat = make_features(g[["snapshotDate", target_col]].copy(), target_col=target_col)
-        feature_cols = [c for c in feat.columns if c not in ["snapshotDate", target_col, "companyId"]]
+        feat = build_features(g[["snapshotDate", target_col]], target_col, group_col=None, with_next=False)
+        feature_cols = FEATURE_COLUMNS
 
         train_mask = feat[feature_cols].notnull().all(axis=1)
         X_train = feat.loc[train_mask, feature_cols]
@@ -103,22 +79,16 @@ def forecast_xgb(
         )
         model.fit(X_train, y_train)
         
-        # 지금 월말 -> 다음달 월말
-        hist_plus = g[["snapshotDate", target_col]].copy()
-        last_date = hist_plus["snapshotDate"].max()
+        # 지금 월말 -> 다음달 월말 (최근 값 버퍼만 들고 다음 달 피처 갱신)
+        state = LagState.from_frame(g, target_col)
+        last_date = g["snapshotDate"].max()
 
-        # 익월 재고 회전율 예측
+        # 익월 리드타임 예측
         for h in range(1, H + 1):
             # 월말 기준 -> 다음달 월말
             next_date = last_date + pd.offsets.MonthEnd(1)
 
-            tmp = pd.concat(
-            [hist_plus, pd.DataFrame({"snapshotDate": [next_date], target_col: [np.nan]})],
-            ignore_index=True,
-            )
-            feat_tmp = make_features(tmp, target_col=target_col)
-            X_last = feat_tmp.iloc[-1:][feature_cols]
-
+            X_last = pd.DataFrame(state.next_rows(), columns=feature_cols)
             y_hat = float(model.predict(X_last)[0])
 
             predicts.append({
@@ -128,11 +98,8 @@ def forecast_xgb(
                 "xgb_used": "XGBoost"
             })
 
-            # 예측값 저장
-            hist_plus = pd.concat(
-                [hist_plus, pd.DataFrame({"snapshotDate": [next_date], target_col: [y_hat]})],
-                ignore_index=True,
-            )
+            # 예측값을 다음 달 lag/rolling에 반영
+            state.push([y_hat])
             last_date = next_date
 
     kpi =  pd.DataFrame(predicts)
@@ -1,9 +1,16 @@
 import warnings
 warnings.filterwarnings("ignore")
 
+import sys
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
 
+# 시계열 피처는 운영(analytics)과 같은 피처 엔진을 사용
+sys.path.append(str(Path(__file__).resolve().parent.parent / "analytics"))
+from ts_features import FEATURE_COLUMNS, LagState, build_features
+
 from statsmodels.tsa.holtwinters import ExponentialSmoothing
 from xgboost import XGBRegressor
 
@@ -31,35 +38,6 @@ def load_turnover_csv() -> pd.DataFrame:
     return df.sort_values(["companyId", "snapshotDate"]).reset_index(drop=True)
 
 
-# 외생변수 없는 시계열용 피처 생성 함수 -> 시계열을 회귀로 바꾸는 작업 (XGB용)
-def make_features(
-    df: pd.DataFrame,
-    target_col: str,
-    lags=(1, 2, 3, 6),
-    rolls=(3, 6),
-) -> pd.DataFrame:
-    
-    out = df.copy()
-    out = out.sort_values("snapshotDate").reset_index(drop=True)
-
-    # month-of-year (1~12)
-    out["moy"] = out["snapshotDate"].dt.month
-    # 계절을 더 부드럽게 먹이기 위한 사인/코사인
-    out["moy_sin"] = np.sin(2 * np.pi * out["moy"] / 12)
-    out["moy_cos"] = np.cos(2 * np.pi * out["moy"] / 12)
-
-    for k in lags:
-        out[f"lag_{k}"] = out[target_col].shift(k)
-    
-    # rolling stats (shift(1)로 미래 누수 방지 -> t rolling 계산할 때 t-1까지의 값만 사용하도록)
-    for w in rolls:
-        s = out[target_col].shift(1)
-        out[f"roll_mean_{w}"] = s.rolling(w, min_periods=1).mean()
-        out[f"roll_std_{w}"] = s.rolling(w, min_periods=2).std()
-    
-    return out
-
-
 # exponential Smoothing 모델 적합 함수
 def fit_ets(y: pd.Series):
     y = pd.Series(y).astype(float)
@@ -131,8 +109,8 @@ def forecast_ets_xgb(
     df2[target_col] = y.values
 
     # XGB 잔차 피처
-    feat_hist = make_features(df2, target_col=target_col)
-    feature_cols = [c for c in feat_hist.columns if c not in [ "companyId", "snapshotDate", target_col]]
+    feat_hist = build_features(df2, target_col, group_col=None, with_next=False)
+    feature_cols = FEATURE_COLUMNS
 
     # XGB 학습
     train_mask = feat_hist[feature_cols].notnull().all(axis=1)
@@ -143,8 +121,9 @@ def forecast_ets_xgb(
     xgb = fit_xgb_residual(X_train, y_resid_train) if use_xgb else None
 
     predicts = []
-    hist_plus = df2[["snapshotDate", target_col]].copy().reset_index(drop=True)
-    last_date = hist_plus["snapshotDate"].max()
+    # 최근 값 버퍼만 들고 다음 달 피처 갱신 (매 시점 전체 피처 재계산 없음)
+    state = LagState.from_frame(df2, target_col)
+    last_date = df2["snapshotDate"].max()
 
     # 익월 재고 회전율 예측
     for h in range(1, H + 1):
@@ -153,13 +132,7 @@ def forecast_ets_xgb(
 
         ets_hat = float(ets_fc.iloc[h - 1])
 
-        tmp = pd.concat(
-            [hist_plus, pd.DataFrame({"snapshotDate": [next_date], target_col: [np.nan]})],
-            ignore_index=True,
-        )
-        feat_tmp = make_features(tmp, target_col=target_col)
-        X_last = feat_tmp.iloc[-1:][feature_cols]
-
+        X_last = pd.DataFrame(state.next_rows(), columns=feature_cols)
         resid_hat = float(xgb.predict(X_last)[0]) if use_xgb else 0.0
         y_hat = max(0.0, ets_hat + resid_hat)
 
@@ -171,10 +144,7 @@ def forecast_ets_xgb(
             "xgb_used": use_xgb,
         })
 
-        hist_plus = pd.concat(
-            [hist_plus, pd.DataFrame({"snapshotDate": [next_date], target_col: [y_hat]})],
-            ignore_index=True,
-        )
+        state.push([y_hat])
         last_date = next_date
 
     return pd.DataFrame(predicts)
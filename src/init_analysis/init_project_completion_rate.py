@@ -8,25 +8,20 @@ prev_month_csv = "project--2025-12-31.csv"
 # 월말 프로젝트 완료율 계산 함수
 def project_completion_rate_monthly() -> pd.DataFrame:
 
-    project = read_csv(project_csv, fix_cols["project"], "project")
-    prev_project = read_csv(prev_month_csv, fix_cols["project"], "prev_project")
+    project = read_csv(project_csv, fix_cols["project"], table="project")
+    prev_project = read_csv(prev_month_csv, fix_cols["project"], table="project")
 
     # 필요 컬럼 추출
     proj_small = project[["date", "project_id", "company_id", "project_create_date", "project_end_date"]].copy()
     prev_proj_small = prev_project[["date", "project_id", "company_id", "project_status"]].copy()
 
-    # 컬럼 타입 정리
-    prev_proj_small["project_status"] = prev_proj_small["project_status"].astype(str)
-
+    # 컬럼 타입 정리 (날짜/상태값은 read_csv에서 변환됨)
     proj_small["company_id"] = proj_small["company_id"].astype(str)
     proj_small["project_id"] = proj_small["project_id"].astype(str)
     prev_proj_small["company_id"] = prev_proj_small["company_id"].astype(str)
     prev_proj_small["project_id"] = prev_proj_small["project_id"].astype(str)
 
-    proj_small["project_create_date"] = pd.to_datetime(proj_small["project_create_date"], errors="coerce")
-    proj_small["project_end_date"] = pd.to_datetime(proj_small["project_end_date"], errors="coerce")
-
-    as_of_date = pd.to_datetime(proj_small["date"], errors="coerce").max()
+    as_of_date = proj_small["date"].max()
     month = str(as_of_date.to_period("M"))
 
     # 시작월, 종료월 컬럼 추가
@@ -6,12 +6,12 @@ from config import project_csv, inventory_csv, logistics_csv, inventory_item_csv
 # 월말 안전재고 확보율 계산 함수
 def safety_stock_rate_monthly() -> pd.DataFrame:
 
-    project = read_csv(project_csv, fix_cols["project"], "project")
-    logistics = read_csv(logistics_csv, fix_cols["logistics"], "logistics")
-    inventory = read_csv(inventory_csv, fix_cols["inventory"], "inventory")
-    logistics_item = read_csv(logistics_item_csv, fix_cols["logistics_item"], "logistics_item")
-    inventory_item = read_csv(inventory_item_csv, fix_cols["inventory_item"], "inventory_item")
-    item = read_csv(item_csv, fix_cols["item"], "item")
+    project = read_csv(project_csv, fix_cols["project"], table="project")
+    logistics = read_csv(logistics_csv, fix_cols["logistics"], table="logistics")
+    inventory = read_csv(inventory_csv, fix_cols["inventory"], table="inventory")
+    logistics_item = read_csv(logistics_item_csv, fix_cols["logistics_item"], table="logistics_item")
+    inventory_item = read_csv(inventory_item_csv, fix_cols["inventory_item"], table="inventory_item")
+    item = read_csv(item_csv, fix_cols["item"], table="item")
 
     # 필요 컬럼 추출
     item_small = item[["date", "item_id", "item_quantity", "safety_stock"]].copy()
@@ -56,12 +56,7 @@ def safety_stock_rate_monthly() -> pd.DataFrame:
     # item 기준으로 회사, 프로젝트 매핑 정보 결합
     df = item_small.merge(item_map, on="item_id", how="left")
 
-    # 컬럼 타입 정리
-    df["item_quantity"] = pd.to_numeric(df["item_quantity"], errors="coerce")
-    df["safety_stock"] = pd.to_numeric(df["safety_stock"], errors="coerce")
-
-    # 날짜 타입 변환 -> 기존 max()에서 datetime으로 바로 변환하는 걸로 로직 변경
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    # 컬럼 타입(숫자/날짜)은 read_csv에서 변환됨
     month = str(df["date"].max().to_period("M"))
 
     # 데이터 전처리
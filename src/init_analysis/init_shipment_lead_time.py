@@ -5,20 +5,15 @@ from config import project_csv, logistics_csv, fix_cols, read_csv
 # 출하 리드타임 계산 함수
 def shipment_lead_time_monthly() -> pd.DataFrame:
     
-    project = read_csv(project_csv, fix_cols["project"], "project")
-    logistics = read_csv(logistics_csv, fix_cols["logistics"], "logistics")
+    project = read_csv(project_csv, fix_cols["project"], table="project")
+    logistics = read_csv(logistics_csv, fix_cols["logistics"], table="logistics")
 
     # 필요 컬럼 추출
-    log_small = logistics[["date", "logistics_id", "project_id", "logistic_create_at", "logistics_status", "logistics_completed_at"]].copy()
+    log_small = logistics[["date", "logistics_id", "project_id", "logistic_created_at", "logistics_status", "logistics_completed_at"]].copy()
     proj_small = project[["date", "project_id", "company_id"]].copy()
 
-    # 데이터 타입 정리
-    log_small["logistic_create_at"] = pd.to_datetime(log_small["logistic_create_at"], errors="coerce")
-    log_small["logistics_completed_at"] = pd.to_datetime(log_small["logistics_completed_at"], errors="coerce")
-    log_small["logistics_status"] = log_small["logistics_status"].astype(str)
-
-    log_small["date"] = pd.to_datetime(log_small["date"], errors="coerce")
-    month = str(df["date"].max().to_period("M"))
+    # 데이터 타입은 read_csv에서 정리됨
+    month = str(log_small["date"].max().to_period("M"))
 
     log_small["_end_month"] = log_small["logistics_completed_at"].dt.to_period("M").astype(str)
 
@@ -29,10 +24,10 @@ def shipment_lead_time_monthly() -> pd.DataFrame:
     )
 
     # 리드타임 계산 (hour 단위)
-    mask_done = (df["logistics_status"] == "완료") & (df["logistic_create_at"].notna()) & (df["logistics_completed_at"].notna()) & ((df["_end_month"] == month))
+    mask_done = (df["logistics_status"] == "완료") & (df["logistic_created_at"].notna()) & (df["logistics_completed_at"].notna()) & ((df["_end_month"] == month))
 
     df.loc[mask_done, "lead_time_hours"] = (
-        (df.loc[mask_done, "logistics_completed_at"] - df.loc[mask_done, "logistic_create_at"])
+        (df.loc[mask_done, "logistics_completed_at"] - df.loc[mask_done, "logistic_created_at"])
         .dt.total_seconds()
         / 3600.0
     )
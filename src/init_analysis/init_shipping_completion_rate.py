@@ -8,13 +8,13 @@ prev_month_csv = "logistics--2025-12-31.csv"
 # 월말 출하 완료율 계산 함수
 def shipping_completion_rate_monthly() -> pd.DataFrame:
 
-    project = read_csv(project_csv, fix_cols["project"], "project")
-    logistics = read_csv(logistics_csv, fix_cols["logistics"], "logistics")
-    prev_logistics = read_csv(prev_month_csv, fix_cols["logistics"], "prev_logistics")
+    project = read_csv(project_csv, fix_cols["project"], table="project")
+    logistics = read_csv(logistics_csv, fix_cols["logistics"], table="logistics")
+    prev_logistics = read_csv(prev_month_csv, fix_cols["logistics"], table="logistics")
 
     # 필요 컬럼 추출
     proj_small = project[["date", "project_id", "company_id"]].copy()
-    log_small = logistics[["date", "logistics_id", "project_id", "logistic_create_at", "logistics_status", "logistics_completed_at"]].copy()
+    log_small = logistics[["date", "logistics_id", "project_id", "logistic_created_at", "logistics_status", "logistics_completed_at"]].copy()
     prev_log_small = prev_logistics[["date", "logistics_id", "project_id", "logistics_status"]].copy()
 
     # 데이터 병합
@@ -25,18 +25,12 @@ def shipping_completion_rate_monthly() -> pd.DataFrame:
         prev_log_small.merge(proj_small, on="project_id", how="left")
     )
 
-    # 컬럼 타입 정리
-    prev_log_df["logistics_status"] = prev_log_df["logistics_status"].astype(str)
-    log_df["logistics_status"] = log_df["logistics_status"].astype(str)
-
-    log_df["logistic_create_at"] = pd.to_datetime(log_df["logistic_create_at"], errors="coerce")
-    log_df["logistics_completed_at"] = pd.to_datetime(log_df["logistics_completed_at"], errors="coerce")
-
-    as_of_date = pd.to_datetime(proj_small["date"], errors="coerce").max()
+    # 컬럼 타입(날짜/상태값)은 read_csv에서 정리됨
+    as_of_date = proj_small["date"].max()
     month = str(as_of_date.to_period("M"))
     
     # 시작월, 종료월 컬럼 추가
-    log_df["_start_month"] = log_df["logistic_create_at"].dt.to_period("M").astype(str)
+    log_df["_start_month"] = log_df["logistic_created_at"].dt.to_period("M").astype(str)
     log_df["_end_month"] = log_df["logistics_completed_at"].dt.to_period("M").astype(str)
 
     # 이월, 당월 시작, 당월 완료 계산
@@ -13,19 +13,19 @@ first_item_csv = "item--2026-01-01.csv"
 def turnover_monthly() -> pd.DataFrame:
 
     # 로직 구분하기 -> first: 월초 / last: 월말
-    first_project = read_csv(first_project_csv, fix_cols["project"], "first_project")
-    first_logistics = read_csv(first_logistics_csv, fix_cols["logistics"], "first_logistics")
-    first_logistics_item = read_csv(first_logistics_item_csv, fix_cols["logistics_item"], "first_logistics_item")
-    first_inventory = read_csv(first_inventory_csv, fix_cols["inventory"], "first_inventory")
-    first_inventory_item = read_csv(first_inventory_item_csv, fix_cols["inventory_item"], "first_inventory_item")
-    first_item = read_csv(first_item_csv, fix_cols["item"], "first_item")
-
-    last_project = read_csv(project_csv, fix_cols["project"], "project")
-    last_logistics = read_csv(logistics_csv, fix_cols["logistics"], "logistics")
-    last_logistics_item = read_csv(logistics_item_csv, fix_cols["logistics_item"], "logistics_item")
-    last_inventory = read_csv(inventory_csv, fix_cols["inventory"], "inventory")
-    last_inventory_item = read_csv(inventory_item_csv, fix_cols["inventory_item"], "inventory_item")
-    last_item = read_csv(item_csv, fix_cols["item"], "item")
+    first_project = read_csv(first_project_csv, fix_cols["project"], table="project")
+    first_logistics = read_csv(first_logistics_csv, fix_cols["logistics"], table="logistics")
+    first_logistics_item = read_csv(first_logistics_item_csv, fix_cols["logistics_item"], table="logistics_item")
+    first_inventory = read_csv(first_inventory_csv, fix_cols["inventory"], table="inventory")
+    first_inventory_item = read_csv(first_inventory_item_csv, fix_cols["inventory_item"], table="inventory_item")
+    first_item = read_csv(first_item_csv, fix_cols["item"], table="item")
+
+    last_project = read_csv(project_csv, fix_cols["project"], table="project")
+    last_logistics = read_csv(logistics_csv, fix_cols["logistics"], table="logistics")
+    last_logistics_item = read_csv(logistics_item_csv, fix_cols["logistics_item"], table="logistics_item")
+    last_inventory = read_csv(inventory_csv, fix_cols["inventory"], table="inventory")
+    last_inventory_item = read_csv(inventory_item_csv, fix_cols["inventory_item"], table="inventory_item")
+    last_item = read_csv(item_csv, fix_cols["item"], table="item")
 
     # 필요 컬럼 추출
     first_item_small = first_item[["date","item_id", "item_quantity", "safety_stock"]].copy()
@@ -103,12 +103,10 @@ def turnover_monthly() -> pd.DataFrame:
     first_df = first_item_small.merge(first_item_map, on="item_id", how="left")
     last_df = last_item_small.merge(last_item_map, on="item_id", how="left")
 
-    # 컬럼 타입 정리
-    first_df["item_quantity"] = pd.to_numeric(first_df["item_quantity"], errors="coerce").fillna(0)
-    last_df["item_quantity"]  = pd.to_numeric(last_df["item_quantity"], errors="coerce").fillna(0)
+    # 결측치 정리 (숫자/날짜 타입은 read_csv에서 변환됨)
+    first_df["item_quantity"] = first_df["item_quantity"].fillna(0)
+    last_df["item_quantity"]  = last_df["item_quantity"].fillna(0)
 
-    # 날짜 타입 변환 -> 기존 max()에서 datetime으로 바로 변환하는 걸로 로직 변경
-    last_df["date"] = pd.to_datetime(last_df["date"], errors="coerce")
     month = str(last_df["date"].max().to_period("M"))
 
     # 데이터 전처리
@@ -136,13 +134,13 @@ def turnover_monthly() -> pd.DataFrame:
     inv["avg_inventory"]   = (inv["begin_inventory"] + inv["end_inventory"]) / 2
 
     # 회사별 출하량 집계
-    first_log_map["logistics_processed_quantity"] = pd.to_numeric(first_log_map["logistics_processed_quantity"], errors="coerce").fillna(0)
+    first_log_map["logistics_processed_quantity"] = first_log_map["logistics_processed_quantity"].fillna(0)
     first_ship = (
         first_log_map.groupby(["company_id", "logistics_item_id"], as_index=False)   # 출하 업무 기준 출하량 파악
                     .agg(first_ship=("logistics_processed_quantity", "max"))
     )
 
-    last_log_map["logistics_processed_quantity"] = pd.to_numeric(last_log_map["logistics_processed_quantity"], errors="coerce").fillna(0)
+    last_log_map["logistics_processed_quantity"] = last_log_map["logistics_processed_quantity"].fillna(0)
     last_ship = (
         last_log_map.groupby(["company_id", "logistics_item_id"], as_index=False)
                     .agg(last_ship=("logistics_processed_quantity", "max"))
@@ -0,0 +1,14 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 람다 패키지와 같이 src/analytics 모듈을 평면 이름으로 import
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "analytics"))
+
+# config는 import 시점에 환경 변수를 읽으므로 먼저 지정 (S3 대신 임시 로컬 디렉터리, 지표 출력 없음)
+os.environ.setdefault("S3_BUCKET", "local")
+os.environ.setdefault("LOCAL_DATA_DIR", tempfile.mkdtemp(prefix="etl-tests-"))
+os.environ.setdefault("PARQUET_WRITE_BACK", "false")
+os.environ.setdefault("METRICS_EMF", "false")
+os.environ.setdefault("FORECAST_CACHE", "false")
@@ -0,0 +1,101 @@
+import json
+import shutil
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+import run as pipeline
+import snapshot_loader
+from backfill import PlanRefs, group_by_month, run_backfill
+from local_store import LocalS3Client
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+from synthetic_data import write_dataset  # noqa: E402
+
+class FakeStore:
+    def __init__(self, keys):
+        self._keys = list(keys)
+        self.discarded = []
+
+    def keys(self):
+        return list(self._keys)
+
+    def discard(self, table_name, date_str):
+        self.discarded.append((table_name, date_str))
+        self._keys.remove((table_name, date_str))
+
+def test_plan_refs_release_after_last_user():
+    plans = {
+        "d1": {"project": ("project", "2026-01-02"), "project_first": ("project", "2026-01-01"),
+               "prev_logistics": ("logistics", "2025-12-31", ["logistics_id"])},
+        "d2": {"project": ("project", "2026-01-03"), "project_first": ("project", "2026-01-01"),
+               "prev_logistics": ("logistics", "2025-12-31")},
+    }
+    store = FakeStore([("project", "2026-01-02"), ("project", "2026-01-03"), ("project", "2026-01-01"),
+                       ("logistics", "2025-12-31"), ("project", "2025-10-31")])
+    refs = PlanRefs(store, plans)
+    assert refs.counts[("project", "2026-01-01")] == 2
+    assert refs.counts[("logistics", "2025-12-31")] == 2
+
+    # 계획에 없는 스냅샷 (SLA 원천 월말 등)만 제거
+    refs.discard_unplanned()
+    assert store.discarded == [("project", "2025-10-31")]
+
+    refs.release(plans["d1"])
+    assert store.discarded[1:] == [("project", "2026-01-02")]
+    # 공유 스냅샷(월초 / 전월 말)은 마지막 날짜가 끝나야 제거
+    refs.release(plans["d2"])
+    assert sorted(store.discarded[2:]) == [("logistics", "2025-12-31"), ("project", "2026-01-01"),
+                                           ("project", "2026-01-03")]
+    assert set(refs.counts.values()) == {0}
+
+def test_group_by_month():
+    dates = [date(2026, 2, 1), date(2026, 1, 30), date(2026, 1, 31)]
+    assert group_by_month(dates) == [[date(2026, 1, 30), date(2026, 1, 31)], [date(2026, 2, 1)]]
+
+
+# ---- 기간 재처리 == 날짜별 run() ----
+
+TARGET = date(2026, 2, 2)
+DAYS = 4  # 2026-01-30 ~ 2026-02-02 (월 경계 포함)
+
+@pytest.fixture
+def local_data(tmp_path, monkeypatch):
+    # 소규모 3개 회사 / 예측 학습용 mock 이력은 12개월만 (테스트 시간 단축)
+    config = {"companies": 3, "projects": 30, "logistics": 300, "inventory": 300, "items": 200, "forecast_months": 12}
+    write_dataset(tmp_path, TARGET, config, days=DAYS)
+    monkeypatch.setattr(snapshot_loader, "_s3_client", LocalS3Client(str(tmp_path)))
+    return tmp_path
+
+def _reports(root: Path) -> dict:
+    """일일 리포트 내용 (calculatedAt 제외)"""
+    reports = {}
+    for path in sorted((root / "kpi" / "daily-report").rglob("report_*")):
+        lines = [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+        reports[path.relative_to(root).as_posix()] = [{k: v for k, v in r.items() if k != "calculatedAt"}
+                                                      for r in lines]
+    return reports
+
+def test_backfill_matches_sequential_runs(local_data):
+    start = date(2026, 1, 30)
+    for i in range(DAYS):
+        pipeline.run(date.fromordinal(start.toordinal() + i))
+    expected = _reports(local_data)
+    assert len(expected) > DAYS
+
+    shutil.rmtree(local_data / "kpi")
+    result = run_backfill(start, TARGET, max_workers=3)
+    assert result == {"succeeded": [date.fromordinal(start.toordinal() + i) for i in range(DAYS)], "failed": {}}
+    assert _reports(local_data) == expected
+
+def test_backfill_reports_failed_dates(local_data, capsys):
+    """스냅샷이 없는 날짜는 실패로 기록하고 나머지 날짜는 계속"""
+    missing = date(2026, 1, 31)
+    for path in (local_data / "exports" / "daily").glob(f"item--{missing}.*"):
+        path.unlink()
+    result = run_backfill(date(2026, 1, 30), TARGET, max_workers=2)
+    assert list(result["failed"]) == [missing]
+    assert missing not in result["succeeded"] and len(result["succeeded"]) == DAYS - 1
+    assert "[Error] Backfill failed: 2026-01-31" in capsys.readouterr().out
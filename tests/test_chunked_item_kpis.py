@@ -0,0 +1,116 @@
+import sys
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import run as pipeline
+import snapshot_loader
+from chunked_item_kpis import ITEM_TABLES, PartialAggregate, _group_reducer, _last_row_reducer, calculate_item_kpis_chunked
+from config import RAW_PREFIX
+from inventory_turnover import calculate_inventory_turnover
+from local_store import LocalS3Client
+from safety_stock_kpi import calculate_safety_stock_rate
+from snapshot_loader import read_snapshot
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+from synthetic_data import write_dataset  # noqa: E402
+
+# 품목 단위 테이블 3,000 ~ 9,000행 (최소 청크 1,000행 기준 여러 청크)
+DATASET = {"companies": 6, "projects": 80, "logistics": 3000, "inventory": 1500, "items": 3000,
+           "items_per_task": 3, "forecast_months": 12}
+
+def _parts(seed=0, n_parts=200, rows=500):
+    rng = np.random.default_rng(seed)
+    return [pd.Series(rng.integers(0, 100, rows).astype(float),
+                      index=pd.MultiIndex.from_arrays([rng.integers(0, 50, rows), rng.integers(0, 20, rows)],
+                                                      names=["logistics_item_id", "item_id"]))
+            for _ in range(n_parts)]
+
+@pytest.mark.parametrize("how", ["sum", "max"])
+@pytest.mark.parametrize("memory_mb", [0.001, 0.05, 128])
+def test_grouped_partials_match_single_reduce(how, memory_mb):
+    parts = _parts()
+    acc = PartialAggregate("test", _group_reducer(how), memory_mb)
+    for part in parts:
+        acc.add(part.groupby(level=[0, 1]).agg(how))
+    expected = pd.concat(parts).groupby(level=[0, 1]).agg(how)
+    pd.testing.assert_series_equal(acc.result(), expected)
+
+@pytest.mark.parametrize("memory_mb", [0.001, 128])
+def test_last_row_partials_keep_last_chunk_value(memory_mb):
+    rng = np.random.default_rng(1)
+    chunks = [pd.DataFrame({"company_id": rng.integers(0, 5, 300), "item_id": rng.integers(0, 40, 300),
+                            "secured_flag": rng.integers(0, 2, 300)}) for _ in range(50)]
+    acc = PartialAggregate("test", _last_row_reducer(["company_id", "item_id"]), memory_mb)
+    for chunk in chunks:
+        acc.add(chunk)
+    expected = pd.concat(chunks, ignore_index=True).drop_duplicates(subset=["company_id", "item_id"], keep="last")
+    pd.testing.assert_frame_equal(acc.result().reset_index(drop=True), expected.reset_index(drop=True))
+
+def test_reduces_are_amortized():
+    """상한이 아주 작아도 누적 상태 크기 이상 모였을 때만 합침 (청크마다 합치지 않음)"""
+    calls = []
+    reduce = _group_reducer("sum")
+    acc = PartialAggregate("test", lambda parts: calls.append(len(parts)) or reduce(parts), 0.0001)
+    for part in _parts(n_parts=400):
+        acc.add(part.groupby(level=[0, 1]).sum())
+    acc.result()
+    # 키 수(최대 1000)가 고정이라 누적 상태는 일정 크기 -> 합칠 때마다 여러 청크가 모임
+    assert len(calls) < 400 / 2
+    assert sum(calls) == 400 + len(calls) - 1
+
+def test_no_parts_and_oversized_state(capsys):
+    assert PartialAggregate("test", _group_reducer("sum")).result() is None
+    acc = PartialAggregate("shipment", _group_reducer("max"), 0.0001)
+    acc.add(_parts(n_parts=1)[0].groupby(level=[0, 1]).max())
+    acc.result()
+    assert "[Warning] Chunked shipment state" in capsys.readouterr().out
+
+
+# ---- 청크 모드 == 전체 로드 모드 ----
+
+def _add_repeated_rows(data_dir, fmt, date_str, seed=0):
+    """
+    품목 단위 스냅샷에 같은 키의 행을 값만 바꿔 추가하고 섞음 (재전송 행 등)
+    같은 키가 여러 청크에 나뉘어야 청크 간 max / 마지막 행 유지 집계를 검증할 수 있음
+    """
+    rng = np.random.default_rng(seed)
+    value_cols = {"item": "item_quantity", "logistics_item": "logistics_processed_quantity"}
+    for table in ITEM_TABLES:
+        path = Path(data_dir) / RAW_PREFIX / f"{table}--{date_str}.{fmt}"
+        df = pd.read_parquet(path) if fmt == "parquet" else pd.read_csv(path)
+        repeated = df.sample(frac=0.2, random_state=seed)
+        if table in value_cols:
+            repeated[value_cols[table]] = rng.integers(0, 100, len(repeated)).astype(float)
+        df = pd.concat([df, repeated]).sample(frac=1.0, random_state=seed)
+        if fmt == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False)
+
+@pytest.mark.parametrize("target_date", [date(2026, 1, 15), date(2026, 2, 1)], ids=["mid_month", "first_of_month"])
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_chunked_matches_full_load(tmp_path, monkeypatch, fmt, target_date):
+    """합성 스냅샷(LocalS3Client)을 작은 메모리 상한으로 청크 처리해도 안전재고 / 재고 회전율이 전체 로드 계산과 같음"""
+    write_dataset(tmp_path, target_date, DATASET, fmt=fmt)
+    monkeypatch.setattr(snapshot_loader, "_s3_client", LocalS3Client(str(tmp_path)))
+    dates = pipeline.get_run_dates(target_date)
+    for date_str in {dates["target"], dates["first_day"]}:
+        _add_repeated_rows(tmp_path, fmt, date_str)
+    last = {table: read_snapshot(table, dates["target"]) for table in pipeline.TABLES}
+    first = {table: read_snapshot(table, dates["first_day"]) for table in pipeline.TABLES}
+    assert all(len(last[table]) > 2_000 for table in ITEM_TABLES)
+
+    safety, turnover, item_rows = calculate_item_kpis_chunked(
+        dates["target"], dates["first_day"],
+        {table: df for table, df in last.items() if table not in ITEM_TABLES},
+        {table: df for table, df in first.items() if table not in ITEM_TABLES},
+        memory_mb=0.01)
+    assert item_rows == len(last["item"])
+    assert safety == calculate_safety_stock_rate(last["project"], last["inventory"], last["inventory_item"],
+                                                 last["logistics"], last["logistics_item"], last["item"])
+    assert turnover == calculate_inventory_turnover(first, last)
+    assert safety and turnover
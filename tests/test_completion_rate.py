@@ -0,0 +1,206 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from project_completion_kpi import calculate_project_completion_rate
+from shipping_completion_rate import calculate_shipping_completion_rate
+from table_schema import empty_table, normalize_table
+from task_frames import TaskFrames
+
+MONTHS = ["2025-12", "2026-01"]
+
+
+# ---- 기존 구현 - 공통 엔진(concat -> 중복 제거 -> groupby) 결과 비교 기준 ----
+
+def legacy_shipping_completion_rate(df_project, df_logistics, df_prev_logistics, target_month):
+    """회사별 필터링 루프 + 집합 연산"""
+    df = df_logistics.merge(df_project[['project_id', 'company_id']], on='project_id', how='left')
+    prev_df = df_prev_logistics.merge(df_project[['project_id', 'company_id']], on='project_id', how='left')
+    df['_start_month'] = df['logistic_created_at'].dt.to_period('M').astype(str)
+    df['_end_month'] = df['logistics_completed_at'].dt.to_period('M').astype(str)
+
+    carry_over = prev_df[prev_df['logistics_status'] != 'COMPLETED'][['company_id', 'logistics_id']]
+    new_orders = df[df['_start_month'] == target_month][['company_id', 'logistics_id']]
+    completed_in_month = df[
+        (df['logistics_status'] == 'COMPLETED') &
+        (df['_end_month'] == target_month)
+    ][['company_id', 'logistics_id']]
+
+    results = []
+    all_companies = set(carry_over['company_id'].unique()) | set(new_orders['company_id'].unique())
+    for cid in all_companies:
+        if pd.isna(cid): continue
+        c_carry = set(carry_over[carry_over['company_id'] == cid]['logistics_id'])
+        c_new = set(new_orders[new_orders['company_id'] == cid]['logistics_id'])
+        eligible_ids = c_carry | c_new
+        c_completed = set(completed_in_month[completed_in_month['company_id'] == cid]['logistics_id'])
+        completed_ids = eligible_ids & c_completed
+
+        total_count = len(eligible_ids)
+        done_count = len(completed_ids)
+        rate = (done_count / total_count * 100.0) if total_count > 0 else 0.0
+        results.append({
+            "company_id": cid,
+            "total_requested_shipping": total_count,
+            "completed_shipping": done_count,
+            "shipping_completion_rate": round(rate, 3)
+        })
+    return results
+
+def legacy_project_completion_rate(df_project, df_prev_project, target_month):
+    """groupby().apply(set) 회사별 집합"""
+    df = df_project.copy()
+    prev_df = df_prev_project
+    df["_start_month"] = df["project_create_date"].dt.to_period("M").astype(str)
+    df["_end_month"] = df["project_end_date"].dt.to_period("M").astype(str)
+
+    carry_over = prev_df[prev_df["project_status"] != "COMPLETED"][["company_id", "project_id"]].dropna()
+    carry_map = carry_over.groupby("company_id")["project_id"].apply(lambda s: set(s.unique())).to_dict()
+    started = df[df["_start_month"] == target_month][["company_id", "project_id"]].dropna()
+    started_map = started.groupby("company_id")["project_id"].apply(lambda s: set(s.unique())).to_dict()
+    completed = df[(df["project_status"] == "COMPLETED") & (df["_end_month"] == target_month)][["company_id", "project_id"]].dropna()
+    completed_map = completed.groupby("company_id")["project_id"].apply(lambda s: set(s.unique())).to_dict()
+
+    all_companies = sorted(set(carry_map.keys()).union(set(started_map.keys())))
+    results = []
+    for cid in all_companies:
+        if pd.isna(cid): continue
+        eligible_ids = carry_map.get(cid, set()) | started_map.get(cid, set())
+        completed_ids = eligible_ids & completed_map.get(cid, set())
+
+        total_count = len(eligible_ids)
+        done_count = len(completed_ids)
+        rate = (done_count / total_count * 100.0) if total_count > 0 else 0.0
+        results.append({
+            "company_id": cid,
+            "total_requested_projects": total_count,
+            "completed_projects": done_count,
+            "project_completion_rate": round(float(rate), 3)
+        })
+    return results
+
+def _by_company(results):
+    """기존 출하 완료율은 집합 순서로 반환 -> 회사순으로 비교"""
+    return sorted(results, key=lambda r: r["company_id"])
+
+
+# ---- 합성 스냅샷 ----
+
+def _ids(rng, n, high, missing=0.1):
+    values = rng.integers(1, high, n).astype(float)
+    values[rng.random(n) < missing] = np.nan
+    return values
+
+def _dates(rng, n, missing=0.1):
+    """2025-11 ~ 2026-01 사이 날짜 (일부 결측)"""
+    values = pd.Series(pd.Timestamp("2025-11-01") + pd.to_timedelta(rng.integers(0, 90, n), unit="D"))
+    return values.mask(rng.random(n) < missing)
+
+def _status(rng, n):
+    # 소문자 / 결측 상태 포함 (normalize_table에서 대문자 변환)
+    return rng.choice(np.array(["COMPLETED", "completed", "IN_PROGRESS", None], dtype=object), n)
+
+def make_snapshot(seed, n_projects=30, n_tasks=60):
+    """
+    당일 / 전월 말 프로젝트, 출하 스냅샷
+    결측 회사 / 프로젝트 / 출하 ID, 없는 프로젝트 참조, 전월 말 중복 ID 포함 (원천과 같은 타입이 되도록 normalize_table 적용)
+    """
+    rng = np.random.default_rng(seed)
+    df_project = normalize_table(pd.DataFrame({
+        "project_id": np.arange(1, n_projects + 1),
+        "company_id": _ids(rng, n_projects, 6),
+        "project_status": _status(rng, n_projects),
+        "project_create_date": _dates(rng, n_projects),
+        "project_end_date": _dates(rng, n_projects),
+    }), "project")
+    df_prev_project = normalize_table(pd.DataFrame({
+        "project_id": _ids(rng, n_projects, n_projects + 5),
+        "company_id": _ids(rng, n_projects, 6),
+        "project_status": _status(rng, n_projects),
+    }), "project")
+    df_logistics = normalize_table(pd.DataFrame({
+        "logistics_id": pd.Series(np.arange(1, n_tasks + 1)).mask(rng.random(n_tasks) < 0.05),
+        "project_id": _ids(rng, n_tasks, n_projects + 5),
+        "logistics_status": _status(rng, n_tasks),
+        "logistic_created_at": _dates(rng, n_tasks),
+        "logistics_completed_at": _dates(rng, n_tasks),
+    }), "logistics")
+    df_prev_logistics = normalize_table(pd.DataFrame({
+        "logistics_id": _ids(rng, n_tasks, n_tasks + 20),
+        "project_id": _ids(rng, n_tasks, n_projects + 5),
+        "logistics_status": _status(rng, n_tasks),
+    }), "logistics")
+    return df_project, df_prev_project, df_logistics, df_prev_logistics
+
+
+# ---- 결과 비교 ----
+
+@pytest.mark.parametrize("month", MONTHS)
+@pytest.mark.parametrize("seed", range(25))
+def test_shipping_matches_legacy_per_company_loop(seed, month):
+    df_project, _, df_logistics, df_prev_logistics = make_snapshot(seed)
+    expected = _by_company(legacy_shipping_completion_rate(df_project, df_logistics, df_prev_logistics, month))
+    results = calculate_shipping_completion_rate(df_project, df_logistics, df_prev_logistics, month)
+    assert results == expected
+    # 다른 KPI와 TaskFrames를 공유하는 경로도 같은 결과
+    frames = TaskFrames(df_project, df_logistics)
+    assert calculate_shipping_completion_rate(df_project, df_logistics, df_prev_logistics, month,
+                                              frames=frames) == expected
+
+@pytest.mark.parametrize("month", MONTHS)
+@pytest.mark.parametrize("seed", range(25))
+def test_project_matches_legacy_groupby_sets(seed, month):
+    df_project, df_prev_project, _, _ = make_snapshot(seed)
+    expected = legacy_project_completion_rate(df_project, df_prev_project, month)
+    assert calculate_project_completion_rate(df_project, df_prev_project, month) == expected
+    frames = TaskFrames(df_project)
+    assert calculate_project_completion_rate(df_project, df_prev_project, month, frames=frames) == expected
+
+def test_completed_outside_eligible_is_not_counted():
+    """당월 완료라도 이월 / 당월 시작 대상이 아니면 완료 건수에서 제외"""
+    df_project = normalize_table(pd.DataFrame({
+        "project_id": [1, 2, 3],
+        "company_id": [1, 1, 1],
+        "project_status": ["COMPLETED", "COMPLETED", "IN_PROGRESS"],
+        "project_create_date": ["2025-10-01", "2026-01-03", "2026-01-05"],
+        "project_end_date": ["2026-01-10", "2026-01-20", None],
+    }), "project")
+    df_prev_project = empty_table("project")
+    assert calculate_project_completion_rate(df_project, df_prev_project, "2026-01") == [{
+        "company_id": 1, "total_requested_projects": 2, "completed_projects": 1, "project_completion_rate": 50.0,
+    }]
+
+def test_missing_shipping_id_counts_once_per_company():
+    """기존 집합 연산처럼 출하 ID 결측 건은 회사별 1건 (이월 / 당월 시작 / 완료 모두)"""
+    df_project = normalize_table(pd.DataFrame({"project_id": [1], "company_id": [1]}), "project")
+    df_logistics = normalize_table(pd.DataFrame({
+        "logistics_id": [None, None, 3],
+        "project_id": [1, 1, 1],
+        "logistics_status": ["COMPLETED", "IN_PROGRESS", "IN_PROGRESS"],
+        "logistic_created_at": ["2026-01-02", "2026-01-03", "2026-01-04"],
+        "logistics_completed_at": ["2026-01-05", None, None],
+    }), "logistics")
+    df_prev_logistics = normalize_table(pd.DataFrame({
+        "logistics_id": [None], "project_id": [1], "logistics_status": ["IN_PROGRESS"]}), "logistics")
+    expected = [{"company_id": 1, "total_requested_shipping": 2, "completed_shipping": 1,
+                 "shipping_completion_rate": 50.0}]
+    assert legacy_shipping_completion_rate(df_project, df_logistics, df_prev_logistics, "2026-01") == expected
+    assert calculate_shipping_completion_rate(df_project, df_logistics, df_prev_logistics, "2026-01") == expected
+
+@pytest.mark.parametrize("case", ["no_tasks", "no_prev", "no_project", "all"])
+def test_empty_inputs(case):
+    df_project, df_prev_project, df_logistics, df_prev_logistics = make_snapshot(11)
+    if case in ("no_tasks", "all"):
+        df_logistics = empty_table("logistics")
+    if case in ("no_prev", "all"):
+        df_prev_project, df_prev_logistics = empty_table("project"), empty_table("logistics")
+    if case in ("no_project", "all"):
+        df_project = empty_table("project")
+    for month in MONTHS:
+        expected = _by_company(legacy_shipping_completion_rate(df_project, df_logistics, df_prev_logistics, month))
+        assert calculate_shipping_completion_rate(df_project, df_logistics, df_prev_logistics, month) == expected
+        expected = legacy_project_completion_rate(df_project, df_prev_project, month)
+        assert calculate_project_completion_rate(df_project, df_prev_project, month) == expected
+    if case == "all":
+        assert calculate_shipping_completion_rate(df_project, df_logistics, df_prev_logistics, MONTHS[0]) == []
+        assert calculate_project_completion_rate(df_project, df_prev_project, MONTHS[0]) == []
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from forecast_executor import _lpt_chunks, resolve_workers, run_per_company
+
+def _mean(history, n_jobs, scale=1):
+    return sum(history) / len(history) * scale
+
+def _fail_on_negative(history, n_jobs):
+    if min(history) < 0:
+        raise ValueError("negative history")
+    return sum(history)
+
+def _exit_on_negative(history, n_jobs):
+    if min(history) < 0:
+        os._exit(3)  # 자식 프로세스 비정상 종료 (메모리 부족 등)
+    return sum(history)
+
+def _none_on_short(history, n_jobs):
+    return None if len(history) < 3 else len(history)
+
+def _n_jobs(history, n_jobs):
+    return n_jobs
+
+def _tasks(n=7):
+    return [(cid, list(range(1, cid + 2))) for cid in range(n)]
+
+@pytest.mark.parametrize("max_workers", [1, 2, 3, 16])
+def test_results_keep_input_order(max_workers):
+    tasks = _tasks()
+    results = run_per_company(_mean, tasks, "test", max_workers=max_workers, scale=2)
+    assert results == [(cid, _mean(history, 1, scale=2)) for cid, history in tasks]
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_exception_only_drops_that_company(max_workers, capsys):
+    tasks = _tasks(5)
+    tasks[2] = (2, [1, -1, 3])
+    results = run_per_company(_fail_on_negative, tasks, "test", max_workers=max_workers)
+    assert [cid for cid, _ in results] == [0, 1, 3, 4]
+    assert "[Error] test failed for Company 2: negative history" in capsys.readouterr().out
+
+def test_worker_exit_only_drops_its_companies(capsys):
+    """프로세스가 죽으면 그 프로세스에 배정된 회사만 제외, 나머지 프로세스 결과는 유지"""
+    tasks = _tasks(4)
+    tasks[1] = (1, [5, -1])
+    # 회사 수 = 프로세스 수 -> 프로세스당 1곳
+    results = run_per_company(_exit_on_negative, tasks, "test", max_workers=4)
+    assert results == [(cid, sum(history)) for cid, history in tasks if cid != 1]
+    assert "[Error] test failed for Company 1: worker process exited" in capsys.readouterr().out
+
+def test_unsendable_result_is_reported(capsys):
+    """결과를 부모로 보낼 수 없으면 (pickle 불가) 해당 프로세스의 회사는 실패로 기록"""
+    tasks = _tasks(2)
+    results = run_per_company(lambda history, n_jobs: (lambda: None) if len(history) == 1 else 1, tasks, "test",
+                              max_workers=2)
+    assert results == [(1, 1)]
+    assert "Company 0: worker process exited" in capsys.readouterr().out
+
+def test_none_results_are_skipped():
+    assert run_per_company(_none_on_short, _tasks(5), "test", max_workers=2) == [(2, 3), (3, 4), (4, 5)]
+
+def test_empty_tasks():
+    assert run_per_company(_mean, [], "test", max_workers=4) == []
+
+def test_threads_per_worker():
+    workers, n_jobs = resolve_workers(3, max_workers=2)
+    assert workers == 2 and n_jobs == max(1, (os.cpu_count() or 1) // 2)
+    results = run_per_company(_n_jobs, _tasks(3), "test", max_workers=2)
+    assert {value for _, value in results} == {n_jobs}
+
+def test_lpt_chunks_balance_costs():
+    chunks = _lpt_chunks([10, 1, 1, 1, 7, 2, 2], 2)
+    assert sorted(i for chunk in chunks for i in chunk) == list(range(7))
+    loads = sorted(sum([10, 1, 1, 1, 7, 2, 2][i] for i in chunk) for chunk in chunks)
+    assert loads == [12, 12]
+    # 작업보다 묶음이 많으면 빈 묶음은 제외
+    assert len(_lpt_chunks([3, 4], 5)) == 2
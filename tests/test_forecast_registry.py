@@ -0,0 +1,157 @@
+import json
+
+import pandas as pd
+import pytest
+
+import forecast_registry
+import snapshot_loader
+from config import KPI_PREFIX
+from forecast_registry import ForecastRegistry, cached_global, cached_per_company
+from local_store import LocalS3Client
+
+TARGET = "turnOverRate"
+CONFIG = {"target_col": TARGET, "H": 1, "min_history": 12}
+
+class Fit:
+    """학습 호출 기록 - 예측값은 이력 평균 (회사별 / 통합)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def per_company(self, tasks):
+        self.calls.append(sorted(int(cid) for cid, _ in tasks))
+        return [(cid, ([float(g[TARGET].mean())], {"model": f"m{int(cid)}"})) for cid, g in tasks]
+
+    def global_(self, tasks):
+        self.calls.append(sorted(int(cid) for cid, _ in tasks))
+        return [(cid, [float(g[TARGET].mean())]) for cid, g in tasks], {"model": "global"}
+
+def _tasks(months=12, companies=(1, 2, 3), end="2026-01-31"):
+    dates = pd.date_range(end=end, periods=months, freq="ME").strftime("%Y-%m-%d")
+    return [(cid, pd.DataFrame({"snapshotDate": dates, TARGET: [float(cid + i) for i in range(months)]}))
+            for cid in companies]
+
+def _with_new_month(tasks, cid):
+    """cid 회사에 다음 월말 값 추가"""
+    out = []
+    for c, g in tasks:
+        if c == cid:
+            next_date = (pd.Timestamp(g["snapshotDate"].max()) + pd.offsets.MonthEnd(1)).strftime("%Y-%m-%d")
+            g = pd.concat([g, pd.DataFrame({"snapshotDate": [next_date], TARGET: [99.0]})], ignore_index=True)
+        out.append((c, g))
+    return out
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    client = LocalS3Client(str(tmp_path))
+    monkeypatch.setattr(snapshot_loader, "_s3_client", client)
+    return client
+
+def _run_per_company(tasks, fit, config=CONFIG):
+    return cached_per_company(ForecastRegistry("test/per_company", config), tasks, TARGET, fit.per_company)
+
+def _run_global(tasks, fit, config=CONFIG):
+    return cached_global(ForecastRegistry("test/global", config), tasks, TARGET, fit.global_)
+
+def _model_keys(client, name):
+    return [obj["Key"] for obj in client.list_objects_v2(Prefix=f"{KPI_PREFIX}/models/{name}/")["Contents"]]
+
+
+# ---- 회사별 캐시 ----
+
+def test_per_company_miss_then_hit(client):
+    fit = Fit()
+    tasks = _tasks()
+    first = _run_per_company(tasks, fit)
+    # 새 레지스트리(다음 실행)는 저장된 manifest에서 예측값 사용
+    assert _run_per_company(tasks, fit) == first
+    assert fit.calls == [[1, 2, 3]]
+    assert [cid for cid, _ in first] == [1, 2, 3]
+
+def test_per_company_retrains_only_changed_history(client):
+    fit = Fit()
+    tasks = _tasks()
+    _run_per_company(tasks, fit)
+    # 새 월말 값 (회사 2)
+    tasks = _with_new_month(tasks, 2)
+    preds = dict(_run_per_company(tasks, fit))
+    assert fit.calls[-1] == [2]
+    assert preds[2] == [float(tasks[1][1][TARGET].mean())]
+    # 과거 값 정정 (회사 3)
+    tasks[2][1].loc[0, TARGET] = -1.0
+    _run_per_company(tasks, fit)
+    assert fit.calls[-1] == [3]
+    _run_per_company(tasks, fit)
+    assert len(fit.calls) == 3
+
+def test_per_company_config_or_model_version_change(client, monkeypatch):
+    fit = Fit()
+    tasks = _tasks()
+    _run_per_company(tasks, fit)
+    _run_per_company(tasks, fit, {**CONFIG, "H": 3})
+    assert fit.calls[-1] == [1, 2, 3]
+    monkeypatch.setattr(forecast_registry, "MODEL_VERSION", forecast_registry.MODEL_VERSION + 1)
+    _run_per_company(tasks, fit, {**CONFIG, "H": 3})
+    assert fit.calls == [[1, 2, 3]] * 3
+
+def _broken_get_object(*args, **kwargs):
+    raise OSError("connection reset")
+
+def test_registry_read_failure_retrains(client, monkeypatch, capsys):
+    fit = Fit()
+    tasks = _tasks()
+    _run_per_company(tasks, fit)
+    monkeypatch.setattr(client, "get_object", _broken_get_object)
+    preds = _run_per_company(tasks, fit)
+    assert fit.calls == [[1, 2, 3]] * 2
+    assert [cid for cid, _ in preds] == [1, 2, 3]
+    assert "[Warning] Forecast registry unavailable, retraining all: test/per_company" in capsys.readouterr().out
+
+def test_artifacts_are_overwritten_per_entry(client):
+    """매월 재학습해도 항목별 아티팩트는 1개 (manifest가 가리키는 최신 해시)"""
+    fit = Fit()
+    tasks = _tasks()
+    for _ in range(3):
+        _run_per_company(tasks, fit)
+        tasks = _with_new_month(tasks, 1)
+    keys = _model_keys(client, "test/per_company")
+    assert sorted(keys) == sorted(f"{KPI_PREFIX}/models/test/per_company/{name}.json"
+                                  for name in ["manifest", "company-1", "company-2", "company-3"])
+    with client.get_object(Key=f"{KPI_PREFIX}/models/test/per_company/manifest.json")["Body"] as body:
+        manifest = json.loads(body.read())
+    with client.get_object(Key=manifest["company-1"]["artifact"])["Body"] as body:
+        artifact = json.loads(body.read())
+    assert artifact["digest"] == manifest["company-1"]["digest"]
+    assert artifact["model"] == "m1"
+
+
+# ---- 통합 모델 캐시 ----
+
+def test_global_hit_and_invalidation(client, monkeypatch):
+    fit = Fit()
+    tasks = _tasks()
+    first = _run_global(tasks, fit)
+    assert _run_global(tasks, fit) == first
+    assert len(fit.calls) == 1
+    # 회사 하나라도 새 월말 값이 생기면 전체 재학습
+    tasks = _with_new_month(tasks, 3)
+    _run_global(tasks, fit)
+    assert fit.calls[-1] == [1, 2, 3] and len(fit.calls) == 2
+    # 값 정정 / 설정 변경 / MODEL_VERSION 변경
+    tasks[0][1].loc[0, TARGET] = -1.0
+    _run_global(tasks, fit)
+    _run_global(tasks, fit, {**CONFIG, "min_history": 6})
+    monkeypatch.setattr(forecast_registry, "MODEL_VERSION", forecast_registry.MODEL_VERSION + 1)
+    _run_global(tasks, fit, {**CONFIG, "min_history": 6})
+    assert len(fit.calls) == 5
+    assert sorted(_model_keys(client, "test/global")) == [f"{KPI_PREFIX}/models/test/global/{name}.json"
+                                                          for name in ["global", "manifest"]]
+
+def test_global_read_failure_and_empty_tasks(client, monkeypatch):
+    fit = Fit()
+    assert _run_global([], fit) == [] and fit.calls == []
+    tasks = _tasks()
+    _run_global(tasks, fit)
+    monkeypatch.setattr(client, "get_object", _broken_get_object)
+    assert [cid for cid, _ in _run_global(tasks, fit)] == [1, 2, 3]
+    assert len(fit.calls) == 2
@@ -0,0 +1,88 @@
+import inspect
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecast_sources import FORECAST_TARGETS, history_series, load_forecast_sources
+from predict_inventory_turnover import forecast_inventory_turnover_hybrid
+from predict_shipment_lead_time import forecast_lead_time_xgb
+
+class FakeStore:
+    """mock 고정 파일 조회 기록"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, table_name, date_str, columns=None):
+        self.calls.append((table_name, date_str))
+        return pd.DataFrame({"companyId": [1], "snapshotDate": ["2020-01-31"], "table": [table_name]})
+
+def make_history(months, companies=(1, 2), end="2026-01-31", seed=0):
+    """월말 기준 companies x months개월 KPI 이력 (kpi_history.py 형태, end가 마지막 월말)"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(end=end, periods=months, freq="ME").strftime("%Y-%m-%d")
+    df = pd.DataFrame([(cid, d) for cid in companies for d in dates], columns=["companyId", "snapshotDate"])
+    df["shipmentLeadTimeAvg"] = rng.uniform(10, 50, len(df))
+    df["turnOverRate"] = rng.uniform(0, 3, len(df))
+    return df
+
+def test_min_history_matches_forecaster_defaults():
+    """mock 대체 기준 = 각 예측 함수가 학습하는 최소 이력"""
+    for name, forecast in (("leadtime", forecast_lead_time_xgb), ("turnover", forecast_inventory_turnover_hybrid)):
+        assert FORECAST_TARGETS[name][2] == inspect.signature(forecast).parameters["min_history"].default
+
+def test_history_series_excludes_target_and_later_months():
+    history = make_history(6, end="2026-03-31")
+    history.loc[0, "turnOverRate"] = np.nan
+    series = history_series(history, "turnOverRate", "2026-02")
+    # 2026-02 월말 / 2026-03 월말은 제외 (기간 재처리 시 미래 값 배제)
+    assert series["snapshotDate"].max() == "2026-01-31"
+    assert list(series.columns) == ["companyId", "snapshotDate", "turnOverRate"]
+    assert series["turnOverRate"].notna().all()
+    assert len(series) == 2 * 4 - 1
+    assert series.equals(series.sort_values(["companyId", "snapshotDate"]).reset_index(drop=True))
+
+def test_history_series_without_earlier_months():
+    history = make_history(3, end="2026-03-31")
+    assert history_series(history, "turnOverRate", "2026-01").empty
+
+@pytest.mark.parametrize("months, expected", [
+    (11, {"leadtime": "mock", "turnover": "mock"}),
+    (12, {"leadtime": "mock", "turnover": "history"}),
+    (23, {"leadtime": "mock", "turnover": "history"}),
+    (24, {"leadtime": "history", "turnover": "history"}),
+])
+def test_per_target_min_history(months, expected):
+    """재고 회전율은 12개월, 출하 리드타임은 24개월부터 이력 사용"""
+    store = FakeStore()
+    sources = load_forecast_sources(make_history(months), store, "2026-02")
+    for name, (column, mock_table, _) in FORECAST_TARGETS.items():
+        if expected[name] == "history":
+            assert column in sources[name].columns and len(sources[name]) == 2 * months
+        else:
+            assert sources[name]["table"].tolist() == [mock_table]
+    assert len(store.calls) == list(expected.values()).count("mock")
+
+def test_mock_fallback():
+    store = FakeStore()
+    # 이력 없음
+    sources = load_forecast_sources(None, store, "2026-02")
+    assert store.calls == [("predict_leadtime_mock", None), ("predict_turnover_mock", None)]
+    assert sources["turnover"]["table"].tolist() == ["predict_turnover_mock"]
+
+    # KPI 컬럼이 없는 이력 / 대상 월 이전 이력이 없는 경우
+    store = FakeStore()
+    load_forecast_sources(make_history(30).drop(columns=["turnOverRate"]), store, "2026-02")
+    assert store.calls == [("predict_turnover_mock", None)]
+    store = FakeStore()
+    load_forecast_sources(make_history(30, end="2026-03-31"), store, "2023-01")
+    assert len(store.calls) == 2
+
+def test_history_shorter_for_all_but_one_company():
+    """회사 하나라도 최소 이력을 채우면 이력 사용 (짧은 회사는 예측 함수에서 제외)"""
+    history = pd.concat([make_history(24, companies=(1,)), make_history(5, companies=(2,))], ignore_index=True)
+    store = FakeStore()
+    sources = load_forecast_sources(history, store, "2026-02")
+    assert store.calls == []
+    assert set(sources["leadtime"]["companyId"]) == {1, 2}
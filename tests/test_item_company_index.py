@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from inventory_turnover import calculate_inventory_turnover
+from item_company_index import ItemCompanyIndex, ItemCompanyIndexBuilder
+from safety_stock_kpi import calculate_safety_stock_rate
+from table_schema import empty_table, normalize_table
+
+SAFETY_TABLES = ["project", "inventory", "inventory_item", "logistics", "logistics_item", "item"]
+
+
+# ---- 기존 구현 (merge 체인 + combine_first) - 매핑 인덱스 결과 비교 기준 ----
+
+def legacy_safety_stock_rate(df_project, df_inventory, df_inventory_item, df_logistics, df_logistics_item, df_item):
+    inv_map = (
+        df_inventory_item.merge(df_inventory, on="inventory_id", how="left")
+        .merge(df_project, on="project_id", how="left")
+        .dropna(subset=["company_id", "project_id"])
+        .drop_duplicates(subset=["item_id"], keep="last")[["item_id", "company_id", "project_id"]]
+    )
+    log_map = (
+        df_logistics_item.merge(df_logistics, on="logistics_id", how="left")
+        .merge(df_project, on="project_id", how="left")
+        .dropna(subset=["company_id", "project_id"])
+        .drop_duplicates(subset=["item_id"], keep="last")[["item_id", "company_id", "project_id"]]
+    )
+    item_map = inv_map.merge(log_map, on="item_id", how="outer", suffixes=("_inv", "_log"))
+    item_map["company_id"] = item_map["company_id_inv"].combine_first(item_map["company_id_log"])
+    item_map["project_id"] = item_map["project_id_inv"].combine_first(item_map["project_id_log"])
+    item_map = item_map[["item_id", "company_id", "project_id"]]
+
+    df = df_item.merge(item_map, on="item_id", how="left")
+    df["item_quantity"] = df["item_quantity"].fillna(0)
+    df["safety_stock"] = df["safety_stock"].fillna(0)
+    kpi_base = df.dropna(subset=["company_id", "project_id"]).copy()
+    item_level = (
+        kpi_base.sort_values(["company_id", "item_id"])
+        .drop_duplicates(subset=["company_id", "item_id"], keep="last")
+        .copy()
+    )
+    item_level["secured_flag"] = (item_level["item_quantity"] >= item_level["safety_stock"]).astype(int)
+    kpi = (
+        item_level.groupby("company_id", as_index=False)
+            .agg(
+                total_items=("item_id", "nunique"),
+                secured_items=("secured_flag", "sum")
+        )
+    )
+    kpi["safety_stock_rate_monthly"] = np.where(
+        kpi["total_items"] == 0,
+        np.nan,
+        (kpi["secured_items"] / kpi["total_items"] * 100.0)
+    ).round(3)
+    return kpi.to_dict(orient="records")
+
+def legacy_inventory_turnover(df_first, df_last):
+    def get_item_company_map(project, inventory, inventory_item, logistics, logistics_item):
+        inv_map = inventory_item.merge(inventory, on="inventory_id", how="left") \
+                                .merge(project, on="project_id", how="left") \
+                                .dropna(subset=["company_id"]) \
+                                .drop_duplicates(subset=["item_id"], keep="last")
+        # 출하 경로는 회사가 없는 최신 행도 그대로 둠 (latest_logistics=True)
+        log_map = logistics_item.merge(logistics, on="logistics_id", how="left") \
+                                .merge(project, on="project_id", how="left") \
+                                .drop_duplicates(subset=["item_id"], keep="last")[["item_id", "company_id"]]
+        item_map = inv_map.merge(log_map, on="item_id", how="outer", suffixes=("_inv", "_log"))
+        item_map["company_id"] = item_map["company_id_inv"].combine_first(item_map["company_id_log"])
+        return item_map[["item_id", "company_id"]]
+
+    first_map = get_item_company_map(*(df_first[t] for t in SAFETY_TABLES[:5]))
+    last_map = get_item_company_map(*(df_last[t] for t in SAFETY_TABLES[:5]))
+
+    first_df = df_first['item'].merge(first_map, on="item_id", how="left").dropna(subset=["company_id"])
+    last_df = df_last['item'].merge(last_map, on="item_id", how="left").dropna(subset=["company_id"])
+    begin_inv = first_df.groupby("company_id")["item_quantity"].sum().reset_index(name="begin_inventory")
+    end_inv = last_df.groupby("company_id")["item_quantity"].sum().reset_index(name="end_inventory")
+    inv_summary = begin_inv.merge(end_inv, on="company_id", how="outer").fillna(0)
+    inv_summary["avg_inventory"] = (inv_summary["begin_inventory"] + inv_summary["end_inventory"]) / 2
+
+    last_log_items = df_last['logistics_item'].merge(last_map, on="item_id", how="left").dropna(subset=["company_id"])
+    first_log_items = df_first['logistics_item'].merge(first_map, on="item_id", how="left").dropna(subset=["company_id"])
+    last_ship = last_log_items.groupby(["company_id", "logistics_item_id"])["logistics_processed_quantity"].max().reset_index(name="last_qty")
+    first_ship = first_log_items.groupby(["company_id", "logistics_item_id"])["logistics_processed_quantity"].max().reset_index(name="first_qty")
+    shipment = last_ship.merge(first_ship, on=["company_id", "logistics_item_id"], how="left").fillna(0)
+    shipment["delta_ship"] = (shipment["last_qty"] - shipment["first_qty"]).clip(lower=0)
+    total_ship = shipment.groupby("company_id")["delta_ship"].sum().reset_index(name="month_ship")
+
+    kpi = inv_summary.merge(total_ship, on="company_id", how="outer").fillna(0)
+    kpi["inventory_turnover"] = np.where(
+        kpi["avg_inventory"] == 0,
+        0.0,
+        kpi["month_ship"] / kpi["avg_inventory"]
+    ).round(3)
+    return kpi[["company_id", "inventory_turnover"]].to_dict(orient="records")
+
+
+# ---- 합성 스냅샷 ----
+
+def _ids(rng, n, high, missing=0.1):
+    values = rng.integers(1, high, n).astype(float)
+    values[rng.random(n) < missing] = np.nan
+    return values
+
+def make_tables(seed, n_rows=80):
+    """
+    품목 매핑 원천 테이블
+    - 같은 품목의 입고 / 출하 행 여러 개 (마지막 행 유지 검증), 입고 / 출하 양쪽에 매핑되는 품목
+    - 없는 입고 / 출하 / 프로젝트를 가리키는 행, 회사 없는 프로젝트, 매핑이 없는 품목
+    - item 테이블의 같은 품목 중복 행
+    """
+    rng = np.random.default_rng(seed)
+    tables = {
+        "project": pd.DataFrame({"project_id": np.arange(1, 11), "company_id": _ids(rng, 10, 4)}),
+        "inventory": pd.DataFrame({"inventory_id": np.arange(1, 16), "project_id": _ids(rng, 15, 13)}),
+        "logistics": pd.DataFrame({"logistics_id": np.arange(1, 16), "project_id": _ids(rng, 15, 13)}),
+        "inventory_item": pd.DataFrame({"inventory_item_id": np.arange(n_rows), "item_id": rng.integers(1, 30, n_rows),
+                                        "inventory_id": _ids(rng, n_rows, 18)}),
+        "logistics_item": pd.DataFrame({"logistics_item_id": rng.integers(1, 40, n_rows),
+                                        "item_id": rng.integers(1, 30, n_rows), "logistics_id": _ids(rng, n_rows, 18),
+                                        "logistics_processed_quantity": rng.integers(0, 9, n_rows).astype(float)}),
+        "item": pd.DataFrame({"item_id": rng.integers(1, 35, 40), "item_quantity": rng.integers(0, 9, 40).astype(float),
+                              "safety_stock": rng.integers(0, 9, 40).astype(float)}),
+    }
+    return {table: normalize_table(df, table) for table, df in tables.items()}
+
+def _safety_args(tables):
+    return [tables[table] for table in SAFETY_TABLES]
+
+
+# ---- 결과 비교 ----
+
+@pytest.mark.parametrize("seed", range(30))
+def test_safety_stock_matches_legacy_merge(seed):
+    tables = make_tables(seed)
+    expected = legacy_safety_stock_rate(*_safety_args(tables))
+    assert calculate_safety_stock_rate(*_safety_args(tables)) == expected
+    # run()처럼 미리 만든 인덱스를 넘겨도 같은 결과
+    assert calculate_safety_stock_rate(*_safety_args(tables), item_index=ItemCompanyIndex.from_tables(tables)) == expected
+
+@pytest.mark.parametrize("seed", range(30))
+def test_inventory_turnover_matches_legacy_merge(seed):
+    first, last = make_tables(seed + 1000), make_tables(seed)
+    expected = legacy_inventory_turnover(first, last)
+    assert calculate_inventory_turnover(first, last) == expected
+    assert calculate_inventory_turnover(first, last, first_index=ItemCompanyIndex.from_tables(first),
+                                        last_index=ItemCompanyIndex.from_tables(last)) == expected
+
+def test_latest_logistics_row_without_company():
+    """
+    품목의 최신 출하 행이 회사 없는 프로젝트를 가리키면
+    재고 회전율(latest_logistics=True)은 매핑 없음, 안전재고는 회사가 있는 이전 출하 행 사용
+    """
+    tables = {
+        "project": pd.DataFrame({"project_id": [1, 2], "company_id": [7, None]}),
+        "inventory": pd.DataFrame({"inventory_id": [1], "project_id": [1]}),
+        "logistics": pd.DataFrame({"logistics_id": [1, 2], "project_id": [1, 2]}),
+        "inventory_item": pd.DataFrame({"inventory_item_id": [1], "item_id": [10], "inventory_id": [1]}),
+        "logistics_item": pd.DataFrame({"logistics_item_id": [1, 2, 3], "item_id": [20, 20, 10],
+                                        "logistics_id": [1, 2, 2], "logistics_processed_quantity": [5.0, 6.0, 1.0]}),
+        "item": pd.DataFrame({"item_id": [10, 20], "item_quantity": [3.0, 4.0], "safety_stock": [1.0, 1.0]}),
+    }
+    tables = {table: normalize_table(df, table) for table, df in tables.items()}
+    index = ItemCompanyIndex.from_tables(tables)
+    items = pd.Series([10, 20, 30], dtype="Int64")
+    # 매핑 없음 -> -1
+    assert index.lookup(items)["company_id"].fillna(-1).tolist() == [7, 7, -1]
+    # 입고 매핑은 최신 출하 행보다 우선
+    assert index.lookup(items, latest_logistics=True)["company_id"].fillna(-1).tolist() == [7, -1, -1]
+
+    assert calculate_safety_stock_rate(*_safety_args(tables)) == legacy_safety_stock_rate(*_safety_args(tables))
+    assert calculate_inventory_turnover(tables, tables) == legacy_inventory_turnover(tables, tables)
+    assert calculate_inventory_turnover(tables, tables) == [{"company_id": 7, "inventory_turnover": 0.0}]
+
+@pytest.mark.parametrize("seed", range(10))
+def test_builder_matches_full_index(seed):
+    """청크로 누적한 매핑(ItemCompanyIndexBuilder) == 전체 테이블로 만든 매핑"""
+    tables = make_tables(seed)
+    builder = ItemCompanyIndexBuilder(tables["project"], tables["inventory"], tables["logistics"])
+    for start in range(0, len(tables["inventory_item"]), 7):
+        builder.add_inventory_items(tables["inventory_item"].iloc[start:start + 7])
+    for start in range(0, len(tables["logistics_item"]), 7):
+        builder.add_logistics_items(tables["logistics_item"].iloc[start:start + 7])
+    chunked, full = builder.build(), ItemCompanyIndex.from_tables(tables)
+    items = pd.Series(np.arange(0, 40), dtype="Int64")
+    for latest_logistics in (False, True):
+        pd.testing.assert_frame_equal(chunked.lookup(items, latest_logistics=latest_logistics),
+                                      full.lookup(items, latest_logistics=latest_logistics))
+
+def test_empty_item_tables():
+    tables = make_tables(3)
+    tables["inventory_item"], tables["logistics_item"] = empty_table("inventory_item"), empty_table("logistics_item")
+    assert calculate_safety_stock_rate(*_safety_args(tables)) == legacy_safety_stock_rate(*_safety_args(tables)) == []
+    assert calculate_inventory_turnover(tables, tables) == legacy_inventory_turnover(tables, tables) == []
@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from long_term_task_rate_kpi import calculate_long_term_task_rate, calculate_sla_from_history
+from table_schema import empty_table, normalize_table
+from task_frames import TaskFrames
+
+MONTH = "2026-01"
+SLA_COLUMNS = ["company_id", "log_p80", "inv_p80"]
+
+
+# ---- 기존 구현 (회사별 필터링 루프) - groupby 집계 결과 비교 기준 ----
+
+def legacy_calculate_leadtimes(df_project, df_tasks, task_type, target_month):
+    if df_tasks.empty or df_project.empty:
+        return pd.DataFrame(columns=["company_id", "task_id", "lead_time"])
+    col_map = {
+        "logistics": {"id": "logistics_id", "start": "logistic_created_at", "end": "logistics_completed_at", "status": "logistics_status"},
+        "inventory": {"id": "inventory_id", "start": "inventory_created_at", "end": "inventory_completed_at", "status": "inventory_status"}
+    }[task_type]
+    df = df_tasks.merge(df_project[["project_id", "company_id"]], on="project_id", how="left")
+    df["_end_month"] = df[col_map["end"]].dt.to_period("M").astype(str)
+    mask = (df[col_map["status"]] == "COMPLETED") & \
+           (df[col_map["start"]].notna()) & \
+           (df[col_map["end"]].notna()) & \
+           (df["_end_month"] == target_month)
+    df_valid = df[mask].copy()
+    if df_valid.empty:
+        return pd.DataFrame(columns=["company_id", "task_id", "lead_time"])
+    df_valid["lead_time"] = (df_valid[col_map["end"]] - df_valid[col_map["start"]]).dt.total_seconds() / 3600.0
+    return df_valid.rename(columns={col_map["id"]: "task_id"})[["company_id", "task_id", "lead_time"]]
+
+def legacy_add_is_over_column(target_df, df_sla, sla_col_name):
+    if target_df.empty or df_sla.empty:
+        res = target_df.copy()
+        res["is_over"] = False
+        return res
+    merged = target_df.merge(df_sla[["company_id", sla_col_name]], on="company_id", how="left")
+    merged["is_over"] = np.where(merged[sla_col_name].notna(), merged["lead_time"] > merged[sla_col_name], np.nan)
+    return merged
+
+def legacy_long_term_task_rate(df_project, df_log, df_inv, df_sla, target_month):
+    cur_log = legacy_calculate_leadtimes(df_project, df_log, "logistics", target_month)
+    cur_inv = legacy_calculate_leadtimes(df_project, df_inv, "inventory", target_month)
+    cur_log = legacy_add_is_over_column(cur_log, df_sla, "log_p80")
+    cur_inv = legacy_add_is_over_column(cur_inv, df_sla, "inv_p80")
+
+    results = []
+    for cid in df_project["company_id"].unique():
+        if pd.isna(cid): continue
+        c_log = cur_log[cur_log["company_id"] == cid]
+        c_inv = cur_inv[cur_inv["company_id"] == cid]
+        total_tasks = len(c_log) + len(c_inv)
+        total_over = c_log["is_over"].sum() + c_inv["is_over"].sum()
+        rate = (total_over / total_tasks * 100) if total_tasks > 0 else 0.0
+        results.append({
+            "company_id": int(cid),
+            "long_term_task_rate": round(float(rate), 3),
+            "total_task_count": int(total_tasks),
+            "total_delayed_count": int(total_over),
+            "logistics_task_count": len(c_log),
+            "inventory_task_count": len(c_inv),
+            "logistics_delayed_count": int(c_log["is_over"].sum()),
+            "inventory_delayed_count": int(c_inv["is_over"].sum())
+        })
+    return results
+
+
+# ---- 합성 스냅샷 ----
+
+def _dates(rng, n, missing=0.15):
+    """2025-12 ~ 2026-02 사이 임의 시각 (일부 NaT)"""
+    start = pd.Timestamp("2025-12-01").value
+    end = pd.Timestamp("2026-02-15").value
+    values = pd.to_datetime(rng.integers(start, end, n))
+    return pd.Series(values).mask(rng.random(n) < missing)
+
+def _status(rng, n):
+    return rng.choice(["COMPLETED", "IN_PROGRESS", "completed", "REQUESTED"], n)
+
+def make_snapshot(seed, n_projects=40, n_tasks=300):
+    """
+    회사 1~6 중 5, 6은 업무가 없는 프로젝트만 보유, 회사 없는 프로젝트 / 프로젝트 없는 업무 포함
+    (원천과 같은 타입이 되도록 normalize_table 적용)
+    """
+    rng = np.random.default_rng(seed)
+    company = rng.integers(1, 5, n_projects).astype(float)
+    company[rng.random(n_projects) < 0.05] = np.nan
+    company[:2] = [5, 6]
+    df_project = normalize_table(pd.DataFrame({
+        "date": pd.Timestamp("2026-01-31"),
+        "project_id": np.arange(1, n_projects + 1),
+        "company_id": company,
+        "project_status": _status(rng, n_projects),
+        "project_create_date": _dates(rng, n_projects),
+        "project_end_date": _dates(rng, n_projects),
+        "project_expected_end_date": _dates(rng, n_projects),
+    }), "project")
+
+    def tasks(table, id_col, start_col, status_col, end_col):
+        # 프로젝트 1, 2(회사 5, 6)는 제외, 일부는 없는 프로젝트(999)
+        project_id = rng.integers(3, n_projects + 1, n_tasks)
+        project_id[rng.random(n_tasks) < 0.03] = 999
+        start = _dates(rng, n_tasks, missing=0.05)
+        # 완료일은 시작일 이후가 대부분, 일부는 역전(음수 리드타임)
+        end = start + pd.to_timedelta(rng.exponential(72, n_tasks) - 5, unit="h")
+        end = end.mask(rng.random(n_tasks) < 0.1)
+        return normalize_table(pd.DataFrame({
+            "date": pd.Timestamp("2026-01-31"),
+            id_col: np.arange(1, n_tasks + 1),
+            "project_id": project_id,
+            start_col: start,
+            status_col: _status(rng, n_tasks),
+            end_col: end,
+        }), table)
+
+    df_log = tasks("logistics", "logistics_id", "logistic_created_at", "logistics_status", "logistics_completed_at")
+    df_inv = tasks("inventory", "inventory_id", "inventory_created_at", "inventory_status", "inventory_completed_at")
+    return df_project, df_log, df_inv
+
+def make_sla(seed):
+    """회사 1~3만 SLA 기준 보유 (4는 없음 -> is_over NaN), 일부 값도 NaN"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "company_id": [1, 2, 3],
+        "log_p80": [rng.uniform(20, 120), np.nan, rng.uniform(20, 120)],
+        "inv_p80": [rng.uniform(20, 120), rng.uniform(20, 120), np.nan],
+    })
+
+
+# ---- 결과 비교 ----
+
+@pytest.mark.parametrize("seed", range(25))
+def test_matches_legacy_per_company_loop(seed):
+    df_project, df_log, df_inv = make_snapshot(seed)
+    df_sla = make_sla(seed)
+    expected = legacy_long_term_task_rate(df_project, df_log, df_inv, df_sla, MONTH)
+    assert calculate_long_term_task_rate(df_project, df_log, df_inv, None, None, MONTH, df_sla=df_sla) == expected
+    # 다른 KPI와 TaskFrames를 공유하는 경로도 같은 결과
+    frames = TaskFrames(df_project, df_log, df_inv)
+    assert calculate_long_term_task_rate(df_project, df_log, df_inv, None, None, MONTH,
+                                         df_sla=df_sla, frames=frames) == expected
+
+def test_sla_from_history_matches_legacy():
+    df_project, df_log, df_inv = make_snapshot(100)
+    hist_project, hist_log, hist_inv = make_snapshot(101)
+    hist_logs = [legacy_calculate_leadtimes(hist_project, hist_log, "logistics", "2025-12")]
+    hist_invs = [legacy_calculate_leadtimes(hist_project, hist_inv, "inventory", "2025-12")]
+    df_sla = calculate_sla_from_history(hist_logs, hist_invs)
+    expected = legacy_long_term_task_rate(df_project, df_log, df_inv, df_sla, MONTH)
+    assert calculate_long_term_task_rate(df_project, df_log, df_inv, hist_logs, hist_invs, MONTH) == expected
+
+def test_no_sla_baseline_counts_no_delays():
+    """SLA 기준이 없는 회사는 is_over가 NaN -> 건수에는 포함, 초과 건수에서는 제외"""
+    df_project, df_log, df_inv = make_snapshot(7)
+    df_sla = pd.DataFrame({"company_id": [99], "log_p80": [1.0], "inv_p80": [1.0]})
+    results = calculate_long_term_task_rate(df_project, df_log, df_inv, None, None, MONTH, df_sla=df_sla)
+    assert results == legacy_long_term_task_rate(df_project, df_log, df_inv, df_sla, MONTH)
+    assert any(r["total_task_count"] > 0 for r in results)
+    assert all(r["total_delayed_count"] == 0 and r["long_term_task_rate"] == 0.0 for r in results)
+
+def test_companies_without_tasks_are_reported_with_zero_counts():
+    df_project, df_log, df_inv = make_snapshot(3)
+    results = {r["company_id"]: r for r in calculate_long_term_task_rate(
+        df_project, df_log, df_inv, None, None, MONTH, df_sla=make_sla(3))}
+    for cid in (5, 6):
+        assert results[cid] == {
+            "company_id": cid, "long_term_task_rate": 0.0, "total_task_count": 0, "total_delayed_count": 0,
+            "logistics_task_count": 0, "inventory_task_count": 0,
+            "logistics_delayed_count": 0, "inventory_delayed_count": 0,
+        }
+
+@pytest.mark.parametrize("case", ["no_tasks", "no_logistics", "no_project", "no_sla"])
+def test_empty_inputs(case):
+    df_project, df_log, df_inv = make_snapshot(11)
+    df_sla = make_sla(11)
+    if case == "no_tasks":
+        df_log, df_inv = empty_table("logistics"), empty_table("inventory")
+    elif case == "no_logistics":
+        df_log = empty_table("logistics")
+    elif case == "no_project":
+        df_project = empty_table("project")
+    else:
+        df_sla = pd.DataFrame(columns=SLA_COLUMNS)
+    expected = legacy_long_term_task_rate(df_project, df_log, df_inv, df_sla, MONTH)
+    assert calculate_long_term_task_rate(df_project, df_log, df_inv, None, None, MONTH, df_sla=df_sla) == expected
+    if case == "no_project":
+        assert expected == []
@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+
+from long_term_task_rate_kpi import calculate_long_term_task_rate
+from month_to_date_kpi import calculate_month_to_date_kpis
+from project_completion_kpi import calculate_project_completion_rate
+from shipment_lead_time import calculate_shipment_lead_time
+from shipping_completion_rate import calculate_shipping_completion_rate
+from test_long_term_task_rate import MONTH, make_sla, make_snapshot
+
+def _separate(df_project, df_prev_project, df_log, df_prev_log, df_inv, df_sla):
+    """KPI 함수를 각자 TaskFrames로 따로 실행"""
+    return {
+        "shipment_lead_time": calculate_shipment_lead_time(df_project, df_log, MONTH),
+        "shipping_completion": calculate_shipping_completion_rate(df_project, df_log, df_prev_log, MONTH),
+        "project_completion": calculate_project_completion_rate(df_project, df_prev_project, MONTH),
+        "long_term": calculate_long_term_task_rate(df_project, df_log, df_inv, None, None, MONTH, df_sla=df_sla),
+    }
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("duplicate_project", [False, True])
+def test_shared_frames_match_separate_kpis(seed, duplicate_project):
+    """네 KPI가 TaskFrames 하나를 공유해도 각자 계산한 결과와 같음 (프로젝트 ID 중복 시 merge 경로 포함)"""
+    df_project, df_log, df_inv = make_snapshot(seed)
+    df_prev_project, df_prev_log, _ = make_snapshot(seed + 100)
+    if duplicate_project:
+        df_project = pd.concat([df_project, df_project.iloc[[3]].assign(company_id=2)], ignore_index=True)
+    snapshots = (df_project, df_prev_project, df_log, df_prev_log, df_inv, make_sla(seed))
+    results = calculate_month_to_date_kpis(MONTH, *snapshots)
+    assert results == _separate(*snapshots)
+    assert all(results.values())
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from long_term_task_rate_kpi import build_leadtime_sketches, calculate_sla_from_sketches, calculate_sla_like_v1
+from quantile_sketch import QuantileSketch, sketches_from_frame, sketches_to_frame
+
+QS = [0.01, 0.1, 0.5, 0.8, 0.95, 0.99]
+
+def _values(dist, n, seed=0):
+    rng = np.random.default_rng(seed)
+    if dist == "lognormal":
+        return rng.lognormal(3, 1, n)
+    if dist == "exponential":
+        return rng.exponential(50, n)
+    # 봉우리 두 개 (리드타임이 짧은 건 / 긴 건이 섞인 회사)
+    return np.r_[rng.normal(10, 1, n // 2), rng.normal(200, 20, n - n // 2)]
+
+def _rank_error(values, estimate, q):
+    """추정값의 실제 순위(이하 비율)와 q의 차이"""
+    return abs((values <= estimate).mean() - q)
+
+def test_small_input_is_exact():
+    """값이 적으면 모든 값을 보관 -> pandas quantile(linear)과 같음"""
+    values = _values("lognormal", 50)
+    sketch = QuantileSketch.from_values(values)
+    assert len(sketch.means) == len(values)
+    for q in QS:
+        assert sketch.quantile(q) == pytest.approx(pd.Series(values).quantile(q), rel=1e-12)
+
+def test_small_merge_is_exact():
+    parts = [_values("exponential", 20, seed) for seed in range(3)]
+    merged = QuantileSketch.merge_all([QuantileSketch.from_values(p) for p in parts])
+    union = pd.Series(np.concatenate(parts))
+    for q in QS:
+        assert merged.quantile(q) == pytest.approx(union.quantile(q), rel=1e-12)
+
+@pytest.mark.parametrize("dist", ["lognormal", "exponential", "bimodal"])
+@pytest.mark.parametrize("compression", [50.0, 200.0])
+def test_quantile_rank_error_bound(dist, compression):
+    values = _values(dist, 100_000)
+    sketch = QuantileSketch.from_values(values, compression)
+    # centroid 수 제한 (약 δ/2)
+    assert len(sketch.means) <= compression / 2 + 1
+    assert sketch.count == len(values)
+    for q in QS:
+        assert _rank_error(values, sketch.quantile(q), q) < 1 / compression
+
+@pytest.mark.parametrize("dist", ["lognormal", "exponential", "bimodal"])
+def test_merged_monthly_sketches_match_union(dist):
+    """월별 스케치 병합 분위수가 기간 전체 원본 분위수와 오차 범위 안"""
+    values = _values(dist, 60_000)
+    months = np.array_split(np.random.default_rng(1).permutation(values), 3)
+    merged = QuantileSketch.merge_all([QuantileSketch.from_values(m) for m in months])
+    assert merged.count == len(values)
+    assert (merged.vmin, merged.vmax) == (values.min(), values.max())
+    for q in QS:
+        assert _rank_error(values, merged.quantile(q), q) < 1 / merged.compression
+
+def test_merge_order_does_not_matter():
+    months = [QuantileSketch.from_values(_values("lognormal", 5_000, seed)) for seed in range(4)]
+    values = np.concatenate([_values("lognormal", 5_000, seed) for seed in range(4)])
+    all_at_once = QuantileSketch.merge_all(months)
+    pairwise = months[0].merge(months[1]).merge(months[2]).merge(months[3])
+    for q in QS:
+        assert _rank_error(values, all_at_once.quantile(q), q) < 1 / all_at_once.compression
+        assert _rank_error(values, pairwise.quantile(q), q) < 1 / pairwise.compression
+
+def test_nan_and_empty():
+    sketch = QuantileSketch.from_values([np.nan, 3.0, 1.0, np.nan, 2.0])
+    assert sketch.count == 3
+    assert sketch.quantile(0.5) == 2.0
+    empty = QuantileSketch.from_values([np.nan])
+    assert empty.count == 0 and np.isnan(empty.quantile(0.8))
+    # 빈 스케치는 병합에서 무시
+    assert QuantileSketch.merge_all([empty, sketch]).quantile(0.5) == 2.0
+    assert np.isnan(QuantileSketch.merge_all([]).quantile(0.5))
+
+def test_frame_round_trip():
+    sketches = {
+        (1, "logistics"): QuantileSketch.from_values(_values("lognormal", 10_000)),
+        (2, "inventory"): QuantileSketch.from_values([5.0, 7.0]),
+    }
+    restored = sketches_from_frame(sketches_to_frame(sketches, ["company_id", "task_type"]), ["company_id", "task_type"])
+    assert set(restored) == set(sketches)
+    for key, sketch in sketches.items():
+        np.testing.assert_array_equal(restored[key].means, sketch.means)
+        np.testing.assert_array_equal(restored[key].weights, sketch.weights)
+        assert (restored[key].vmin, restored[key].vmax, restored[key].compression) == \
+               (sketch.vmin, sketch.vmax, sketch.compression)
+
+def test_sla_from_sketches_matches_exact_for_small_companies():
+    """회사별 건수가 적으면(정확 구간) tdigest SLA가 exact SLA와 같음, 0 이하 리드타임은 양쪽 모두 제외"""
+    rng = np.random.default_rng(5)
+    months = []
+    for _ in range(3):
+        log = pd.DataFrame({"company_id": rng.integers(1, 5, 40), "task_id": np.arange(40),
+                            "lead_time": rng.normal(60, 40, 40)})
+        inv = pd.DataFrame({"company_id": rng.integers(1, 4, 30), "task_id": np.arange(30),
+                            "lead_time": rng.normal(30, 20, 30)})
+        months.append((log, inv))
+    exact = calculate_sla_like_v1(pd.concat([m[0] for m in months]), pd.concat([m[1] for m in months]))
+    sketched = calculate_sla_from_sketches([build_leadtime_sketches(log, inv) for log, inv in months])
+    exact = exact.sort_values("company_id").reset_index(drop=True)
+    sketched = sketched.sort_values("company_id").reset_index(drop=True)
+    pd.testing.assert_frame_equal(sketched, exact, check_dtype=False)
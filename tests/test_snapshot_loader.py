@@ -0,0 +1,104 @@
+import io
+
+import botocore.response
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import snapshot_loader
+from config import RAW_PREFIX
+from local_store import LocalS3Client
+from report_uploader import _load_manifest, manifest_key
+from snapshot_loader import get_csv_by_date, get_static_csv, iter_snapshot, read_snapshot
+
+DATE = "2026-01-15"
+
+class StreamingS3Client(LocalS3Client):
+    """S3처럼 되감을 수 없는 본문(StreamingBody)을 반환하는 로컬 클라이언트"""
+
+    def get_object(self, Bucket=None, Key=None, **kwargs) -> dict:
+        response = super().get_object(Bucket, Key, **kwargs)
+        response["Body"] = botocore.response.StreamingBody(response["Body"], response["ContentLength"])
+        return response
+
+def _item(n=2_500, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "date": DATE,
+        "item_id": np.arange(1, n + 1),
+        "item_quantity": rng.integers(0, 50, n).astype(float),
+        "safety_stock": rng.integers(0, 50, n).astype(float),
+    })
+
+def _parquet_bytes(df, row_group_size):
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False, row_group_size=row_group_size)
+    return buffer.getvalue()
+
+@pytest.fixture(params=[LocalS3Client, StreamingS3Client])
+def client(request, tmp_path, monkeypatch):
+    client = request.param(str(tmp_path))
+    monkeypatch.setattr(snapshot_loader, "_s3_client", client)
+    return client
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_iter_snapshot_matches_full_read(client, fmt):
+    df = _item()
+    if fmt == "parquet":
+        # row group 여러 개 (batch가 row group 경계를 넘나듦)
+        client.put_object(Key=f"{RAW_PREFIX}item--{DATE}.parquet",
+                          Body=_parquet_bytes(df, row_group_size=700))
+    else:
+        client.put_object(Key=f"{RAW_PREFIX}item--{DATE}.csv", Body=df.to_csv(index=False))
+    chunks = list(iter_snapshot("item", DATE, chunk_rows=1_000))
+    assert [len(chunk) for chunk in chunks] == [1_000, 1_000, 500]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True),
+                                  read_snapshot("item", DATE).reset_index(drop=True))
+
+def test_parquet_stream_is_not_read_into_memory(client, monkeypatch):
+    """Parquet 본문은 seek 가능한 파일(로컬 파일 / 임시 파일)에서 읽음 - 객체 전체 bytes로 읽지 않음"""
+    client.put_object(Key=f"{RAW_PREFIX}item--{DATE}.parquet", Body=_parquet_bytes(_item(), row_group_size=700))
+    sources = []
+    parquet_file = pq.ParquetFile
+
+    def recording_parquet_file(source, **kwargs):
+        sources.append(source)
+        return parquet_file(source, **kwargs)
+
+    monkeypatch.setattr(pq, "ParquetFile", recording_parquet_file)
+    assert sum(len(chunk) for chunk in iter_snapshot("item", DATE, chunk_rows=1_000)) == 2_500
+    assert len(sources) == 1 and not isinstance(sources[0], io.BytesIO)
+    # 다 읽은 뒤 본문 / 임시 파일은 닫힘
+    assert sources[0].closed
+
+def test_missing_snapshot_yields_nothing(client):
+    assert list(iter_snapshot("item", "2026-01-01", chunk_rows=10)) == []
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_reads_close_object_bodies(client, fmt):
+    """전체 읽기 경로도 본문(로컬 파일 핸들 / S3 스트림)을 읽은 뒤 닫음 (닫지 않으면 ResourceWarning)"""
+    df = _item(100)
+    if fmt == "parquet":
+        client.put_object(Key=f"{RAW_PREFIX}item--{DATE}.parquet", Body=_parquet_bytes(df, row_group_size=100))
+    else:
+        client.put_object(Key=f"{RAW_PREFIX}item--{DATE}.csv", Body=df.to_csv(index=False))
+    client.put_object(Key=f"{RAW_PREFIX}predict_turnover_mock.csv", Body="company_id,value\n1,2.0\n")
+    client.put_object(Key=f"{RAW_PREFIX}unregistered--{DATE}.csv", Body="a,b\n1,2\n")
+    client.put_object(Key=manifest_key(DATE), Body='{"1": "abc"}')
+
+    opened = []
+    get_object = client.get_object
+
+    def recording_get_object(*args, **kwargs):
+        response = get_object(*args, **kwargs)
+        # StreamingBody는 감싼 원본 스트림의 닫힘 여부로 확인
+        opened.append(getattr(response["Body"], "_raw_stream", response["Body"]))
+        return response
+
+    client.get_object = recording_get_object
+    assert len(read_snapshot("item", DATE)) == 100
+    assert len(get_static_csv("predict_turnover_mock")) == 1
+    assert len(get_csv_by_date("unregistered", DATE)) == 1
+    assert _load_manifest(DATE) == {"1": "abc"}
+    assert len(opened) == 4 and all(body.closed for body in opened)
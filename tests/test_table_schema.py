@@ -0,0 +1,38 @@
+import pandas as pd
+
+from inventory_turnover import calculate_inventory_turnover
+from table_schema import merge_outer, normalize_table
+
+def test_merge_outer_widens_int_keys():
+    """폭이 다른 nullable 정수 키 outer merge에서 오른쪽에만 있는 키 값 유지 (pandas merge는 -56으로 넘침)"""
+    left = pd.DataFrame({"company_id": pd.array([1, 100], dtype="Int8"), "a": [1.0, 2.0]})
+    right = pd.DataFrame({"company_id": pd.array([1, 200], dtype="Int16"), "b": [3.0, 4.0]})
+    merged = merge_outer(left, right, on="company_id")
+    assert merged["company_id"].tolist() == [1, 100, 200]
+    assert str(merged["company_id"].dtype) == "Int16"
+    # 입력 프레임 타입은 그대로
+    assert str(left["company_id"].dtype) == "Int8"
+
+def test_turnover_with_new_company_id_width():
+    """월중에 회사 ID가 Int8 범위를 넘으면 월초(Int8) / 월말(Int16) 회사 키 폭이 달라짐"""
+    def snapshot(companies):
+        tables = {
+            "project": pd.DataFrame({"project_id": range(1, len(companies) + 1), "company_id": companies}),
+            "inventory": pd.DataFrame({"inventory_id": [1], "project_id": [1]}),
+            "inventory_item": pd.DataFrame({"inventory_item_id": [1], "item_id": [1], "inventory_id": [1]}),
+            "logistics": pd.DataFrame({"logistics_id": range(1, len(companies) + 1),
+                                       "project_id": range(1, len(companies) + 1)}),
+            "logistics_item": pd.DataFrame({"logistics_item_id": range(1, len(companies) + 1),
+                                            "item_id": range(1, len(companies) + 1),
+                                            "logistics_id": range(1, len(companies) + 1),
+                                            "logistics_processed_quantity": [4.0] * len(companies)}),
+            "item": pd.DataFrame({"item_id": range(1, len(companies) + 1), "item_quantity": [2.0] * len(companies),
+                                  "safety_stock": [0.0] * len(companies)}),
+        }
+        return {table: normalize_table(df, table) for table, df in tables.items()}
+
+    first, last = snapshot([5]), snapshot([5, 200])
+    assert str(first["project"]["company_id"].dtype) == "Int8"
+    assert str(last["project"]["company_id"].dtype) == "Int16"
+    results = calculate_inventory_turnover(first, last)
+    assert results == [{"company_id": 5, "inventory_turnover": 0.0}, {"company_id": 200, "inventory_turnover": 4.0}]
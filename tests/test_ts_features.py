@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ts_features import FEATURE_COLUMNS, LagState, build_features, feature_matrix, stack_tasks, task_features
+
+TARGET = "turnOverRate"
+
+
+# ---- 기존 구현 (회사별 피처 생성) - 묶음 피처 / LagState 비교 기준 ----
+
+def legacy_make_features(df, target_col, lags=(1, 2, 3, 6), rolls=(3, 6)):
+    out = df.copy()
+    out = out.sort_values("snapshotDate").reset_index(drop=True)
+    out["moy"] = out["snapshotDate"].dt.month
+    out["moy_sin"] = np.sin(2 * np.pi * out["moy"] / 12)
+    out["moy_cos"] = np.cos(2 * np.pi * out["moy"] / 12)
+    for k in lags:
+        out[f"lag_{k}"] = out[target_col].shift(k)
+    for w in rolls:
+        s = out[target_col].shift(1)
+        out[f"roll_mean_{w}"] = s.rolling(w, min_periods=1).mean()
+        out[f"roll_std_{w}"] = s.rolling(w, min_periods=2).std()
+    return out
+
+def legacy_next_row(g, target_col):
+    """기존 익월 예측 피처: 이력 + 익월(타깃 NaN) 행으로 피처를 다시 만든 뒤 마지막 행"""
+    next_date = g["snapshotDate"].max() + pd.offsets.MonthEnd(1)
+    tmp = pd.concat([g[["snapshotDate", target_col]],
+                     pd.DataFrame({"snapshotDate": [next_date], target_col: [np.nan]})], ignore_index=True)
+    return legacy_make_features(tmp, target_col).iloc[-1]
+
+
+# ---- 합성 이력 ----
+
+def make_tasks(seed, n_companies=12):
+    """
+    회사별 월말 이력 (길이 1~30개월, 중간 월 누락 / 결측 값 포함, 회사 순서 무작위)
+    월 누락은 위치 기준 shift이므로 기존 구현과 같은 정의로 비교
+    """
+    rng = np.random.default_rng(seed)
+    tasks = []
+    for cid in rng.permutation(np.arange(1, n_companies + 1)):
+        n = int(rng.integers(1, 31))
+        months = pd.date_range("2022-01-31", periods=n + 10, freq="ME")
+        dates = np.sort(rng.choice(months, n, replace=False))
+        values = rng.normal(50, 10, n)
+        values[rng.random(n) < 0.1] = np.nan
+        tasks.append((int(cid), pd.DataFrame({"snapshotDate": pd.DatetimeIndex(dates), TARGET: values})))
+    return tasks
+
+
+# ---- 묶음 피처 == 회사별 피처 ----
+
+@pytest.mark.parametrize("seed", range(10))
+def test_build_features_matches_legacy_per_company(seed):
+    tasks = make_tasks(seed)
+    feat = build_features(stack_tasks(tasks, TARGET), TARGET, "companyId", with_next=False)
+    for cid, g in tasks:
+        expected = legacy_make_features(g, TARGET)
+        actual = feat[feat["companyId"] == cid].reset_index(drop=True)
+        pd.testing.assert_frame_equal(actual[["snapshotDate", TARGET] + FEATURE_COLUMNS],
+                                      expected[["snapshotDate", TARGET] + FEATURE_COLUMNS], check_exact=True)
+
+@pytest.mark.parametrize("seed", range(10))
+def test_task_features_include_legacy_next_row(seed):
+    """task_features: 회사별 이력 행 + 마지막 익월 행 (기존 익월 예측 피처와 같음)"""
+    tasks = make_tasks(seed)
+    features = task_features(tasks, TARGET)
+    assert [cid for cid, _ in features] == [cid for cid, _ in tasks]
+    for (cid, g), (_, feat) in zip(tasks, features):
+        assert len(feat) == len(g) + 1
+        pd.testing.assert_frame_equal(feat.iloc[:-1][FEATURE_COLUMNS].reset_index(drop=True),
+                                      legacy_make_features(g, TARGET)[FEATURE_COLUMNS], check_exact=True)
+        pd.testing.assert_series_equal(feat.iloc[-1][FEATURE_COLUMNS], legacy_next_row(g, TARGET)[FEATURE_COLUMNS],
+                                       check_exact=True, check_names=False)
+
+def test_single_series_without_group():
+    _, g = make_tasks(3)[0]
+    feat = build_features(g, TARGET, group_col=None)
+    pd.testing.assert_frame_equal(feat.iloc[:-1][FEATURE_COLUMNS],
+                                  legacy_make_features(g, TARGET)[FEATURE_COLUMNS], check_exact=True)
+    assert feat["snapshotDate"].iloc[-1] == g["snapshotDate"].max() + pd.offsets.MonthEnd(1)
+
+def test_empty_tasks():
+    assert task_features([], TARGET) == []
+
+
+# ---- LagState == 매 시점 전체 재계산 ----
+
+@pytest.mark.parametrize("H", [2, 3, 8])
+@pytest.mark.parametrize("seed", range(5))
+def test_lag_state_matches_full_recompute(seed, H):
+    """
+    재귀 예측 H단계: 예측값을 이력에 붙이고 피처 전체를 다시 만든 익월 행 == LagState.next_rows
+    (버퍼보다 긴 H, 버퍼보다 짧은 이력 포함)
+    """
+    tasks = make_tasks(seed)
+    rng = np.random.default_rng(seed + 100)
+    keys = [cid for cid, _ in tasks]
+    state = LagState.from_frame(stack_tasks(tasks, TARGET), TARGET, "companyId", keys=keys)
+    histories = {cid: g[["snapshotDate", TARGET]] for cid, g in tasks}
+    for _ in range(H):
+        expected = np.vstack([legacy_next_row(histories[cid], TARGET)[FEATURE_COLUMNS].to_numpy(dtype=float)
+                              for cid in keys])
+        np.testing.assert_allclose(state.next_rows(), expected.astype(np.float32), rtol=1e-6, equal_nan=True)
+
+        predictions = rng.normal(50, 10, len(keys))
+        state.push(predictions)
+        for cid, value in zip(keys, predictions):
+            g = histories[cid]
+            next_date = g["snapshotDate"].max() + pd.offsets.MonthEnd(1)
+            histories[cid] = pd.concat([g, pd.DataFrame({"snapshotDate": [next_date], TARGET: [value]})],
+                                       ignore_index=True)
+
+def test_lag_state_single_series_matches_feature_matrix():
+    """그룹 없는 이력 (회사별 재귀 예측) - 첫 단계는 build_features 익월 행과 같음"""
+    _, g = make_tasks(1)[0]
+    state = LagState.from_frame(g, TARGET)
+    feat = build_features(g, TARGET, group_col=None)
+    np.testing.assert_allclose(state.next_rows(), feature_matrix(feat.iloc[[-1]]), rtol=1e-6, equal_nan=True)